@@ -0,0 +1,114 @@
+"""
+OGRe Benchmarks
+
+:data:`SCENARIOS` -- ways of running the fetch pipeline
+
+:func:`prepare` -- build synthetic Twitter dependencies
+
+:func:`measure` -- measure throughput, page latency, and peak memory
+
+Run ``python -m benchmarks --help`` (from the repository root) for a report,
+or ``tox -e benchmark`` to track results with pytest-benchmark.
+"""
+
+import time
+import tracemalloc
+
+from ogre import OGRe
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import twitter
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+SCENARIOS = {
+    "twitter": lambda api, network, quantity: twitter(
+        keys=KEYS,
+        keyword="synthetic",
+        quantity=quantity,
+        api=api,
+        network=network,
+    ),
+    "twitter (media_workers=8)": lambda api, network, quantity: twitter(
+        keys=KEYS,
+        keyword="synthetic",
+        quantity=quantity,
+        media_workers=8,
+        api=api,
+        network=network,
+    ),
+    "fetch": lambda api, network, quantity: OGRe({"Twitter": KEYS}).fetch(
+        sources=("Twitter",),
+        keyword="synthetic",
+        quantity=quantity,
+        api=api,
+        network=network,
+    )["features"],
+    "fetch (columnar)": lambda api, network, quantity: OGRe({"Twitter": KEYS}).fetch(
+        sources=("Twitter",),
+        keyword="synthetic",
+        quantity=quantity,
+        columnar=True,
+        api=api,
+        network=network,
+    ),
+}
+
+
+def prepare(
+    page_size=100,
+    pages=20,
+    geotagged=0.9,
+    photos=0.3,
+    image_size=4096,
+    seed=0,
+):
+    """
+    Build synthetic Twitter dependencies.
+
+    :rtype: tuple
+    :returns: an `api`, a `network`, and the quantity that pages through
+              every synthetic Tweet
+    """
+    tweets = statuses(
+        page_size * pages,
+        geotagged=geotagged,
+        photos=photos,
+        seed=seed,
+    )
+    api = SyntheticAPI(tweets, page_size=page_size, remaining=pages + 1)
+    return api, SyntheticNetwork(size=image_size), len(tweets)
+
+
+def measure(scenario, **parameters):
+    """
+    Run a scenario twice: once for time and once for memory.
+
+    Tracing memory slows Python down,
+    so throughput and latency are measured without it.
+
+    :rtype: dict
+    :returns: features, seconds, features_per_second,
+              page_latencies (in seconds), and peak_bytes
+    """
+    api, network, quantity = prepare(**parameters)
+    start = time.perf_counter()
+    features = len(SCENARIOS[scenario](api, network, quantity))
+    end = time.perf_counter()
+    calls = api.calls + [end]
+    latencies = [later - earlier for earlier, later in zip(calls, calls[1:])]
+
+    api, network, quantity = prepare(**parameters)
+    tracemalloc.start()
+    try:
+        SCENARIOS[scenario](api, network, quantity)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "features": features,
+        "seconds": end - start,
+        "features_per_second": features / (end - start),
+        "page_latencies": latencies,
+        "peak_bytes": peak,
+    }
@@ -0,0 +1,60 @@
+"""Report how quickly each scenario runs through synthetic Twitter pages."""
+
+import argparse
+import statistics
+import sys
+
+from benchmarks import SCENARIOS, measure
+
+
+def main(argv=None):
+    """Measure every (selected) scenario and print a table."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--geotagged", type=float, default=0.9)
+    parser.add_argument("--photos", type=float, default=0.3)
+    parser.add_argument("--image-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Run a specific scenario (defaults to all of them).",
+    )
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    print(
+        "{:<28} {:>9} {:>12} {:>12} {:>12} {:>10}".format(
+            "scenario",
+            "features",
+            "features/s",
+            "page mean ms",
+            "page max ms",
+            "peak MiB",
+        ),
+    )
+    for scenario in args.scenario or SCENARIOS:
+        result = measure(
+            scenario,
+            page_size=args.page_size,
+            pages=args.pages,
+            geotagged=args.geotagged,
+            photos=args.photos,
+            image_size=args.image_size,
+            seed=args.seed,
+        )
+        print(
+            "{:<28} {:>9} {:>12.0f} {:>12.3f} {:>12.3f} {:>10.2f}".format(
+                scenario,
+                result["features"],
+                result["features_per_second"],
+                statistics.mean(result["page_latencies"]) * 1000,
+                max(result["page_latencies"]) * 1000,
+                result["peak_bytes"] / 1024 / 1024,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
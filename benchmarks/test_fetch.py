@@ -0,0 +1,44 @@
+"""
+Benchmarks for the fetch pipeline
+
+These run with pytest-benchmark (e.g. ``tox -e benchmark``),
+and each records page latency and peak memory in ``extra_info``.
+"""
+
+import statistics
+
+import pytest
+
+from benchmarks import SCENARIOS, measure, prepare
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_throughput(benchmark, scenario):
+    """Page through 2,000 synthetic Tweets."""
+    result = measure(scenario)
+    benchmark.extra_info["features"] = result["features"]
+    benchmark.extra_info["page_latency_mean"] = statistics.mean(
+        result["page_latencies"],
+    )
+    benchmark.extra_info["page_latency_max"] = max(result["page_latencies"])
+    benchmark.extra_info["peak_bytes"] = result["peak_bytes"]
+
+    def setup():
+        api, network, quantity = prepare()
+        return (api, network, quantity), {}
+
+    features = benchmark.pedantic(SCENARIOS[scenario], setup=setup, rounds=5)
+    assert len(features) == result["features"] > 0
+
+
+@pytest.mark.parametrize("geotagged", [0.1, 0.5, 1.0])
+def test_geotag_ratio(benchmark, geotagged):
+    """Skip non-geotagged Tweets cheaply."""
+
+    def setup():
+        api, network, quantity = prepare(geotagged=geotagged, photos=0)
+        return (api, network, quantity), {}
+
+    benchmark.pedantic(SCENARIOS["twitter"], setup=setup, rounds=5)
@@ -2,19 +2,45 @@
 OGRe Twitter Interface
 
 :func:`twitter` : method for fetching data from Twitter
+
+:func:`iter_twitter` : generator form of :func:`twitter`
+
+:func:`twitter_batch` : columnar form of :func:`twitter`
+
+:func:`atwitter` : asynchronous form of :func:`twitter`
+
+:func:`aiter_twitter` : asynchronous generator form of :func:`twitter`
+
+:func:`twitter_quota` : method for checking the Twitter search rate limit
 """
 
+import asyncio
 import base64
-import hashlib
+import contextlib
+import heapq
+import inspect
+import io
 import logging
+import posixpath
 import sys
-import time
+import tempfile
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
 from urllib.request import urlopen
-from datetime import datetime
 from twython import Twython  # type: ignore
+from ogre import aio
+from ogre.batch import FeatureBatch
+from ogre.cache import spool
+from ogre.dedupe import IDSet
+from ogre.feature import Feature
+from ogre.concurrency import fan_out
+from ogre.geo import contains, cover, is_area, within
+from ogre.metrics import REGISTRY, FetchMetrics
 from ogre.validation import sanitize
 from ogre.exceptions import OGReError, OGReLimitError
-from snowflake2time import snowflake2utc, utc2snowflake
+from snowflake2time import snowflakes2utcms, utc2snowflakes
 
 
 def sanitize_twitter(
@@ -59,6 +85,18 @@ def sanitize_twitter(
     :rtype: tuple
     :returns: Each passed parameter is returned (in order) in the proper format.
     """
+    return _sanitize_twitter(
+        keys=keys,
+        media=media,
+        keyword=keyword,
+        quantity=quantity,
+        location=location,
+        interval=interval,
+    )[:-1]
+
+
+def _sanitize_twitter(keys, media, keyword, quantity, location, interval):
+    """Prepare parameters like :func:`sanitize_twitter` (and the location)."""
 
     clean_keys = {}
     for key, value in keys.items():
@@ -119,12 +157,971 @@ def sanitize_twitter(
 
     period_id = (None, None)
     if interval is not None:
-        period_id = (utc2snowflake(clean_interval[0]), utc2snowflake(clean_interval[1]))
+        period_id = tuple(utc2snowflakes(clean_interval[:2]))
 
     if keywords in ("", "-pic.twitter.com") and geocode is None:
         raise ValueError("Specify either a keyword or a location.")
 
-    return (clean_keys, kinds, keywords, clean_quantity, geocode, period_id)
+    return (
+        clean_keys,
+        kinds,
+        keywords,
+        clean_quantity,
+        geocode,
+        period_id,
+        clean_location,
+    )
+
+
+_SPOOL: list = []  # The private directory images are spooled in by default.
+_SPOOL_LOCK = threading.Lock()
+
+
+def _default_spool():
+    """Create a private directory to spool images in (once per process)."""
+    with _SPOOL_LOCK:
+        if not _SPOOL:
+            _SPOOL.append(tempfile.mkdtemp(prefix="ogre-"))
+        return _SPOOL[0]
+
+
+def _next_max_id(results):
+    """Find where the next page of search results begins (if there is one)."""
+    next_results = results.get("search_metadata", {}).get("next_results")
+    if next_results is None:
+        return None
+    return int(next_results.split("max_id=")[1].split("&")[0])
+
+
+def _split(since_id, max_id, parts):
+    """Divide a Snowflake ID range into contiguous, disjoint ranges."""
+    step = (max_id - since_id) // parts
+    if step < 1:
+        return [(since_id, max_id)]
+    bounds = [since_id + step * part for part in range(parts)] + [max_id]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _search_limit(limits):
+    """Find the search rate limit in a rate limit status response."""
+    search = limits["resources"]["search"]["/search/tweets"]
+    return int(search["remaining"]), int(search["reset"])
+
+
+def _encode(image):
+    """Encode downloaded image data as base64."""
+    if isinstance(image, str):
+        image = image.encode("utf-8")
+    return base64.b64encode(image)
+
+
+class _Query:
+
+    """
+    Track the state of a single Twitter search.
+
+    This holds everything about a search that does not involve I/O,
+    so the same bookkeeping drives both :func:`iter_twitter` and
+    :func:`aiter_twitter`.
+    """
+
+    def __init__(
+        self,
+        keys,
+        media,
+        keyword,
+        quantity,
+        location,
+        interval,
+        kwargs,
+        defaults,
+    ):
+        (
+            self.keychain,
+            self.kinds,
+            self.keywords,
+            self.remaining,
+            self.geocode,
+            (self.since_id, self.max_id),
+            self.location,
+        ) = _sanitize_twitter(
+            keys=keys,
+            media=media,
+            keyword=keyword,
+            quantity=quantity,
+            location=location,
+            interval=interval,
+        )
+
+        self.modifiers = {
+            "area": None,
+            "cache": None,
+            "clients": None,
+            "compact": False,
+            "dedupe": None,
+            "fail_hard": False,
+            "high_water_mark": None,
+            "image_mode": "inline",
+            "ledger": None,
+            "log_sample": 1,
+            "media_timeout": None,
+            "media_workers": None,
+            "metrics": None,
+            "query_limit": 450,  # Twitter allows 450 queries every 15 minutes.
+            "registry": None,
+            "secure": True,
+            "shard_workers": None,
+            "shards": None,
+            "spool": None,
+            "strict_location": False,
+            "strict_media": False,
+        }
+        self.modifiers.update(defaults)
+        for modifier in self.modifiers:
+            if kwargs.get(modifier) is not None:
+                self.modifiers[modifier] = kwargs[modifier]
+        if self.modifiers["image_mode"] not in ("inline", "url", "file"):
+            raise ValueError('Valid image modes are "inline", "url", and "file".')
+        sample = self.modifiers["log_sample"]
+        if not isinstance(sample, int) or sample < 1:
+            raise ValueError("Log samples must be positive integers.")
+        if self.modifiers["dedupe"] is True:
+            self.modifiers["dedupe"] = IDSet()
+        elif self.modifiers["dedupe"] is False:
+            self.modifiers["dedupe"] = None
+        if self.modifiers["spool"] is None and self.modifiers["image_mode"] == "file":
+            self.modifiers["spool"] = _default_spool()
+
+        mark = self.modifiers["high_water_mark"]
+        if mark is not None and mark.since_id is not None:
+            if self.since_id is None or mark.since_id > self.since_id:
+                self.since_id = mark.since_id
+        if mark is not None and mark.max_id is not None:
+            # An earlier call stopped short, so the gap it left is resumed.
+            if self.max_id is None or mark.max_id < self.max_id:
+                self.max_id = mark.max_id
+        self.newest = None  # These bound the IDs that have been seen.
+        self.oldest = None
+        self.caught_up = False
+        self.cursor = None  # This is where paging would resume.
+
+        # This identifies the results of the search (for caching).
+        self.identity = (
+            "Twitter",
+            self.kinds,
+            self.keywords,
+            self.remaining,
+            self.geocode,
+            self.since_id,
+            self.max_id,
+            self.modifiers["query_limit"],
+            self.modifiers["secure"],
+            self.modifiers["strict_media"],
+            self.modifiers["strict_location"],
+            self.modifiers["area"],
+            self.modifiers["image_mode"],
+            self.modifiers["spool"] if self.modifiers["image_mode"] == "file" else None,
+        )
+
+        self.qid = uuid.uuid4().hex  # This correlates the events of a search.
+        self.log = logging.getLogger(__name__)
+        self.event(logging.INFO, "request", "Request: Twitter")
+        self.event(
+            logging.DEBUG,
+            "request",
+            "Status: media(%s) keyword(%s) quantity(%s) location(%s)"
+            " interval(%s,%s) kwargs(%s)",
+            media,
+            self.keywords,
+            self.remaining,
+            self.geocode,
+            self.since_id,
+            self.max_id,
+            kwargs,
+            media=media,
+            keyword=self.keywords,
+            quantity=self.remaining,
+            location=self.geocode,
+            since_id=self.since_id,
+            max_id=self.max_id,
+        )
+
+        self.total = self.remaining
+        self.collected = 0
+        self.queries = 0
+        self.metrics = FetchMetrics()
+        self.started = self.metrics.clock()
+
+    def cached(self):
+        """
+        Look up the results of this search in the cache.
+
+        Incremental and de-duplicated searches are never cached,
+        since their results depend on what was seen before,
+        and only complete searches are stored (see :meth:`complete`).
+
+        :rtype: list
+        :returns: cached GeoJSON Feature(s) or None
+        """
+        if (
+            self.modifiers["cache"] is None
+            or self.modifiers["high_water_mark"] is not None
+            or self.modifiers["dedupe"] is not None
+        ):
+            return None
+        features = self.modifiers["cache"].get(self.identity)
+        if features is not None:
+            self.collected = len(features)
+            self.event(
+                logging.INFO,
+                "success",
+                "Success: %d cached results were found.",
+                len(features),
+                results=len(features),
+                cached=True,
+            )
+        return features
+
+    def event(self, level, name, message, *args, **fields):
+        """
+        Log a structured event (unless its level is disabled).
+
+        The message is formatted lazily (with `args`),
+        so a disabled level costs no more than this check.
+        The record carries the event `name` (e.g. "request", "page",
+        "success", or "failure"), the `qid`, the `source`,
+        and any other `fields` as attributes (for structured handlers).
+        """
+        if self.log.isEnabledFor(level):
+            fields.update(event=name, qid=self.qid, source="Twitter")
+            self.log.log(level, "%s " + message, self.qid, *args, extra=fields)
+
+    def outcome(self, name, reason=None):
+        """Log how many results a search produced and why it stopped."""
+        message = "%s: %d queries produced %d results."
+        args = [name.capitalize(), self.queries, self.collected]
+        if reason is not None:
+            message += " %s"
+            args.append(reason)
+        self.event(
+            logging.INFO,
+            name,
+            message,
+            *args,
+            queries=self.queries,
+            results=self.collected,
+            reason=reason,
+        )
+
+    def report(self):
+        """Report the measurements of this search."""
+        self.metrics.features = self.collected
+        self.metrics.wall = self.metrics.clock() - self.started
+        (self.modifiers["registry"] or REGISTRY).record(self.metrics, "Twitter")
+        if self.modifiers["metrics"] is not None:
+            self.modifiers["metrics"].merge(self.metrics)
+
+    def complete(self):
+        """
+        Determine whether the search found every result it could.
+
+        Searches cut short (e.g. by the rate limit, the `query_limit`,
+        or a request that was too complex) are incomplete.
+
+        :rtype: bool
+        :returns: whether the quantity was met or no more results remain
+        """
+        return self.caught_up or self.collected >= self.total
+
+    def finish(self, features):
+        """Cache the (complete) results or raise the high-water mark."""
+        mark = self.modifiers["high_water_mark"]
+        if mark is not None:
+            if self.caught_up:
+                mark.advance(self.newest)
+            else:
+                mark.resume(self.newest, self.cursor)
+        elif (
+            self.modifiers["cache"] is not None
+            and self.modifiers["dedupe"] is None
+            and self.complete()
+        ):
+            self.modifiers["cache"].put(self.identity, features)
+
+    @contextlib.contextmanager
+    def client(self):
+        """Construct (or borrow) a Twitter API client."""
+        arguments = (self.modifiers["api"], self.keychain["consumer_key"])
+        keywords = {"access_token": self.keychain["access_token"]}
+        if self.modifiers["clients"] is None:
+            yield self.modifiers["api"](*arguments[1:], **keywords)
+        else:
+            with self.modifiers["clients"].client(*arguments, **keywords) as api:
+                yield api
+
+    def empty(self):
+        """Determine whether the search can be satisfied without any queries."""
+        if not self.kinds or self.remaining < 1 or self.modifiers["query_limit"] < 1:
+            self.event(
+                logging.INFO,
+                "success",
+                "Success: No results were requested.",
+                results=0,
+            )
+            return True
+        return False
+
+    def budget(self):
+        """
+        Obey the rate limit recorded in the ledger (if it is current).
+
+        :rtype: bool
+        :returns: whether the rate limit was known without a request
+        """
+        ledger = self.modifiers["ledger"]
+        if ledger is None or ledger.stale():
+            return False
+        self.obey(ledger.remaining, ledger.reset)
+        return True
+
+    def limit(self, limits):
+        """Obey a Twitter rate limit status response."""
+        try:
+            limit, reset = _search_limit(limits)
+        except KeyError:
+            self.event(
+                logging.WARNING,
+                "failure",
+                "Unobtainable Rate Limit",
+                reason="Unobtainable Rate Limit",
+            )
+            raise
+        if self.modifiers["ledger"] is not None:
+            self.modifiers["ledger"].sync(limit, reset)
+        self.obey(limit, reset)
+
+    def obey(self, limit, reset):
+        """Restrict the number of queries to a rate limit."""
+        self.metrics.remaining = limit
+        if limit < 1:
+            self.limited(reset)
+        else:
+            self.event(
+                logging.DEBUG,
+                "rate_limit",
+                "Status: %d queries remain.",
+                limit,
+                remaining=limit,
+            )
+        if limit < self.modifiers["query_limit"]:
+            self.modifiers["query_limit"] = limit
+
+    def limited(self, reset):
+        """Report that queries are being limited."""
+        message = "Queries are being limited."
+        self.event(
+            logging.INFO,
+            "failure",
+            "Failure: %s",
+            message,
+            reason=message,
+            reset=reset,
+        )
+        if self.modifiers["fail_hard"]:
+            raise OGReLimitError(source="Twitter", message=message, reset=reset)
+
+    def reserve(self):
+        """
+        Reserve the next query in the ledger.
+
+        :rtype: bool
+        :returns: whether the query may be made
+        """
+        ledger = self.modifiers["ledger"]
+        if ledger is None or ledger.reserve():
+            return True
+        self.limited(ledger.reset)
+        return False
+
+    def observe(self, api):
+        """Note (and correct the ledger with) the limit sent with a response."""
+        ledger = self.modifiers["ledger"]
+        header = getattr(api, "get_lastfunction_header", None)
+        if header is None:
+            return
+        try:
+            remaining = header("x-rate-limit-remaining")
+            reset = header("x-rate-limit-reset")
+        except Exception:  # pylint: disable=broad-except
+            return  # Twython raises if no headers are available.
+        if isinstance(remaining, (int, str)) and isinstance(reset, (int, str)):
+            self.metrics.remaining = int(remaining)
+            if ledger is not None:
+                ledger.correct(remaining, reset)
+
+    def search(self, api, since_id=None, max_id=None):
+        """
+        Make a (timed) search query.
+
+        :rtype: dict
+        :returns: the search results
+        """
+        with self.metrics.time("search"):
+            results = api.search(
+                **self.parameters(since_id=since_id, max_id=max_id),
+            )
+        self.metrics.add("searches")
+        self.observe(api)
+        return results
+
+    def pages(self):
+        """Count the queries that may be made."""
+        for query in range(self.modifiers["query_limit"]):
+            self.queries = query + 1
+            yield self.queries
+
+    def parameters(self, since_id=None, max_id=None):
+        """Build the parameters for the next search query (within a range)."""
+        return {
+            "q": self.keywords,
+            "count": min(self.remaining, 100),  # Twitter accepts a max of 100.
+            "geocode": self.geocode,
+            "since_id": self.since_id if since_id is None else since_id,
+            "max_id": self.max_id if max_id is None else max_id,
+        }
+
+    def sharded(self):
+        """Determine whether the interval should be searched in shards."""
+        return (
+            (self.modifiers["shards"] or 1) > 1
+            and self.since_id is not None
+            and self.max_id is not None
+        )
+
+    def failed(self):
+        """Log a failed search query."""
+        if self.modifiers["ledger"] is not None:
+            self.modifiers["ledger"].invalidate()
+        self.outcome("failure", sys.exc_info()[1])
+
+    def statuses(self, results):
+        """
+        Find the usable Tweets on a page of search results.
+
+        :rtype: list
+        :returns: geotagged and timestamped Tweets (that were not seen before)
+                  or None if the page contains no statuses
+                  (i.e. the request was too complex).
+        """
+        if results.get("statuses") is None:
+            message = "The request is too complex."
+            self.outcome("failure", message)
+            if self.modifiers["fail_hard"]:
+                raise OGReError(source="Twitter", message=message)
+            return None
+        ids = [tweet["id"] for tweet in results["statuses"] if tweet.get("id")]
+        if ids:
+            self.newest = max(ids + ([self.newest] if self.newest else []))
+            self.oldest = min(ids)
+        statuses = [
+            tweet
+            for tweet in results["statuses"]
+            # Tweets must be geotagged and timestamped.
+            if tweet.get("coordinates") is not None and tweet.get("id") is not None
+        ]
+        self.metrics.add("tweets", len(results["statuses"]))
+        self.metrics.add("geotagged", len(statuses))
+        if self.modifiers["area"] is not None:
+            # Tweets outside of the area (i.e. in a tile's margin) are dropped.
+            coordinates = [tweet["coordinates"]["coordinates"] for tweet in statuses]
+            statuses = [
+                tweet
+                for tweet, inside in zip(
+                    statuses,
+                    contains(
+                        self.modifiers["area"],
+                        [latitude for _, latitude in coordinates],
+                        [longitude for longitude, _ in coordinates],
+                    ),
+                )
+                if inside
+            ]
+        if self.modifiers["strict_location"] and self.geocode is not None:
+            # Tweets beyond the radius are dropped before anything is built.
+            coordinates = [tweet["coordinates"]["coordinates"] for tweet in statuses]
+            statuses = [
+                tweet
+                for tweet, inside in zip(
+                    statuses,
+                    within(
+                        [latitude for _, latitude in coordinates],
+                        [longitude for longitude, _ in coordinates],
+                        self.location,
+                    ),
+                )
+                if inside
+            ]
+        seen = self.modifiers["dedupe"]
+        if seen is not None:
+            # Duplicates are dropped before their images are downloaded,
+            # but IDs are only remembered once their features are kept.
+            unseen = {}
+            for tweet in statuses:
+                if tweet["id"] not in seen:
+                    unseen.setdefault(tweet["id"], tweet)
+            self.metrics.add("duplicates", len(statuses) - len(unseen))
+            statuses = list(unseen.values())
+        return statuses
+
+    def page(self, results):
+        """
+        Transform a page of search results.
+
+        :rtype: list
+        :returns: (Snowflake ID, GeoJSON Feature, image URL) triples
+                  or None if the page contains no statuses
+                  (i.e. the request was too complex).
+        """
+        statuses = self.statuses(results)
+        if statuses is None:
+            return None
+        times = snowflakes2utcms([tweet["id"] for tweet in statuses])
+        return [
+            (tweet["id"],) + self.transform(tweet, posted)
+            for tweet, posted in zip(statuses, times)
+        ]
+
+    def content(self, tweet):
+        """
+        Find the text of a Tweet and the image it refers to.
+
+        :rtype: tuple
+        :returns: the text (or None) and the image URL (or None)
+        """
+        text = None
+        if "text" in self.kinds or (
+            "image" in self.kinds and not self.modifiers["strict_media"]
+        ):
+            text = tweet.get("text")
+        media_url = None
+        if "image" in self.kinds:
+            if tweet.get("entities", {}).get("media") is not None:
+                for entity in tweet["entities"]["media"]:
+                    if entity.get("type") is not None:
+                        if entity["type"].lower() == "photo":
+                            key = "media_url_https"
+                            if not self.modifiers["secure"]:
+                                key = "media_url"
+                            if entity.get(key) is not None:
+                                # Only the last photo is kept.
+                                media_url = entity[key]
+        return text, media_url
+
+    def transform(self, tweet, posted):
+        """
+        Package a Tweet as a feature and find the image it refers to.
+
+        :type posted: int
+        :param posted: Specify when the Tweet was posted
+                     (in milliseconds, since pages are converted at once).
+        """
+        text, media_url = self.content(tweet)
+        feature = Feature(
+            tweet["id"],
+            tweet["coordinates"]["coordinates"][0],
+            tweet["coordinates"]["coordinates"][1],
+            posted,
+            "Twitter",
+            text,
+        )
+        return feature, media_url
+
+    def download(self, media_url):
+        """
+        Request an image from the network.
+
+        :rtype: file-like object (or an awaitable that produces one)
+        :returns: the response of the `network` modifier
+        """
+        if self.modifiers["media_timeout"] is None:
+            return self.modifiers["network"](media_url)
+        return self.modifiers["network"](
+            media_url,
+            timeout=self.modifiers["media_timeout"],
+        )
+
+    def encode(self, image):
+        """Count and encode a downloaded image."""
+        self.metrics.add("media_requests")
+        self.metrics.add("media_bytes", len(image))
+        return _encode(image)
+
+    def store(self, response, media_url):
+        """
+        Count a downloaded image and encode it
+        (or spool it to a file in "file" mode).
+
+        :type response: file-like object
+        :param response: Specify the downloaded image.
+
+        :rtype: bytes or str
+        :returns: the base64 encoded image or the path of the file
+        """
+        if self.modifiers["image_mode"] != "file":
+            return self.encode(response.read())
+        path, size = spool(
+            response,
+            self.modifiers["spool"],
+            posixpath.splitext(urlsplit(media_url).path)[1],
+        )
+        self.metrics.add("media_requests")
+        self.metrics.add("media_bytes", size)
+        return path
+
+    def image(self, media_url):
+        """
+        Represent an image as the `image_mode` modifier specifies.
+
+        :rtype: bytes or str
+        :returns: the base64 encoded image, the path of a spooled file,
+                  or the URL (which is not downloaded)
+        """
+        if self.modifiers["image_mode"] == "url":
+            return media_url
+        return self.store(self.download(media_url), media_url)
+
+    def unseen(self, tweet_id):
+        """
+        Remember the ID of a result that is kept (if duplicates are skipped).
+
+        :rtype: bool
+        :returns: whether the ID was not kept before
+        """
+        seen = self.modifiers["dedupe"]
+        if seen is None or seen.add(tweet_id):
+            return True
+        self.metrics.add("duplicates")  # (e.g. from a concurrent search)
+        return False
+
+    def keep(self, feature):
+        """Count a feature if it has content (and was not kept before)."""
+        if feature.text is None and feature.image is None:
+            return False
+        if not self.unseen(feature.id):
+            return False
+        self.collected += 1
+        return True
+
+    def output(self, feature):
+        """Represent a feature as a dict (unless `compact` was requested)."""
+        if self.modifiers["compact"]:
+            return feature
+        return feature.to_dict(keep=False)
+
+    def advance(self, results):
+        """
+        Prepare for the next page of results.
+
+        :rtype: bool
+        :returns: whether another query should be made
+        """
+        known = (
+            self.modifiers["high_water_mark"] is not None
+            and self.since_id is not None
+            and self.oldest is not None
+            and self.oldest <= self.since_id
+        )
+        next_max_id = _next_max_id(results)
+        self.caught_up = known or next_max_id is None
+        self.cursor = next_max_id
+        remained = self.remaining
+        self.remaining = self.total - self.collected
+        if self.queries % self.modifiers["log_sample"] == 0:
+            self.event(
+                logging.DEBUG,
+                "page",
+                "Status: 1 query produced %d results.",
+                remained - self.remaining,
+                page=self.queries,
+                results=remained - self.remaining,
+            )
+        if self.remaining <= 0:
+            self.outcome("success")
+            return False
+        outcome = "success" if self.collected else "failure"
+        if self.caught_up:
+            self.outcome(outcome, "No retrievable results remain.")
+            return False
+        self.max_id = next_max_id
+        if self.queries >= self.modifiers["query_limit"]:
+            self.outcome(outcome, "No remaining results are retrievable.")
+        return True
+
+
+def _iter_pages(query, api):
+    """
+    Search page after page (or every shard) within the query's limits.
+
+    :rtype: generator
+    :returns: pages of (Snowflake ID, GeoJSON Feature, image URL) triples
+    """
+    with query.metrics.time("rate_limit"):
+        if not query.budget():
+            query.limit(api.get_application_rate_limit_status())
+    if query.sharded():
+        yield _search_shards(query)
+        return
+    for _ in query.pages():
+        if not query.reserve():
+            break
+        try:
+            results = query.search(api)
+        except Exception:
+            query.failed()
+            raise
+        with query.metrics.time("transform"):
+            page = query.page(results)
+        if page is None:
+            break
+        yield page
+        if not query.advance(results):
+            break
+
+
+def _iter_features(query):
+    """
+    Fetch the images of each page and keep the features with content.
+
+    Every driver of a (synchronous) search consumes this,
+    so only what is done with each kept feature differs between them.
+
+    :rtype: generator
+    :returns: GeoJSON Feature(s)
+    """
+    download = query.image
+    with query.client() as api, ThreadPoolExecutor(
+        max_workers=max(1, query.modifiers["media_workers"] or 1),
+    ) as executor:
+        for page in _iter_pages(query, api):
+            if query.modifiers["media_workers"]:
+                page = [
+                    (
+                        feature,
+                        executor.submit(download, media_url)
+                        if media_url is not None
+                        else None,
+                    )
+                    for _, feature, media_url in page
+                ]
+            else:
+                page = [(feature, media_url) for _, feature, media_url in page]
+            for feature, image in page:
+                if image is not None:
+                    with query.metrics.time("media"):
+                        if query.modifiers["media_workers"]:
+                            image = image.result()  # This is a Future.
+                        else:
+                            image = download(image)  # This is a URL.
+                    feature.image = image
+                if query.keep(feature):
+                    yield feature
+
+
+def _search_shards(query):
+    """
+    Search disjoint Snowflake ID ranges of an interval concurrently.
+
+    The interval is split into `shards` ranges that are each searched for
+    a page of results.
+    Whenever a range has more results than fit on a page,
+    the unsearched remainder of it is bisected and both halves are searched,
+    so dense periods fan out while sparse periods finish after one query.
+    Remainders that are older than the newest `quantity` results found
+    so far are not searched.
+    Newer ranges are always scheduled first,
+    so a short `query_limit` (or rate limit) is spent on the newest results.
+
+    :rtype: list
+    :returns: (Snowflake ID, GeoJSON Feature, image URL) triples
+              (newest first and without duplicates)
+    """
+
+    found = {}
+    budget = [query.modifiers["query_limit"]]
+    pending = {}
+
+    def search(since_id, max_id):
+        with query.client() as api:
+            return query.search(api, since_id=since_id, max_id=max_id)
+
+    with ThreadPoolExecutor(
+        max_workers=query.modifiers["shard_workers"] or query.modifiers["shards"],
+    ) as executor:
+
+        def schedule(since_id, max_id):
+            if budget[0] < 1 or not query.reserve():
+                return False
+            budget[0] -= 1
+            pending[executor.submit(search, since_id, max_id)] = since_id
+            return True
+
+        complete = True
+        for since_id, max_id in reversed(
+            _split(query.since_id, query.max_id, query.modifiers["shards"]),
+        ):
+            complete = schedule(since_id, max_id) and complete
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=pending.get, reverse=True):
+                since_id = pending.pop(future)
+                query.queries += 1
+                try:
+                    results = future.result()
+                except Exception:
+                    query.failed()
+                    raise
+                with query.metrics.time("transform"):
+                    page = query.page(results)
+                if page is None:
+                    complete = False
+                    continue
+                for tweet_id, feature, media_url in page:
+                    if media_url is not None or feature.text is not None:
+                        found.setdefault(tweet_id, (feature, media_url))
+                next_max_id = _next_max_id(results)
+                if next_max_id is None:
+                    continue
+                if (
+                    len(found) >= query.total
+                    and next_max_id < heapq.nlargest(query.total, found)[-1]
+                ):
+                    # The remainder cannot contain any of the newest results.
+                    complete = False
+                    continue
+                for since_id, max_id in reversed(_split(since_id, next_max_id, 2)):
+                    complete = schedule(since_id, max_id) and complete
+
+    query.caught_up = complete
+    query.event(
+        logging.INFO,
+        "shards",
+        "Status: %d sharded queries found %d results.",
+        query.queries,
+        len(found),
+        queries=query.queries,
+        results=len(found),
+    )
+    return [
+        (tweet_id,) + found[tweet_id]
+        for tweet_id in sorted(found, reverse=True)[: query.total]
+    ]
+
+
+def twitter_quota(keys, **kwargs):
+    """
+    Find how many searches remain in the Twitter rate limit window.
+
+    A current `ledger` is trusted without a request.
+    Otherwise the limit is requested (with a client from `clients`,
+    if a pool is specified) and the `ledger` is synchronized with it,
+    so a batch of searches can be planned with a single request.
+
+    :type keys: dict
+    :param keys: Specify an API key and access token.
+
+    Runtime modifiers `api`, `clients`, `ledger`, and `fail_hard`
+    are honored as they are by :func:`twitter` (and others are ignored).
+
+    :raises: KeyError, TwythonError (only if `fail_hard`)
+
+    :rtype: int
+    :returns: the number of searches remaining (or None if it is unknown)
+    """
+    ledger = kwargs.get("ledger")
+    if ledger is not None and not ledger.stale():
+        return ledger.remaining
+    keychain = {key.lower(): value for key, value in keys.items()}
+    factory = kwargs.get("api") or Twython
+    arguments = (factory, keychain.get("consumer_key"))
+    keywords = {"access_token": keychain.get("access_token")}
+    try:
+        if kwargs.get("clients") is None:
+            api = factory(*arguments[1:], **keywords)
+            limits = api.get_application_rate_limit_status()
+        else:
+            with kwargs["clients"].client(*arguments, **keywords) as api:
+                limits = api.get_application_rate_limit_status()
+        remaining, reset = _search_limit(limits)
+    except Exception:  # pylint: disable=broad-except
+        if kwargs.get("fail_hard"):
+            raise
+        return None
+    if ledger is not None:
+        ledger.sync(remaining, reset)
+    return remaining
+
+
+def _tiles(media, keyword, quantity, location, interval, kwargs):
+    """
+    Cover an area with geocodes (so each may be searched like a circle).
+
+    :rtype: tuple
+    :returns: the sanitized quantity, the geocode of each tile,
+              the modifiers to search each tile with,
+              and the number of tiles to search at once
+    """
+    _, _, clean_quantity, polygon, _ = sanitize(
+        media=media,
+        keyword=keyword,
+        quantity=quantity,
+        location=location,
+        interval=interval,
+    )
+    modifiers = dict(kwargs)
+    tiles = cover(
+        polygon,
+        radius=modifiers.pop("tile_radius", None),
+        max_tiles=modifiers.pop("max_tiles", None) or 16,
+    )
+    workers = modifiers.pop("tile_workers", None) or min(len(tiles), 8)
+    modifiers["area"] = polygon
+    if modifiers.get("dedupe") is None or isinstance(modifiers["dedupe"], bool):
+        modifiers["dedupe"] = IDSet()  # Tiles overlap, so they share an ID set.
+    return clean_quantity, tiles, modifiers, workers
+
+
+def _iter_area(keys, media, keyword, quantity, location, interval, kwargs):
+    """Yield Tweets from every tile of an area (up to `quantity` of them)."""
+    quantity, tiles, modifiers, workers = _tiles(
+        media,
+        keyword,
+        quantity,
+        location,
+        interval,
+        kwargs,
+    )
+    if quantity < 1:
+        return
+    tasks = [
+        (
+            "Twitter",
+            lambda tile=tile: iter_twitter(
+                keys=keys,
+                media=media,
+                keyword=keyword,
+                quantity=quantity,
+                location=tile,
+                interval=interval,
+                **modifiers,
+            ),
+        )
+        for tile in tiles
+    ]
+    with contextlib.closing(fan_out(tasks, workers)) as features:
+        for count, feature in enumerate(features, 1):
+            yield feature
+            if count >= quantity:
+                return
 
 
 def twitter(
@@ -139,6 +1136,43 @@ def twitter(
     """
     Fetch Tweets from the Twitter API.
 
+    .. seealso:: :meth:`iter_twitter` describes each parameter.
+                 This function simply collects the results it yields.
+
+    :raises: OGReError, OGReLimitError, TwythonError
+
+    :rtype: list
+    :returns: GeoJSON Feature(s)
+    """
+    return list(
+        iter_twitter(
+            keys=keys,
+            media=media,
+            keyword=keyword,
+            quantity=quantity,
+            location=location,
+            interval=interval,
+            **kwargs,
+        ),
+    )
+
+
+def iter_twitter(
+    keys,
+    media=("image", "text"),
+    keyword="",
+    quantity=15,
+    location=None,
+    interval=None,
+    **kwargs,
+):
+    """
+    Yield Tweets from the Twitter API as each page of results is processed.
+
+    Since nothing is retained between pages, memory use is bounded by the
+    size of a single page and the first result is available as soon as the
+    first query completes.
+
     .. seealso:: :meth:`sanitize_twitter` describes more about
                  the format each parameter must have.
 
@@ -179,6 +1213,15 @@ def twitter(
                      It uses so-called "fuzzy matching logic" to deduce the
                      location of Tweets posted publicly without location data.
                      OGRe filters these out.
+                     An area may be specified instead, either as a bounding
+                     box (west, south, east, north) or as a GeoJSON Polygon.
+                     It is covered with geocodes (see `max_tiles`),
+                     each geocode is searched (for up to `quantity` results,
+                     spending up to `query_limit` queries),
+                     results outside of the area are dropped,
+                     results found by more than one geocode are returned once
+                     (so area searches are never cached),
+                     and up to `quantity` results are returned in all.
 
     :type interval: tuple
     :param interval: Specify a period of time (earliest, latest) to search.
@@ -188,6 +1231,14 @@ def twitter(
                      but when an interval is not specified,
                      "that index includes between 6-9 days of Tweets."
 
+    :type strict_location: bool
+    :param strict_location: Specify whether to drop results outside of the
+                            `location` radius (defaults to False),
+                            since Twitter's geocode matching is fuzzy.
+                            Great-circle distances are computed for each page
+                            at once (with NumPy if it is installed),
+                            before any image is downloaded.
+
     :type strict_media: bool
     :param strict_media: Specify whether to only return the requested media
                          (defaults to False).
@@ -213,12 +1264,136 @@ def twitter(
     :type api: callable
     :param api: Specify API access point (for dependency injection).
 
+    :type cache: ogre.cache.ResultCache
+    :param cache: Specify a cache of results to consult before querying
+                  (and to store complete results in).
+                  :class:`ogre.api.OGRe` relays the cache it was created with.
+
+    :type high_water_mark: ogre.polling.HighWaterMark
+    :param high_water_mark: Specify the newest Tweet a standing query has seen.
+                            Only newer Tweets are fetched,
+                            and the mark is raised once every newer Tweet
+                            has been paged through.
+                            When a call stops short (e.g. at `quantity`),
+                            the mark remembers where it stopped,
+                            so the next call resumes paging from there.
+
+    :type ledger: ogre.ledger.RateLimitLedger
+    :param ledger: Specify a ledger to track the rate limit with
+                   (defaults to requesting the rate limit for every call).
+                   While the ledger's window is current,
+                   the rate limit is not requested,
+                   and every query is reserved against the ledger.
+                   :class:`ogre.api.OGRe` shares a ledger across its fetches.
+
+    :type clients: ogre.pool.ClientPool
+    :param clients: Specify a pool to borrow API clients from
+                    (defaults to constructing a new client for every call).
+                    :class:`ogre.api.OGRe` shares a pool across its fetches.
+
     :type network: callable
     :param network: Specify a network access point (for dependency injection).
+                    :class:`ogre.cache.MediaCache` may be used here to serve
+                    repeated images from disk.
+
+    :type media_workers: int
+    :param media_workers: Specify a number of threads to download images with
+                          (defaults to downloading each image in turn).
+                          Every image on a page is requested before the
+                          first feature of that page is yielded,
+                          and each feature waits only for its own image.
+
+    :type shards: int
+    :param shards: Specify a number of Snowflake ID ranges to split the
+                   `interval` into and search concurrently
+                   (defaults to paging through the interval in turn).
+                   A range with more results than fit on a page is bisected,
+                   and both halves are searched,
+                   until `quantity` results are found or `query_limit`
+                   queries are made.
+                   Results are merged by ID (newest first).
+                   This has no effect unless an `interval` is specified.
+
+    :type shard_workers: int
+    :param shard_workers: Specify a number of threads to search shards with
+                          (defaults to `shards`).
+
+    :type media_timeout: float
+    :param media_timeout: Specify a number of seconds to wait for each image.
+                          When this is set, the `network` callable must
+                          accept a `timeout` keyword argument
+                          (as :func:`urllib.request.urlopen` does).
+
+    :type metrics: ogre.metrics.FetchMetrics
+    :param metrics: Specify where to add the measurements of this call
+                    (e.g. search requests, results scanned, image bytes,
+                    remaining quota, and the time spent in each phase).
+                    :class:`ogre.api.OGRe` relays it to every source,
+                    so one instance measures a whole fetch.
+
+    :type registry: ogre.metrics.Registry
+    :param registry: Specify where to accumulate process-wide metrics
+                     (defaults to :data:`ogre.metrics.REGISTRY`).
+
+    :type dedupe: ogre.dedupe.IDSet
+    :param dedupe: Specify a set of Snowflake IDs to skip results that were
+                   already seen (and remember those that are kept),
+                   or pass True to skip duplicates within this call only.
+                   Share an :class:`ogre.dedupe.IDSet` across bounded runs
+                   (e.g. overlapping locations) or an
+                   :class:`ogre.dedupe.ScalableBloomFilter` across the calls of
+                   a long-running poller (to keep its memory flat).
+                   Duplicates are skipped before their images are downloaded,
+                   and de-duplicated searches are never cached.
+
+    :type compact: bool
+    :param compact: Specify whether to yield :class:`ogre.feature.Feature`
+                    objects (defaults to yielding GeoJSON dicts).
+                    Features build their GeoJSON only when it is first
+                    accessed, so they take a fraction of the memory,
+                    but :mod:`json` cannot serialize them
+                    until they are converted with
+                    :meth:`ogre.feature.Feature.to_dict`.
+
+    :type image_mode: str
+    :param image_mode: Specify how to represent images:
+                       "inline" (the default) downloads each one
+                       and includes it base64 encoded,
+                       "url" includes its URL without downloading it, and
+                       "file" streams it to a file (named after its SHA-256)
+                       in the `spool` directory and includes the path.
+
+    :type spool: str
+    :param spool: Specify a directory to store images in ("file" mode only)
+                  (defaults to a private directory that is created
+                  in the temporary directory once per process).
+
+    :type log_sample: int
+    :param log_sample: Specify how often to log a "page" event
+                       (e.g. 10 logs every tenth page; defaults to every page).
+                       Events are logged to the "ogre.Twitter" logger
+                       with `event`, `qid`, and `source` record attributes
+                       (among other fields), and their messages are only
+                       formatted when their level is enabled.
+
+    :type max_tiles: int
+    :param max_tiles: Specify the most geocodes to cover an area `location`
+                      with (defaults to 16).
+
+    :type tile_radius: float
+    :param tile_radius: Specify the radius (in km) of each geocode to cover
+                        an area `location` with
+                        (defaults to the smallest that needs at most
+                        `max_tiles` geocodes).
+
+    :type tile_workers: int
+    :param tile_workers: Specify a number of threads to search the geocodes
+                         of an area `location` with
+                         (defaults to the number of geocodes, up to 8).
 
     :raises: OGReError, OGReLimitError, TwythonError
 
-    :rtype: list
+    :rtype: generator
     :returns: GeoJSON Feature(s)
 
     .. seealso:: Visit https://dev.twitter.com/docs/using-search for tips on
@@ -227,230 +1402,294 @@ def twitter(
                  https://dev.twitter.com/docs/api/1.1/get/search/tweets.
     """
 
-    (
-        keychain,
-        kinds,
-        keywords,
-        remaining,
-        geocode,
-        (since_id, max_id),
-    ) = sanitize_twitter(
+    if is_area(location):
+        yield from _iter_area(
+            keys, media, keyword, quantity, location, interval, kwargs
+        )
+        return
+
+    query = _Query(
         keys=keys,
         media=media,
         keyword=keyword,
         quantity=quantity,
         location=location,
         interval=interval,
+        kwargs=kwargs,
+        defaults={"api": Twython, "network": urlopen},
     )
+    if query.empty():
+        return
 
-    modifiers = {
-        "api": Twython,
-        "fail_hard": False,
-        "network": urlopen,
-        "query_limit": 450,  # Twitter allows 450 queries every 15 minutes.
-        "secure": True,
-        "strict_media": False,
-    }
-    for modifier in modifiers:
-        if kwargs.get(modifier) is not None:
-            modifiers[modifier] = kwargs[modifier]
-
-    qid = hashlib.sha256(
-        (
-            str(time.time())
-            + str(keywords)
-            + str(remaining)
-            + str(geocode)
-            + str(since_id)
-            + str(max_id)
-            + str(kwargs)
-        ).encode("utf-8"),
-    ).hexdigest()
-
-    log = logging.getLogger(__name__)
-    log.info(qid + " Request: Twitter")
-    log.debug(
-        qid
-        + " Status:"
-        + " media("
-        + str(media)
-        + ")"
-        + " keyword("
-        + str(keywords)
-        + ")"
-        + " quantity("
-        + str(remaining)
-        + ")"
-        + " location("
-        + str(geocode)
-        + ")"
-        + " interval("
-        + str(since_id)
-        + ","
-        + str(max_id)
-        + ")"
-        + " kwargs("
-        + str(kwargs)
-        + ")",
-    )
+    features = query.cached()
+    if features is not None:
+        query.report()
+        yield from map(query.output, features)
+        return
+    features = []
+    try:
+        with contextlib.closing(_iter_features(query)) as kept:
+            for feature in kept:
+                if query.modifiers["cache"] is not None:
+                    features.append(feature)
+                yield query.output(feature)
+        query.finish(features)
+    finally:
+        query.report()
+
+
+def twitter_batch(
+    keys,
+    media=("image", "text"),
+    keyword="",
+    quantity=15,
+    location=None,
+    interval=None,
+    **kwargs,
+):
+    """
+    Fetch Tweets from the Twitter API into columns.
+
+    .. seealso:: :meth:`iter_twitter` describes each parameter.
+
+    Each Tweet is appended to the columns of the batch directly,
+    so no GeoJSON is built unless the batch is iterated.
+
+    :raises: OGReError, OGReLimitError, TwythonError
+
+    :rtype: ogre.batch.FeatureBatch
+    :returns: the features that were found
+    """
 
-    if not kinds or remaining < 1 or modifiers["query_limit"] < 1:
-        log.info(qid + " Success: No results were requested.")
-        return []
+    if is_area(location):
+        batch = FeatureBatch()
+        for feature in _iter_area(
+            keys,
+            media,
+            keyword,
+            quantity,
+            location,
+            interval,
+            dict(kwargs, compact=True),
+        ):
+            batch.append(
+                feature.id,
+                feature.longitude,
+                feature.latitude,
+                feature.time,
+                feature.source,
+                feature.text,
+                feature.image,
+            )
+        return batch
 
-    api = modifiers["api"](
-        keychain["consumer_key"],
-        access_token=keychain["access_token"],
+    query = _Query(
+        keys=keys,
+        media=media,
+        keyword=keyword,
+        quantity=quantity,
+        location=location,
+        interval=interval,
+        kwargs=kwargs,
+        defaults={"api": Twython, "network": urlopen},
     )
+    batch = FeatureBatch()
+    if query.empty():
+        return batch
+
+    query.identity += ("FeatureBatch",)  # Batches are cached apart from lists.
+    cached = query.cached()
+    if cached is not None:
+        query.report()
+        return cached
 
-    limits = api.get_application_rate_limit_status()
     try:
-        limit = int(limits["resources"]["search"]["/search/tweets"]["remaining"])
-        reset = int(limits["resources"]["search"]["/search/tweets"]["reset"])
-        if limit < 1:
-            message = "Queries are being limited."
-            log.info(qid + " Failure: " + message)
-            if modifiers["fail_hard"]:
-                raise OGReLimitError(source="Twitter", message=message, reset=reset)
-        else:
-            log.debug(qid + " Status: " + str(limit) + " queries remain.")
-        if limit < modifiers["query_limit"]:
-            modifiers["query_limit"] = limit
-    except KeyError:
-        log.warning(qid + " Unobtainable Rate Limit")
-        raise
-    total = remaining
-
-    collection = []
-    for query in range(
-        modifiers["query_limit"],
-    ):
-        count = min(remaining, 100)  # Twitter accepts a max count of 100.
-        try:
-            results = api.search(
-                q=keywords,
-                count=count,
-                geocode=geocode,
-                since_id=since_id,
-                max_id=max_id,
-            )
-        except Exception:
-            log.info(
-                qid
-                + " Failure: "
-                + str(query + 1)
-                + " queries produced "
-                + str(len(collection))
-                + " results. "
-                + str(sys.exc_info()[1]),
-            )
-            raise
-        if results.get("statuses") is None:
-            message = "The request is too complex."
-            log.info(
-                qid
-                + " Failure: "
-                + str(query + 1)
-                + " queries produced "
-                + str(len(collection))
-                + " results. "
-                + message,
-            )
-            if modifiers["fail_hard"]:
-                raise OGReError(source="Twitter", message=message)
-            break
-        for tweet in results["statuses"]:
-            if tweet.get("coordinates") is None or tweet.get("id") is None:
-                # Tweets must be geotagged and timestamped.
-                continue
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [
-                        tweet["coordinates"]["coordinates"][0],
-                        tweet["coordinates"]["coordinates"][1],
-                    ],
-                },
-                "properties": {
-                    "source": "Twitter",
-                    "time": datetime.utcfromtimestamp(
-                        snowflake2utc(tweet["id"]),
-                    ).isoformat()
-                    + "Z",
-                },
-            }
-            if "text" in kinds:
-                if tweet.get("text") is not None:
-                    feature["properties"]["text"] = tweet["text"]
-            if "image" in kinds:
-                if not modifiers["strict_media"]:
-                    if tweet.get("text") is not None:
-                        feature["properties"]["text"] = tweet["text"]
-                if tweet.get("entities", {}).get("media") is not None:
-                    for entity in tweet["entities"]["media"]:
-                        if entity.get("type") is not None:
-                            if entity["type"].lower() == "photo":
-                                media_url = "media_url_https"
-                                if not modifiers["secure"]:
-                                    media_url = "media_url"
-                                if entity.get(media_url) is not None:
-                                    feature["properties"]["image"] = base64.b64encode(
-                                        modifiers["network"](entity[media_url])
-                                        .read()
-                                        .encode("utf-8"),
-                                    )
-            if len(feature["properties"]) > 2:
-                collection.append(feature)
-        remained = remaining
-        remaining = total - len(collection)
-        log.debug(
-            qid
-            + " Status:"
-            + " 1 query produced "
-            + str(remained - remaining)
-            + " results.",
+        with contextlib.closing(_iter_features(query)) as kept:
+            for feature in kept:
+                batch.append(
+                    feature.id,
+                    feature.longitude,
+                    feature.latitude,
+                    feature.time,
+                    feature.source,
+                    feature.text,
+                    feature.image,
+                )
+        query.finish(batch)
+    finally:
+        query.report()
+    return batch
+
+
+async def _resolve(result):
+    """Await a result if it is awaitable (so blocking fakes may be injected)."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+async def atwitter(
+    keys,
+    media=("image", "text"),
+    keyword="",
+    quantity=15,
+    location=None,
+    interval=None,
+    **kwargs,
+):
+    """
+    Fetch Tweets from the Twitter API without blocking the event loop.
+
+    .. seealso:: :meth:`aiter_twitter` describes each parameter.
+                 This coroutine simply collects the results it yields.
+
+    :raises: OGReError, OGReLimitError
+
+    :rtype: list
+    :returns: GeoJSON Feature(s)
+    """
+    return [
+        feature
+        async for feature in aiter_twitter(
+            keys=keys,
+            media=media,
+            keyword=keyword,
+            quantity=quantity,
+            location=location,
+            interval=interval,
+            **kwargs,
         )
-        if remaining <= 0:
-            log.info(
-                qid
-                + " Success: "
-                + str(query + 1)
-                + " queries produced "
-                + str(len(collection))
-                + " results.",
-            )
-            break
-        if results.get("search_metadata", {}).get("next_results") is None:
-            outcome = "Success" if collection else "Failure"
-            log.info(
-                qid
-                + " "
-                + outcome
-                + ": "
-                + str(query + 1)
-                + " queries produced "
-                + str(len(collection))
-                + " results. "
-                + "No retrievable results remain.",
-            )
-            break
-        max_id = int(
-            results["search_metadata"]["next_results"]
-            .split("max_id=")[1]
-            .split("&")[0],
+    ]
+
+
+async def aiter_twitter(
+    keys,
+    media=("image", "text"),
+    keyword="",
+    quantity=15,
+    location=None,
+    interval=None,
+    **kwargs,
+):
+    """
+    Yield Tweets from the Twitter API without blocking the event loop.
+
+    .. seealso:: :meth:`iter_twitter` describes each parameter.
+
+    The `api` modifier defaults to :class:`ogre.aio.AsyncTwython`,
+    and the `network` modifier defaults to :func:`ogre.aio.urlopen`.
+    Injected dependencies may return awaitables or plain results,
+    so the same fakes used with :meth:`iter_twitter` work here too.
+    Sharding (i.e. the `shards` modifier) is not supported here.
+    The images on each page are downloaded concurrently,
+    and `media_workers` (defaulting to 100) caps how many are in flight.
+    The geocodes of an area `location` are searched concurrently,
+    and `tile_workers` caps how many are searched at once.
+
+    :raises: OGReError, OGReLimitError
+
+    :rtype: async generator
+    :returns: GeoJSON Feature(s)
+    """
+
+    if is_area(location):
+        quantity, tiles, modifiers, workers = _tiles(
+            media,
+            keyword,
+            quantity,
+            location,
+            interval,
+            kwargs,
         )
-        if query + 1 >= modifiers["query_limit"]:
-            outcome = "Success" if collection else "Failure"
-            log.info(
-                qid
-                + " "
-                + outcome
-                + ": "
-                + str(query + 1)
-                + " queries produced "
-                + str(len(collection))
-                + " results. "
-                + "No remaining results are retrievable.",
-            )
-    return collection
+        limit = asyncio.Semaphore(workers)
+
+        async def search(tile):
+            async with limit:
+                return await atwitter(
+                    keys=keys,
+                    media=media,
+                    keyword=keyword,
+                    quantity=quantity,
+                    location=tile,
+                    interval=interval,
+                    **modifiers,
+                )
+
+        found = await asyncio.gather(*(search(tile) for tile in tiles))
+        features = [feature for tile_features in found for feature in tile_features]
+        for feature in features[: max(0, quantity)]:
+            yield feature
+        return
+
+    query = _Query(
+        keys=keys,
+        media=media,
+        keyword=keyword,
+        quantity=quantity,
+        location=location,
+        interval=interval,
+        kwargs=kwargs,
+        defaults={"api": aio.AsyncTwython, "network": aio.urlopen},
+    )
+    if query.empty():
+        return
+
+    features = query.cached()
+    if features is not None:
+        query.report()
+        for feature in features:
+            yield query.output(feature)
+        return
+    features = []
+
+    semaphore = asyncio.Semaphore(max(1, query.modifiers["media_workers"] or 100))
+
+    async def download(media_url):
+        if query.modifiers["image_mode"] == "url":
+            return media_url
+        async with semaphore:
+            response = await _resolve(query.download(media_url))
+            image = await _resolve(response.read())
+        if isinstance(image, str):
+            image = image.encode("utf-8")
+        return query.store(io.BytesIO(image), media_url)
+
+    try:
+        with query.client() as api:
+            with query.metrics.time("rate_limit"):
+                if not query.budget():
+                    query.limit(
+                        await _resolve(api.get_application_rate_limit_status()),
+                    )
+            for _ in query.pages():
+                if not query.reserve():
+                    break
+                try:
+                    with query.metrics.time("search"):
+                        results = await _resolve(api.search(**query.parameters()))
+                except Exception:
+                    query.failed()
+                    raise
+                query.metrics.add("searches")
+                query.observe(api)
+                with query.metrics.time("transform"):
+                    page = query.page(results)
+                if page is None:
+                    break
+                with query.metrics.time("media"):
+                    images = await asyncio.gather(
+                        *(download(url) for _, _, url in page if url is not None),
+                    )
+                images.reverse()
+                for _, feature, media_url in page:
+                    if media_url is not None:
+                        feature.image = images.pop()
+                    if query.keep(feature):
+                        if query.modifiers["cache"] is not None:
+                            features.append(feature)
+                        yield query.output(feature)
+                if not query.advance(results):
+                    break
+        query.finish(features)
+    finally:
+        query.report()
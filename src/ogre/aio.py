@@ -0,0 +1,208 @@
+"""
+OGRe Asynchronous HTTP
+
+:class:`Response` -- buffered HTTP response
+
+:func:`request` -- make an HTTP GET request without blocking the event loop
+
+:func:`urlopen` -- asynchronous counterpart of :func:`urllib.request.urlopen`
+
+:class:`AsyncTwython` -- asynchronous subset of the Twython interface
+"""
+
+import asyncio
+import json
+import ssl
+from urllib.parse import urlencode, urlsplit
+
+from ogre.exceptions import OGReError, OGReLimitError
+
+
+class Response:
+
+    """Hold the status, headers, and body of an HTTP response."""
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def read(self):
+        """Return the body (mirroring file-like responses)."""
+        return self.body
+
+    def json(self):
+        """Decode the body as JSON."""
+        return json.loads(self.body.decode("utf-8"))
+
+
+async def _read_response(reader):
+    """Parse an HTTP/1.1 response from a stream."""
+    status_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    parts = status_line.split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise OGReError(source="HTTP", message="Malformed status line.")
+    status = int(parts[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Discard trailers.
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+        return Response(status, headers, bytes(body))
+    if "content-length" in headers:
+        return Response(
+            status,
+            headers,
+            await reader.readexactly(int(headers["content-length"])),
+        )
+    return Response(status, headers, await reader.read())
+
+
+async def request(url, headers=None, timeout=None):
+    """
+    Make an HTTP GET request without blocking the event loop.
+
+    :type url: str
+    :param url: Specify an http or https URL to retrieve.
+
+    :type headers: dict
+    :param headers: Specify additional request headers.
+
+    :type timeout: float
+    :param timeout: Specify a number of seconds to wait for a response.
+
+    :raises: ValueError, OSError, asyncio.TimeoutError
+
+    :rtype: Response
+    :returns: the buffered response
+    """
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise ValueError('URL scheme must be "http" or "https".')
+    secure = parts.scheme == "https"
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            parts.hostname,
+            parts.port or (443 if secure else 80),
+            ssl=ssl.create_default_context() if secure else None,
+        ),
+        timeout,
+    )
+    try:
+        lines = [
+            "GET " + target + " HTTP/1.1",
+            "Host: " + parts.netloc,
+            "Accept-Encoding: identity",
+            "Connection: close",
+            "User-Agent: OGRe",
+        ]
+        for name, value in (headers or {}).items():
+            lines.append(name + ": " + value)
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+        return await asyncio.wait_for(_read_response(reader), timeout)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def urlopen(url, timeout=None):
+    """
+    Retrieve a URL without blocking the event loop.
+
+    :raises: OGReError
+
+    :rtype: Response
+    :returns: a response that may be read like the result of
+              :func:`urllib.request.urlopen`
+    """
+    response = await request(url, timeout=timeout)
+    if response.status >= 400:
+        raise OGReError(
+            source="HTTP",
+            message=str(response.status) + " " + url,
+        )
+    return response
+
+
+class AsyncTwython:
+
+    """
+    Query the Twitter API without blocking the event loop.
+
+    Only the methods OGRe uses are provided,
+    and they accept the same parameters as their Twython equivalents.
+    Requests are authenticated with an OAuth 2 bearer token
+    (i.e. the `access_token`).
+    """
+
+    api_url = "https://api.twitter.com/1.1"
+
+    def __init__(self, app_key=None, access_token=None, api_url=None, timeout=None):
+        self.app_key = app_key
+        self.access_token = access_token
+        if api_url is not None:
+            self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self._last_headers = {}
+
+    def get_lastfunction_header(self, header, default_return_value=None):
+        """Get a header from the most recent response."""
+        return self._last_headers.get(header.lower(), default_return_value)
+
+    async def _get(self, endpoint, params):
+        """Make an authenticated request to a Twitter API endpoint."""
+        query = urlencode(
+            {key: value for key, value in params.items() if value is not None},
+        )
+        url = self.api_url + "/" + endpoint + ".json"
+        if query:
+            url += "?" + query
+        headers = {}
+        if self.access_token is not None:
+            headers["Authorization"] = "Bearer " + self.access_token
+        response = await request(url, headers=headers, timeout=self.timeout)
+        self._last_headers = response.headers
+        if response.status == 429:
+            reset = response.headers.get("x-rate-limit-reset")
+            raise OGReLimitError(
+                source="Twitter",
+                message="Rate limit exceeded",
+                reset=int(reset) if reset is not None else None,
+            )
+        if response.status >= 400:
+            raise OGReError(
+                source="Twitter",
+                message=str(response.status) + " " + endpoint,
+            )
+        return response.json()
+
+    async def get_application_rate_limit_status(self, **params):
+        """Get the rate limits of the authenticated application."""
+        return await self._get("application/rate_limit_status", params)
+
+    async def search(self, **params):
+        """Search for Tweets."""
+        return await self._get("search/tweets", params)
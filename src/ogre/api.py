@@ -5,10 +5,28 @@ OGRe Query Handler
 
 :meth:`OGRe.fetch` -- method for making a retriever fetch data
 
+:meth:`OGRe.iter_fetch` -- generator form of :meth:`OGRe.fetch`
+
+:meth:`OGRe.fetch_many` -- method for making a retriever fetch a batch of queries
+
+:meth:`OGRe.iter_fetch_many` -- generator form of :meth:`OGRe.fetch_many`
+
+:meth:`OGRe.afetch` -- asynchronous form of :meth:`OGRe.fetch`
+
 :meth:`OGRe.get` -- alias of :meth:`OGRe.fetch`
 """
 
-from ogre.Twitter import twitter
+import asyncio
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ogre.batch import FeatureBatch
+from ogre.concurrency import fan_out
+from ogre.dedupe import IDSet
+from ogre.ledger import RateLimitLedger
+from ogre.pool import ClientPool
+from ogre.spill import SpillBuffer
+from ogre.Twitter import atwitter, iter_twitter, twitter_batch, twitter_quota
 
 
 class OGRe:
@@ -26,16 +44,32 @@ class OGRe:
 
     :meth:`fetch` -- method for retrieving data from a public source
 
+    :meth:`iter_fetch` -- method for streaming data from a public source
+
+    :meth:`fetch_many` -- method for retrieving data for a batch of queries
+
+    :meth:`iter_fetch_many` -- method for streaming data for a batch of queries
+
+    :meth:`afetch` -- method for retrieving data without blocking an event loop
+
+    :meth:`close` -- method for releasing pooled connections
+
     :meth:`get` -- backwards-compatible alias of :meth:`fetch`
     """
 
-    def __init__(self, keys):
+    def __init__(self, keys, cache=None):
         """
         Instantiate an OGRe.
 
         :type keys: dict
         :param keys: Specify dictionaries containing API keys for sources.
 
+        :type cache: ogre.cache.ResultCache
+        :param cache: Specify a cache of results to share across fetches
+                      (defaults to no caching).
+                      It is available later through the :attr:`cache`
+                      attribute (e.g. to inspect its hit and miss counts).
+
         Keys that a retriever object is instantiated with may be accessed later
         through the :attr:`keychain` attribute.
 
@@ -46,6 +80,15 @@ class OGRe:
                   This enables you to pass a key with a name stylized in the
                   manner of your choosing
                   (e.g. twitter, Twitter, tWiTtEr, etc.).
+
+        .. note:: API clients are pooled in the :attr:`clients` attribute
+                  and reused by every fetch, so connections are kept alive
+                  between requests.
+                  Call :meth:`close` (or use the retriever as a context
+                  manager) to release them.
+                  Likewise, the :attr:`ledgers` attribute maps each source
+                  to a :class:`ogre.ledger.RateLimitLedger` that is shared by
+                  every fetch, so rate limits need not be requested each time.
         """
         self.keyring = {}
         for key, _ in keys.items():
@@ -53,6 +96,29 @@ class OGRe:
                 raise ValueError('Keys may include "Twitter" only.')
             self.keyring[key.lower()] = key
         self.keychain = keys
+        self.clients = ClientPool()
+        self.ledgers = {source: RateLimitLedger() for source in self.keyring}
+        self.cache = cache
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Release pooled API clients and their connections."""
+        self.clients.close()
+
+    def _modifiers(self, source, kwargs):
+        """Supplement runtime modifiers with the state this retriever shares."""
+        modifiers = {
+            "cache": self.cache,
+            "clients": self.clients,
+            "ledger": self.ledgers[source],
+        }
+        modifiers.update(kwargs)
+        return modifiers
 
     def fetch(
         self,
@@ -90,40 +156,406 @@ class OGRe:
 
         :type location: tuple
         :param location: Specify a place (latitude, longitude, radius, unit)
-                         to search.
+                         to search,
+                         or an area (a (west, south, east, north) bounding box
+                         or a GeoJSON Polygon) to cover with several places.
 
         :type interval: tuple
         :param interval: Specify a period of time (earliest, latest) to search.
 
+        :type fan_out: int
+        :param fan_out: Specify a number of threads to query sources with
+                        (defaults to querying each source in turn).
+                        When more than 1 thread is allowed,
+                        features are merged in the order they arrive.
+
+        :type fan_out_per_source: int
+        :param fan_out_per_source: Specify how many concurrent queries
+                                   a single source may receive when it is
+                                   listed in `sources` more than once
+                                   (defaults to `fan_out`).
+
+        :type columnar: bool
+        :param columnar: Specify whether to collect results in columns
+                         (defaults to False).
+                         When this is True, a :class:`ogre.batch.FeatureBatch`
+                         is returned instead of a FeatureCollection,
+                         so coordinates may be exported to NumPy, Arrow,
+                         or pandas without building GeoJSON.
+
+        :type dedupe: bool
+        :param dedupe: Specify whether to skip results with an ID that was
+                       already seen during this fetch
+                       (e.g. from overlapping or repeated sources).
+                       A set of IDs (e.g. an :class:`ogre.dedupe.IDSet`)
+                       may be passed instead to share it between fetches.
+
+        :type spill_features: int
+        :param spill_features: Specify how many features to hold in memory
+                               before the rest are spilled to disk
+                               (defaults to holding every feature in memory).
+
+        :type spill_bytes: int
+        :param spill_bytes: Specify how many bytes of features to hold in memory
+                            before the rest are spilled to disk
+                            (defaults to holding every feature in memory).
+
+        :type spill_directory: str
+        :param spill_directory: Specify where to spill features
+                                (defaults to the temporary directory).
+
         :raises: ValueError
 
         :rtype: dict
         :returns: GeoJSON FeatureCollection
+                  (or a :class:`ogre.batch.FeatureBatch` if `columnar`)
+
+        .. note:: Each feature is a GeoJSON dict,
+                  unless the `compact` modifier is True,
+                  in which case each is a :class:`ogre.feature.Feature`,
+                  which may be indexed like (and compares equal to) a dict
+                  but builds its GeoJSON only when it is first accessed.
+                  To serialize compact results with :mod:`json`,
+                  convert features with :meth:`ogre.feature.Feature.to_dict`
+                  (e.g. ``json.dumps(results, default=Feature.to_dict)``).
+
+        .. note:: When `spill_features` or `spill_bytes` is specified,
+                  "features" is a :class:`ogre.spill.SpillBuffer`
+                  (rather than a list) that iterates lazily over memory
+                  and disk and supports :func:`len`.
+                  Its features are always compact.
+                  Close it (or use it as a context manager) to remove
+                  its spilled features from disk.
 
         .. note:: Additional runtime modifiers may be specified to change
                   the way results are retrieved.
-                  Runtime modifiers are relayed to each source module,
+                  Runtime modifiers (other than `fan_out`,
+                  `fan_out_per_source`, `columnar`, and the `spill` modifiers)
+                  are relayed to each source module,
                   and that is where they are documented.
         """
 
-        source_map = {"twitter": twitter}
+        spill = (
+            kwargs.pop("spill_features", None),
+            kwargs.pop("spill_bytes", None),
+            kwargs.pop("spill_directory", None),
+        )
+        if kwargs.pop("columnar", False):
+            batch = FeatureBatch()
+            for part in self._dispatch(
+                {"twitter": lambda **arguments: [twitter_batch(**arguments)]},
+                sources=sources,
+                media=media,
+                keyword=keyword,
+                quantity=quantity,
+                location=location,
+                interval=interval,
+                kwargs=kwargs,
+            ):
+                batch.extend(part)
+            return batch
+
+        if spill[0] is not None or spill[1] is not None:
+            kwargs["compact"] = True  # Only compact features can be spilled.
+        features = self.iter_fetch(
+            sources=sources,
+            media=media,
+            keyword=keyword,
+            quantity=quantity,
+            location=location,
+            interval=interval,
+            **kwargs,
+        )
+        if spill[0] is None and spill[1] is None:
+            return {"type": "FeatureCollection", "features": list(features)}
+        buffer = SpillBuffer(*spill)
+        try:
+            buffer.extend(features)
+        except BaseException:
+            buffer.close()
+            raise
+        return {"type": "FeatureCollection", "features": buffer}
+
+    def iter_fetch(
+        self,
+        sources,
+        media=("image", "sound", "text", "video"),
+        keyword="",
+        quantity=15,
+        location=None,
+        interval=None,
+        **kwargs,
+    ):
+        """
+        Stream geotagged data from public APIs.
+
+        Features are yielded as soon as each source produces them,
+        so callers may begin processing before the final page is retrieved.
+
+        .. seealso:: :meth:`fetch` describes each parameter.
+
+        :raises: ValueError
+
+        :rtype: generator
+        :returns: GeoJSON Feature(s)
+        """
+        return self._dispatch(
+            {"twitter": iter_twitter},
+            sources=sources,
+            media=media,
+            keyword=keyword,
+            quantity=quantity,
+            location=location,
+            interval=interval,
+            kwargs=kwargs,
+        )
+
+    def _dispatch(
+        self,
+        source_map,
+        sources,
+        media,
+        keyword,
+        quantity,
+        location,
+        interval,
+        kwargs,
+    ):
+        """Validate sources and then yield what each of them produces."""
+
+        workers = kwargs.pop("fan_out", None)
+        per_source = kwargs.pop("fan_out_per_source", None)
+        if kwargs.get("dedupe") is True:
+            kwargs["dedupe"] = IDSet()  # Every source shares what it has seen.
 
-        feature_collection = {"type": "FeatureCollection", "features": []}
         if media and quantity > 0:
+            requests = []
             for source in sources:
                 source = source.lower()
                 if source not in source_map.keys():
                     raise ValueError('Source may be "Twitter".')
-                for features in source_map[source](
+                requests.append(source)
+
+            def producer(source):
+                return lambda: source_map[source](
                     keys=self.keychain[self.keyring[source]],
                     media=media,
                     keyword=keyword,
                     quantity=quantity,
                     location=location,
                     interval=interval,
-                    **kwargs,
-                ):
-                    feature_collection["features"].append(features)
+                    **self._modifiers(source, kwargs),
+                )
+
+            if workers is None or workers <= 1:
+                for source in requests:
+                    yield from producer(source)()
+            else:
+                limits = {}
+                if per_source is not None:
+                    limits = {source: per_source for source in requests}
+                yield from fan_out(
+                    [(source, producer(source)) for source in requests],
+                    workers=workers,
+                    limits=limits,
+                )
+
+    def fetch_many(self, queries, priority=None, workers=4, **kwargs):
+        """
+        Get geotagged data for a batch of queries under a shared quota.
+
+        .. seealso:: :meth:`iter_fetch_many` describes each parameter
+                     and how queries are planned.
+
+        :raises: ValueError
+
+        :rtype: list
+        :returns: a GeoJSON FeatureCollection for each query (in order)
+                  or None for each query that was deferred
+        """
+        queries = list(queries)
+        results = [None] * len(queries)
+        for index, collection in self.iter_fetch_many(
+            queries,
+            priority=priority,
+            workers=workers,
+            **kwargs,
+        ):
+            results[index] = collection
+        return results
+
+    def iter_fetch_many(self, queries, priority=None, workers=4, **kwargs):
+        """
+        Stream geotagged data for a batch of queries under a shared quota.
+
+        The rate limit of each source is checked once (through the ledgers
+        that every fetch shares), and then queries are planned in order of
+        priority: each is allotted the searches it is expected to need
+        (a page per 100 results, up to its `query_limit`)
+        until the quota runs short.
+        The query that exhausts the quota is allotted what remains,
+        and any later queries are deferred (rather than competing for
+        searches that are not available).
+        Since many results are dropped (e.g. for lacking geotags),
+        whatever quota is left is then allotted to the planned queries
+        in order of priority, up to the `query_limit` of each.
+        Planned queries are run concurrently,
+        starting with those of the highest priority.
+
+        :type queries: iterable
+        :param queries: Specify the parameters of each query as a dict
+                        (e.g. ``{"sources": ("Twitter",), "keyword": "a"}``)
+                        as they would be passed to :meth:`fetch`.
+
+        :type priority: callable
+        :param priority: Specify how to rank a query (higher runs first)
+                         (defaults to the "priority" of each query or 0).
+                         Queries of equal priority are run in order.
+
+        :type workers: int
+        :param workers: Specify a number of queries to run at once.
+
+        Additional runtime modifiers are relayed to every query
+        (although each query may override them).
+        If `dedupe` is True, every query shares a set of seen IDs.
+
+        :raises: ValueError
+
+        :rtype: generator
+        :returns: (index, GeoJSON FeatureCollection) pairs
+                  as each query completes
+                  (or (index, None) for each deferred query, first)
+        """
+
+        if kwargs.get("dedupe") is True:
+            kwargs["dedupe"] = IDSet()  # Every query shares what it has seen.
+        queries = [dict(query) for query in queries]
+        ranks = [query.pop("priority", 0) for query in queries]
+        if priority is not None:
+            ranks = [priority(query) for query in queries]
+        order = sorted(range(len(queries)), key=ranks.__getitem__, reverse=True)
+
+        budgets = {}
+
+        def affordable(sources, wanted):
+            for source in set(sources):
+                if budgets[source] is not None:
+                    wanted = min(wanted, budgets[source] // sources.count(source))
+            return wanted
+
+        def spend(sources, allotment):
+            for source in sources:
+                if budgets[source] is not None:
+                    budgets[source] -= allotment
+
+        plan = []
+        for index in order:
+            query = dict(kwargs, **queries[index])
+            limit = query.get("query_limit")
+            limit = 450 if limit is None else limit
+            cost = 0
+            if query.get("media", True) and query.get("quantity", 15) > 0:
+                cost = min(
+                    math.ceil(query.get("quantity", 15) / 100),  # 100 per page.
+                    limit,
+                )
+            sources = [source.lower() for source in query.get("sources", ())]
+            for source in sources:
+                if source not in budgets:
+                    budgets[source] = self._quota(source, kwargs)
+            allotment = affordable(sources, cost)
+            if cost > 0 and allotment < 1:
+                yield index, None  # There is no quota left for this query.
+                continue
+            spend(sources, allotment)
+            query["query_limit"] = allotment
+            plan.append((index, query, sources, limit if cost else 0))
+
+        for _, query, sources, limit in plan:
+            # The rest of the quota lets queries page past dropped results.
+            extra = affordable(sources, limit - query["query_limit"])
+            spend(sources, extra)
+            query["query_limit"] += extra
+
+        executor = ThreadPoolExecutor(max_workers=max(1, int(workers)))
+        futures = {}
+        try:
+            for index, query, _, _ in plan:
+                futures[executor.submit(self.fetch, **query)] = index
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _quota(self, source, kwargs):
+        """Find how many searches a source allows (or None if it is unknown)."""
+        quota_map = {"twitter": twitter_quota}
+        if source not in quota_map or source not in self.keyring:
+            return None  # Fetching will raise a ValueError.
+        return quota_map[source](
+            keys=self.keychain[self.keyring[source]],
+            **self._modifiers(source, kwargs),
+        )
+
+    async def afetch(
+        self,
+        sources,
+        media=("image", "sound", "text", "video"),
+        keyword="",
+        quantity=15,
+        location=None,
+        interval=None,
+        **kwargs,
+    ):
+        """
+        Get geotagged data from public APIs without blocking the event loop.
+
+        Every source is queried concurrently on the running event loop,
+        and features are packaged in the order `sources` are listed.
+
+        .. seealso:: :meth:`fetch` describes each parameter.
+                     Asynchronous source modules
+                     (e.g. :meth:`ogre.Twitter.aiter_twitter`)
+                     document their own runtime modifiers.
+
+        :raises: ValueError
+
+        :rtype: dict
+        :returns: GeoJSON FeatureCollection
+        """
+
+        source_map = {"twitter": atwitter}
+        if kwargs.get("dedupe") is True:
+            kwargs["dedupe"] = IDSet()  # Every source shares what it has seen.
+
+        feature_collection = {"type": "FeatureCollection", "features": []}
+        if media and quantity > 0:
+            requests = []
+            for source in sources:
+                source = source.lower()
+                if source not in source_map.keys():
+                    raise ValueError('Source may be "Twitter".')
+                requests.append(source)
+            for features in await asyncio.gather(
+                *(
+                    source_map[source](
+                        keys=self.keychain[self.keyring[source]],
+                        media=media,
+                        keyword=keyword,
+                        quantity=quantity,
+                        location=location,
+                        interval=interval,
+                        **self._modifiers(source, kwargs),
+                    )
+                    for source in requests
+                ),
+            ):
+                feature_collection["features"].extend(features)
         return feature_collection
 
     def get(
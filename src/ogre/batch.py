@@ -0,0 +1,188 @@
+"""
+OGRe Columnar Results
+
+:class:`FeatureBatch` -- features stored as parallel columns
+"""
+
+from array import array
+
+from ogre.feature import Feature
+
+
+class FeatureBatch:
+
+    """
+    Store features as parallel columns instead of a dict per feature.
+
+    Coordinates, IDs, and timestamps are kept in typed arrays,
+    so they may be handed to NumPy, Arrow, or pandas without copying
+    (and without walking any GeoJSON).
+    Iterating over a batch still yields (GeoJSON) features.
+
+    .. note:: NumPy, PyArrow, and pandas are optional dependencies.
+              Each is imported only by the method that needs it.
+              While an exported array is alive,
+              the batch it views cannot grow (Python raises BufferError).
+
+    :attr:`ids` -- Snowflake IDs (int64)
+
+    :attr:`longitudes` -- longitudes (float64)
+
+    :attr:`latitudes` -- latitudes (float64)
+
+    :attr:`times` -- POSIX timestamps in milliseconds (int64)
+
+    :attr:`sources` -- names of the sources each feature came from
+
+    :attr:`texts` -- text of each feature (or None)
+
+    :attr:`images` -- base64 encoded image of each feature
+                      (or its URL or path, depending on `image_mode`, or None)
+    """
+
+    columns = ("id", "longitude", "latitude", "time", "source", "text", "image")
+
+    def __init__(self):
+        """Create an empty batch."""
+        self.ids = array("q")
+        self.longitudes = array("d")
+        self.latitudes = array("d")
+        self.times = array("q")
+        self.sources = []
+        self.texts = []
+        self.images = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(
+        self,
+        feature_id,
+        longitude,
+        latitude,
+        time,
+        source,
+        text=None,
+        image=None,
+    ):
+        """
+        Add a feature to the batch.
+
+        :type time: int
+        :param time: Specify a POSIX timestamp in milliseconds.
+        """
+        self.ids.append(feature_id)
+        self.longitudes.append(longitude)
+        self.latitudes.append(latitude)
+        self.times.append(time)
+        self.sources.append(source)
+        self.texts.append(text)
+        self.images.append(image)
+
+    def extend(self, batch):
+        """Add every feature of another batch to this one."""
+        self.ids.extend(batch.ids)
+        self.longitudes.extend(batch.longitudes)
+        self.latitudes.extend(batch.latitudes)
+        self.times.extend(batch.times)
+        self.sources.extend(batch.sources)
+        self.texts.extend(batch.texts)
+        self.images.extend(batch.images)
+
+    def __iter__(self):
+        """Yield each feature (as a :class:`ogre.feature.Feature`)."""
+        for index, feature_id in enumerate(self.ids):
+            yield Feature(
+                feature_id,
+                self.longitudes[index],
+                self.latitudes[index],
+                self.times[index],
+                self.sources[index],
+                self.texts[index],
+                self.images[index],
+            )
+
+    @property
+    def __geo_interface__(self):
+        """Describe the batch as a GeoJSON FeatureCollection."""
+        return {
+            "type": "FeatureCollection",
+            "features": [feature.to_dict() for feature in self],
+        }
+
+    def to_numpy(self):
+        """
+        Export the columns as NumPy arrays.
+
+        Numeric columns are views of the batch (not copies),
+        and string columns are object arrays.
+
+        :raises: ImportError
+
+        :rtype: dict
+        :returns: an array for each column name
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        def strings(column):
+            exported = numpy.empty(len(column), dtype=object)
+            exported[:] = column
+            return exported
+
+        return {
+            "id": numpy.frombuffer(self.ids, dtype=numpy.int64),
+            "longitude": numpy.frombuffer(self.longitudes, dtype=numpy.float64),
+            "latitude": numpy.frombuffer(self.latitudes, dtype=numpy.float64),
+            "time": numpy.frombuffer(self.times, dtype=numpy.int64).view(
+                "datetime64[ms]",
+            ),
+            "source": strings(self.sources),
+            "text": strings(self.texts),
+            "image": strings(self.images),
+        }
+
+    def to_arrow(self):
+        """
+        Export the columns as an Arrow record batch.
+
+        Numeric columns share their buffers with the batch (not copies).
+
+        :raises: ImportError
+
+        :rtype: pyarrow.RecordBatch
+        :returns: a record batch with a column for each column name
+        """
+        import pyarrow  # type: ignore  # pylint: disable=import-outside-toplevel
+
+        def numbers(column, kind):
+            return pyarrow.Array.from_buffers(
+                kind,
+                len(column),
+                [None, pyarrow.py_buffer(column)],
+            )
+
+        return pyarrow.RecordBatch.from_arrays(
+            [
+                numbers(self.ids, pyarrow.int64()),
+                numbers(self.longitudes, pyarrow.float64()),
+                numbers(self.latitudes, pyarrow.float64()),
+                numbers(self.times, pyarrow.timestamp("ms", tz="UTC")),
+                pyarrow.array(self.sources, type=pyarrow.string()),
+                pyarrow.array(self.texts, type=pyarrow.string()),
+                pyarrow.array(self.images, type=pyarrow.binary()),
+            ],
+            names=list(self.columns),
+        )
+
+    def to_pandas(self):
+        """
+        Export the columns as a pandas DataFrame.
+
+        :raises: ImportError
+
+        :rtype: pandas.DataFrame
+        :returns: a frame with a column for each column name
+        """
+        import pandas  # type: ignore  # pylint: disable=import-outside-toplevel
+
+        return pandas.DataFrame(self.to_numpy(), columns=list(self.columns))
@@ -0,0 +1,375 @@
+"""
+OGRe Caches
+
+:class:`MediaCache` -- persistent, content-addressed cache of downloaded media
+
+:class:`ResultCache` -- in-memory cache of query results
+
+:func:`atomic_write` -- write a file without exposing partial content
+
+:func:`spool` -- stream content to a file named after its digest
+"""
+
+import copy
+import hashlib
+import io
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from urllib.request import urlopen
+
+
+def atomic_write(path, data):
+    """Write a file atomically (so readers never see partial content)."""
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=".tmp-",
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as stream:
+            stream.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def spool(stream, directory, suffix="", chunk_size=64 * 1024):
+    """
+    Stream content to a file named after its SHA-256 (atomically).
+
+    Content is read in chunks, so it is never held in memory at once,
+    and identical content is stored once.
+
+    :type stream: file-like object
+    :param stream: Specify content to read (bytes or str).
+
+    :type directory: str
+    :param directory: Specify where to store the file (created if necessary).
+
+    :type suffix: str
+    :param suffix: Specify a file extension (e.g. ".jpg").
+
+    :type chunk_size: int
+    :param chunk_size: Specify how many bytes to read at once.
+
+    :rtype: tuple
+    :returns: the path of the file and the size of the content
+    """
+    directory = os.fspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(descriptor, "wb") as output:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                digest.update(chunk)
+                output.write(chunk)
+                size += len(chunk)
+        path = os.path.join(directory, digest.hexdigest() + suffix)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+    return path, size
+
+
+class MediaCache:
+
+    """
+    Cache downloaded media on disk so repeated URLs are served locally.
+
+    An instance is a drop-in replacement for the `network` modifier
+    (e.g. ``twitter(..., network=MediaCache("/var/cache/ogre"))``).
+    Each URL refers to an object named after the SHA-256 of its content,
+    so identical images requested through different URLs are stored once.
+    Every file is written atomically, so several processes may share
+    a directory.
+    When the objects exceed `max_bytes`,
+    the least recently used ones are evicted.
+
+    :attr:`hits` -- number of requests served from disk
+
+    :attr:`misses` -- number of requests relayed to the network
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, network=urlopen):
+        """
+        Prepare a cache directory.
+
+        :type directory: str
+        :param directory: Specify where to store media.
+
+        :type max_bytes: int
+        :param max_bytes: Specify the total size of media to retain.
+
+        :type network: callable
+        :param network: Specify a network access point to fetch misses with.
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.network = network
+        self.hits = 0
+        self.misses = 0
+        self._objects = os.path.join(self.directory, "objects")
+        self._urls = os.path.join(self.directory, "urls")
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._urls, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = self._scan()[1]
+
+    def __call__(self, url, **kwargs):
+        """
+        Retrieve a URL, preferring a cached copy.
+
+        :type url: str
+        :param url: Specify the media to retrieve.
+
+        Additional keyword arguments (e.g. `timeout`) are relayed to the
+        network access point on a miss.
+
+        :rtype: io.BytesIO
+        :returns: the media content
+        """
+        data = self.get(url)
+        if data is None:
+            data = self.network(url, **kwargs).read()
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            self.put(url, data)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+        return io.BytesIO(data)
+
+    def _reference(self, url):
+        """Locate the file that maps a URL to its content."""
+        return os.path.join(
+            self._urls,
+            hashlib.sha256(url.encode("utf-8")).hexdigest(),
+        )
+
+    def get(self, url):
+        """
+        Read cached media.
+
+        :rtype: bytes
+        :returns: the cached content of `url` or None if it is not cached
+        """
+        reference = self._reference(url)
+        try:
+            with open(reference, "rb") as stream:
+                digest = stream.read().decode("ascii")
+            path = os.path.join(self._objects, digest)
+            with open(path, "rb") as stream:
+                data = stream.read()
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            # Corruption is treated as a miss.
+            return None
+        try:
+            os.utime(path)
+            os.utime(reference)
+        except FileNotFoundError:
+            pass  # Another process evicted the object after it was read.
+        return data
+
+    def put(self, url, data):
+        """Store media and evict old media if the cache is too large."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self._objects, digest)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            atomic_write(path, data)
+            with self._lock:
+                self._size += len(data)
+        atomic_write(self._reference(url), digest.encode("ascii"))
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _scan(self):
+        """List objects (oldest first) and compute their total size."""
+        objects = []
+        for entry in os.scandir(self._objects):
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            objects.append((stat.st_mtime, stat.st_size, entry.path))
+        objects.sort()
+        return objects, sum(size for _, size, _ in objects)
+
+    def evict(self):
+        """
+        Remove the least recently used objects until the cache fits.
+
+        References that are older than every remaining object
+        (i.e. that refer to evicted objects) are removed too.
+        """
+        with self._lock:
+            objects, size = self._scan()
+            oldest = math.inf
+            for modified, length, path in objects:
+                if size <= self.max_bytes:
+                    oldest = modified
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= length
+            self._size = size
+            for entry in os.scandir(self._urls):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < oldest:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass  # Another process evicted (or replaced) it.
+
+    def clear(self):
+        """Remove every cached object and reference."""
+        with self._lock:
+            for directory in (self._objects, self._urls):
+                for entry in os.scandir(directory):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+            self._size = 0
+
+
+def _sizeof(obj):
+    """Estimate the memory used by a structure of containers."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_sizeof(key) + _sizeof(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_sizeof(item) for item in obj)
+    elif hasattr(obj, "__slots__"):  # e.g. ogre.feature.Feature
+        size += sum(_sizeof(getattr(obj, name, None)) for name in obj.__slots__)
+    elif hasattr(obj, "__dict__"):  # e.g. ogre.batch.FeatureBatch
+        # Arrays (e.g. the batch's numeric columns) count their own buffers.
+        size += _sizeof(vars(obj))
+    return size
+
+
+class ResultCache:
+
+    """
+    Cache query results in memory so identical queries cost no quota.
+
+    Entries expire after `ttl` seconds,
+    and the least recently used entries are evicted once there are more
+    than `max_entries` of them or they occupy more than `max_bytes`.
+    Results are copied in and out so callers may modify them freely.
+    An instance may be shared by many threads.
+
+    :attr:`hits` -- number of lookups that found a current entry
+
+    :attr:`misses` -- number of lookups that did not
+    """
+
+    def __init__(
+        self,
+        ttl=60,
+        max_entries=128,
+        max_bytes=64 * 1024 * 1024,
+        clock=time.monotonic,
+    ):
+        """
+        Create an empty cache.
+
+        :type ttl: float
+        :param ttl: Specify how many seconds an entry remains current.
+
+        :type max_entries: int
+        :param max_entries: Specify how many entries to retain.
+
+        :type max_bytes: int
+        :param max_bytes: Specify (approximately) how much memory to use.
+
+        :type clock: callable
+        :param clock: Specify a source of monotonic time
+                      (for dependency injection).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up current results.
+
+        :rtype: list
+        :returns: a copy of the cached results or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            results = entry[2]
+        return copy.deepcopy(results)
+
+    def put(self, key, results):
+        """Store a copy of results (unless they alone exceed `max_bytes`)."""
+        results = copy.deepcopy(results)
+        size = _sizeof(results)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + self.ttl, size, results)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Remove an entry (while holding the lock)."""
+        self.size -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
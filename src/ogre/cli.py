@@ -63,6 +63,16 @@ def cli(parser=None):
         default=None,
         nargs=2,
     )
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="Specify an output format."
+        + " 'json' (a FeatureCollection), 'ndjson' (a Feature per line),"
+        + " and 'geojsonseq' (RFC 8142) are supported."
+        + " Features are written as they are retrieved unless 'json' is used.",
+        choices=("json", "ndjson", "geojsonseq"),
+        default="json",
+    )
     parser.add_argument(
         "--hard",
         help="Fail hard (Raise exceptions instead of returning empty).",
@@ -75,6 +85,19 @@ def cli(parser=None):
         action="store_true",
         default=False,
     )
+    parser.add_argument(
+        "--images",
+        help="Specify how to represent images."
+        + " 'inline' (base64), 'url' (not downloaded),"
+        + " and 'file' (a path in the spool directory) are supported.",
+        choices=("inline", "url", "file"),
+        default=None,
+    )
+    parser.add_argument(
+        "--spool",
+        help="Specify a directory to store images in (with '--images file').",
+        default=None,
+    )
     parser.add_argument(
         "--limit",
         help="Specify a query limit.",
@@ -94,6 +117,13 @@ def cli(parser=None):
     return parser
 
 
+def _serialize(obj):
+    """Represent base64-encoded media (bytes) as JSON."""
+    if isinstance(obj, bytes):
+        return obj.decode("ascii")
+    raise TypeError(repr(obj) + " is not JSON serializable")
+
+
 def main(argv=None):
     """Process arguments and invoke OGRe to fetch some data."""
 
@@ -132,21 +162,38 @@ def main(argv=None):
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    print(
-        json.dumps(
-            OGRe(args.keys).fetch(
-                sources=args.sources,
-                media=args.media,
-                keyword=args.keyword,
-                quantity=args.quantity,
-                location=args.location,
-                interval=args.interval,
-                fail_hard=args.hard,
-                query_limit=args.limit,
-                secure=args.insecure,
-                strict_media=args.strict,
-            ),
-            indent=4,
-            separators=(",", ": "),
-        ),
-    )
+    parameters = {
+        "sources": args.sources,
+        "media": args.media,
+        "keyword": args.keyword,
+        "quantity": args.quantity,
+        "location": args.location,
+        "interval": args.interval,
+        "fail_hard": args.hard,
+        "image_mode": args.images,
+        "spool": args.spool,
+        "query_limit": args.limit,
+        "secure": args.insecure,
+        "strict_media": args.strict,
+    }
+
+    with OGRe(args.keys) as retriever:
+        if args.format == "json":
+            print(
+                json.dumps(
+                    retriever.fetch(**parameters),
+                    indent=4,
+                    separators=(",", ": "),
+                    default=_serialize,
+                ),
+            )
+            return
+
+        separator = "\x1e" if args.format == "geojsonseq" else ""
+        for feature in retriever.iter_fetch(**parameters):
+            sys.stdout.write(
+                separator
+                + json.dumps(feature, separators=(",", ":"), default=_serialize)
+                + "\n",
+            )
+            sys.stdout.flush()
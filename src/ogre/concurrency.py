@@ -0,0 +1,101 @@
+"""
+OGRe Concurrency Helpers
+
+:func:`fan_out` -- merge the output of several producers run on a thread pool
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_ITEM = "item"
+_ERROR = "error"
+_DONE = "done"
+
+_BUFFER = 100  # This many items may wait per worker before producers block.
+
+
+def fan_out(tasks, workers, limits=None):
+    """
+    Run producers concurrently and yield their items as they arrive.
+
+    :type tasks: list
+    :param tasks: Specify (name, producer) pairs.
+                  Each producer is a callable that returns an iterable.
+
+    :type workers: int
+    :param workers: Specify the maximum number of producers to run at once.
+
+    :type limits: dict
+    :param limits: Specify the maximum number of producers sharing a name
+                   that may run at once (keyed by name).
+                   Names that are not present are only bound by `workers`.
+
+    :raises: Any exception raised by a producer is relayed.
+
+    :rtype: generator
+    :returns: items from every producer in the order they are produced
+
+    .. note:: When the consumer stops early (or a producer fails),
+              the remaining producers are asked to stop at their next item,
+              and the pool is joined before control is returned.
+              Producers block once 100 items per worker are waiting,
+              so a slow consumer bounds the memory that is used.
+    """
+
+    tasks = list(tasks)
+    if not tasks:
+        return
+
+    semaphores = {
+        name: threading.BoundedSemaphore(max(1, int(limit)))
+        for name, limit in (limits or {}).items()
+    }
+    workers = max(1, min(int(workers), len(tasks)))
+    messages: queue.Queue = queue.Queue(maxsize=workers * _BUFFER)
+    cancelled = threading.Event()
+
+    def put(message):
+        """Wait for room to send a message (unless the consumer stops)."""
+        while not cancelled.is_set():
+            try:
+                messages.put(message, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(name, producer):
+        semaphore = semaphores.get(name)
+        try:
+            if semaphore is not None:
+                semaphore.acquire()
+            try:
+                if not cancelled.is_set():
+                    for item in producer():
+                        if not put((_ITEM, item)):
+                            break
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+        except Exception as exc:  # pylint: disable=broad-except
+            put((_ERROR, exc))
+        finally:
+            put((_DONE, None))
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for name, producer in tasks:
+            executor.submit(run, name, producer)
+        pending = len(tasks)
+        while pending:
+            kind, payload = messages.get()
+            if kind == _DONE:
+                pending -= 1
+            elif kind == _ERROR:
+                raise payload
+            else:
+                yield payload
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=True)
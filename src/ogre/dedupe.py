@@ -0,0 +1,235 @@
+"""
+OGRe De-duplication
+
+:class:`IDSet` -- compact, exact set of Snowflake IDs
+
+:class:`ScalableBloomFilter` -- probabilistic set of Snowflake IDs
+                                 with bounded memory
+"""
+
+import bisect
+import hashlib
+import heapq
+import math
+import threading
+from array import array
+
+
+class IDSet:
+
+    """
+    Remember Snowflake IDs exactly in a sorted array (8 bytes per ID).
+
+    IDs are collected in a small buffer that is merged into the array
+    once it is full, so adding is cheap and lookups are binary searches.
+    This suits bounded runs (e.g. a single fetch or a batch of shards).
+    An instance may be shared by many threads.
+
+    Pass an instance (or True for a new one) as the `dedupe` modifier
+    to skip results that were already seen.
+    """
+
+    def __init__(self, ids=(), buffer_size=4096):
+        """
+        Create a set.
+
+        :type ids: iterable
+        :param ids: Specify IDs that have already been seen.
+
+        :type buffer_size: int
+        :param buffer_size: Specify how many IDs to collect between merges.
+        """
+        self.buffer_size = buffer_size
+        self._sorted = array("q")
+        self._recent = set()
+        self._lock = threading.Lock()
+        for tweet_id in ids:
+            self.add(tweet_id)
+
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(heapq.merge(self._sorted, sorted(self._recent))))
+
+    def _has(self, tweet_id):
+        """Check for an ID (while the lock is held)."""
+        if tweet_id in self._recent:
+            return True
+        index = bisect.bisect_left(self._sorted, tweet_id)
+        return index < len(self._sorted) and self._sorted[index] == tweet_id
+
+    def __contains__(self, tweet_id):
+        with self._lock:
+            return self._has(tweet_id)
+
+    def add(self, tweet_id):
+        """
+        Remember an ID.
+
+        :rtype: bool
+        :returns: whether the ID was new
+        """
+        with self._lock:
+            if self._has(tweet_id):
+                return False
+            self._recent.add(tweet_id)
+            if len(self._recent) >= self.buffer_size:
+                self._sorted = array(
+                    "q",
+                    heapq.merge(self._sorted, sorted(self._recent)),
+                )
+                self._recent.clear()
+            return True
+
+    @property
+    def nbytes(self):
+        """Estimate the memory used by the IDs."""
+        return self._sorted.itemsize * len(self._sorted) + 64 * len(self._recent)
+
+
+class ScalableBloomFilter:
+
+    """
+    Remember Snowflake IDs approximately in a chain of Bloom filters.
+
+    Each filter holds `capacity` IDs (times `growth` for every filter before
+    it) at a tighter false-positive rate than the last,
+    so the overall rate stays below `error_rate` however many IDs are added.
+    A false positive makes a new result look like a duplicate,
+    but a duplicate is never mistaken for a new result.
+
+    When `max_filters` is specified, the oldest filter is discarded
+    once that many are full (and later filters stop growing),
+    so memory stays flat for long-running pollers
+    while only the oldest IDs are forgotten.
+    An instance may be shared by many threads.
+
+    Pass an instance as the `dedupe` modifier
+    to skip results that were (probably) already seen.
+    """
+
+    def __init__(
+        self,
+        capacity=100000,
+        error_rate=0.001,
+        max_filters=None,
+        growth=2,
+        tightening=0.5,
+    ):
+        """
+        Create an empty filter.
+
+        :type capacity: int
+        :param capacity: Specify how many IDs the first filter holds.
+
+        :type error_rate: float
+        :param error_rate: Specify the false-positive rate to stay below.
+
+        :type max_filters: int
+        :param max_filters: Specify how many filters to keep
+                            (defaults to keeping every filter).
+
+        :type growth: int
+        :param growth: Specify how much larger each filter is than the last.
+
+        :type tightening: float
+        :param tightening: Specify how much lower each filter's
+                           false-positive rate is than the last.
+
+        :raises: ValueError
+        """
+        if capacity < 1:
+            raise ValueError("The capacity must be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("The error rate must be between 0 and 1.")
+        if not 0 < tightening < 1:
+            raise ValueError("The tightening ratio must be between 0 and 1.")
+        if max_filters is not None and max_filters < 1:
+            raise ValueError("At least one filter must be kept.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_filters = max_filters
+        self.growth = growth
+        self.tightening = tightening
+        self.count = 0
+        self._filters = []  # These are [bits, size, hashes, capacity, count].
+        self._level = 0
+        self._lock = threading.Lock()
+        self._grow()
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Add an empty filter (and discard the oldest if there are too many)."""
+        capacity = self.capacity * self.growth**self._level
+        error = self.error_rate * (1 - self.tightening) * self.tightening**self._level
+        size = max(8, math.ceil(-capacity * math.log(error) / math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        self._filters.append([bytearray((size + 7) // 8), size, hashes, capacity, 0])
+        if self.max_filters is not None and len(self._filters) > self.max_filters:
+            del self._filters[0]
+        if self.max_filters is None or self._level < self.max_filters - 1:
+            self._level += 1
+
+    @staticmethod
+    def _hash(tweet_id):
+        """Derive two independent hashes of an ID."""
+        digest = hashlib.blake2b(
+            tweet_id.to_bytes(8, "little", signed=True),
+            digest_size=16,
+        ).digest()
+        return (
+            int.from_bytes(digest[:8], "little"),
+            int.from_bytes(digest[8:], "little") | 1,
+        )
+
+    @staticmethod
+    def _bits(hashed, size, hashes):
+        """Locate the bits of an ID in a filter (by double hashing)."""
+        first, second = hashed
+        return [(first + index * second) % size for index in range(hashes)]
+
+    def _has(self, hashed):
+        """Check every filter for an ID (while the lock is held)."""
+        for bits, size, hashes, _, _ in self._filters:
+            if all(
+                bits[bit >> 3] & (1 << (bit & 7))
+                for bit in self._bits(hashed, size, hashes)
+            ):
+                return True
+        return False
+
+    def __contains__(self, tweet_id):
+        hashed = self._hash(tweet_id)
+        with self._lock:
+            return self._has(hashed)
+
+    def add(self, tweet_id):
+        """
+        Remember an ID.
+
+        :rtype: bool
+        :returns: whether the ID was (certainly) new
+        """
+        hashed = self._hash(tweet_id)
+        with self._lock:
+            if self._has(hashed):
+                return False
+            current = self._filters[-1]
+            if current[4] >= current[3]:
+                self._grow()
+                current = self._filters[-1]
+            bits, size, hashes = current[:3]
+            for bit in self._bits(hashed, size, hashes):
+                bits[bit >> 3] |= 1 << (bit & 7)
+            current[4] += 1
+            self.count += 1
+            return True
+
+    @property
+    def nbytes(self):
+        """Measure the memory used by the filters' bits."""
+        return sum(len(bits) for bits, _, _, _, _ in self._filters)
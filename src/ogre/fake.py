@@ -0,0 +1,359 @@
+"""
+OGRe Fake Twitter
+
+:class:`FakeTwitter` -- local stand-in for the Twitter search API
+
+Run ``python -m ogre.fake`` to serve synthetic Tweets until interrupted.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from twython import Twython  # type: ignore
+
+from ogre import aio
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    """Answer requests on behalf of a :class:`FakeTwitter`."""
+
+    protocol_version = "HTTP/1.1"  # Connections are kept alive.
+
+    def setup(self):
+        super().setup()
+        self.server.fake.count("connections")
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        pass  # Requests are counted rather than logged.
+
+    def respond(self, status, body, content_type="application/json", headers=None):
+        """Send a complete response."""
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Route a request to an endpoint."""
+        fake = self.server.fake
+        parts = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if parts.path.startswith("/media/"):
+            fake.count("media")
+            fake.delay(fake.media_latency)
+            self.respond(200, fake.network(parts.path).read(), "image/jpeg")
+            return
+        if parts.path == "/1.1/application/rate_limit_status.json":
+            fake.count("rate_limit_status")
+            fake.delay(fake.latency)
+            self.respond(200, fake.limits())
+            return
+        if parts.path != "/1.1/search/tweets.json":
+            self.respond(404, {"errors": [{"code": 34, "message": "Not found."}]})
+            return
+
+        fake.count("search")
+        fake.delay(fake.latency)
+        if fake.fail():
+            fake.count("errors")
+            self.respond(
+                503,
+                {"errors": [{"code": 130, "message": "Over capacity"}]},
+            )
+            return
+        remaining, reset = fake.reserve()
+        headers = {
+            "x-rate-limit-limit": str(fake.limit),
+            "x-rate-limit-remaining": str(max(remaining, 0)),
+            "x-rate-limit-reset": str(reset),
+        }
+        if remaining < 0:
+            fake.count("limited")
+            self.respond(
+                429,
+                {"errors": [{"code": 88, "message": "Rate limit exceeded"}]},
+                headers=headers,
+            )
+            return
+        self.respond(
+            200,
+            fake.archive.search(
+                q=params.get("q"),
+                count=int(params.get("count", 15)),
+                since_id=int(params["since_id"]) if "since_id" in params else None,
+                max_id=int(params["max_id"]) if "max_id" in params else None,
+            ),
+            headers=headers,
+        )
+
+
+class FakeTwitter:
+
+    """
+    Serve synthetic Tweets over HTTP like the Twitter search API does.
+
+    The server implements ``/1.1/search/tweets.json``
+    (with `count`, `since_id`, and `max_id` pagination),
+    ``/1.1/application/rate_limit_status.json``,
+    and the photo URLs that its Tweets refer to,
+    so the real HTTP path (Twython sessions, media downloads, and paging)
+    can be load tested without a network.
+    It listens on the loopback interface (on an ephemeral port by default),
+    and it may be used as a context manager::
+
+     with FakeTwitter(latency=0.01, error_rate=0.05) as server:
+         features = twitter(
+             keys={"consumer_key": "fake", "access_token": "fake"},
+             keyword="test",
+             quantity=1000,
+             api=server.api,
+         )
+
+    :attr:`url` -- base URL of the server
+
+    :attr:`counts` -- number of connections, requests per endpoint
+                      ("search", "rate_limit_status", and "media"),
+                      injected "errors", and "limited" requests
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        tweets=None,
+        page_size=100,
+        latency=0.0,
+        media_latency=0.0,
+        error_rate=0.0,
+        limit=450,
+        window=900,
+        image_size=4096,
+        port=0,
+        seed=0,
+        clock=time.time,
+    ):
+        """
+        Bind a server (which does not answer until it is started).
+
+        :type tweets: list
+        :param tweets: Specify Tweets to serve
+                       (defaults to 1,000 from :func:`ogre.synthetic.statuses`).
+                       Photo URLs are rewritten to refer to this server.
+
+        :type page_size: int
+        :param page_size: Specify the most Tweets to return per page.
+
+        :type latency: float
+        :param latency: Specify how many seconds each API request takes.
+
+        :type media_latency: float
+        :param media_latency: Specify how many seconds each image takes.
+
+        :type error_rate: float
+        :param error_rate: Specify the fraction of searches that fail (503).
+
+        :type limit: int
+        :param limit: Specify how many searches each rate limit window allows.
+                      Searches beyond that fail (429) until the window resets.
+
+        :type window: int
+        :param window: Specify the length of a rate limit window (in seconds).
+
+        :type image_size: int
+        :param image_size: Specify the size of each image (in bytes).
+
+        :type port: int
+        :param port: Specify a port to listen on (defaults to any free port).
+
+        :type seed: int
+        :param seed: Specify a seed for generated Tweets and injected errors.
+
+        :type clock: callable
+        :param clock: Specify a source of POSIX timestamps
+                      (for dependency injection).
+        """
+        self.latency = latency
+        self.media_latency = media_latency
+        self.error_rate = error_rate
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.counts = {
+            "connections": 0,
+            "search": 0,
+            "rate_limit_status": 0,
+            "media": 0,
+            "errors": 0,
+            "limited": 0,
+        }
+        self.network = SyntheticNetwork(size=image_size)
+        self._random = random.Random(seed)  # nosec B311 (reproducible)
+        self._lock = threading.Lock()
+        self._remaining = limit
+        self._reset = int(clock()) + window
+        self._thread = None
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self.url = "http://127.0.0.1:" + str(self._server.server_address[1])
+
+        if tweets is None:
+            tweets = statuses(1000, seed=seed)
+        for tweet in tweets:
+            for entity in tweet.get("entities", {}).get("media", []):
+                entity["media_url"] = self.url + "/media/" + str(entity["id"]) + ".jpg"
+                entity["media_url_https"] = entity["media_url"]
+        self.archive = SyntheticAPI(tweets, page_size=page_size)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    def start(self):
+        """Answer requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+
+    def serve_forever(self):
+        """Answer requests in the calling thread until it is interrupted."""
+        self._server.serve_forever(poll_interval=0.05)
+
+    def stop(self):
+        """Stop answering requests and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def api(self, *args, **kwargs):
+        """
+        Construct a Twython client that queries this server.
+
+        This may be passed as the `api` modifier.
+        """
+        client = Twython(*args, **kwargs)
+        client.api_url = self.url + "/%s"
+        if client.access_token:
+            # OAuth 2 refuses plain HTTP, so the bearer token is sent as is.
+            client.client.auth = None
+            client.client.headers["Authorization"] = "Bearer " + client.access_token
+        return client
+
+    def async_api(self, *args, **kwargs):
+        """
+        Construct an :class:`ogre.aio.AsyncTwython` that queries this server.
+
+        This may be passed as the `api` modifier of asynchronous fetches.
+        """
+        return aio.AsyncTwython(*args, api_url=self.url + "/1.1", **kwargs)
+
+    def count(self, name):
+        """Count a connection, request, or failure."""
+        with self._lock:
+            self.counts[name] += 1
+
+    def delay(self, seconds):
+        """Simulate latency."""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def fail(self):
+        """Decide whether to inject an error."""
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _window(self):
+        """Start a new rate limit window if the last one ended."""
+        if self.clock() >= self._reset:
+            self._remaining = self.limit
+            self._reset = int(self.clock()) + self.window
+
+    def reserve(self):
+        """
+        Spend a search from the rate limit window.
+
+        :rtype: tuple
+        :returns: the searches remaining (negative once exceeded)
+                  and when the window resets
+        """
+        with self._lock:
+            self._window()
+            self._remaining -= 1
+            return self._remaining, self._reset
+
+    def limits(self):
+        """Report the rate limit (as Twitter does)."""
+        with self._lock:
+            self._window()
+            remaining, reset = max(self._remaining, 0), self._reset
+        return {
+            "resources": {
+                "search": {
+                    "/search/tweets": {
+                        "limit": self.limit,
+                        "remaining": remaining,
+                        "reset": reset,
+                    },
+                },
+            },
+        }
+
+
+def main(argv=None):
+    """Serve synthetic Tweets until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ogre.fake",
+        description="Serve synthetic Tweets like the Twitter search API.",
+    )
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--tweets", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--media-latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--limit", type=int, default=450)
+    parser.add_argument("--window", type=int, default=900)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    server = FakeTwitter(
+        tweets=statuses(args.tweets, seed=args.seed),
+        page_size=args.page_size,
+        latency=args.latency,
+        media_latency=args.media_latency,
+        error_rate=args.error_rate,
+        limit=args.limit,
+        window=args.window,
+        port=args.port,
+        seed=args.seed,
+    )
+    print("Serving Twitter at " + server.url + "/1.1 (press Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.counts))
+
+
+if __name__ == "__main__":
+    main()
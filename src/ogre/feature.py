@@ -0,0 +1,143 @@
+"""
+OGRe Features
+
+:class:`Feature` -- compact GeoJSON Point Feature
+"""
+
+from collections.abc import Mapping
+
+from snowflake2time import utcms2iso
+
+
+class Feature(Mapping):
+
+    """
+    Hold a geotagged result without building GeoJSON until it is needed.
+
+    A feature keeps only its raw values (in ``__slots__``),
+    so millions of them fit in a fraction of the memory that the
+    equivalent nested dicts would need.
+    The GeoJSON mapping is built (and kept) the first time it is accessed,
+    whether by indexing (e.g. ``feature["properties"]["text"]``),
+    by :meth:`to_dict`, or through :attr:`__geo_interface__`.
+    Features compare equal to the dicts they represent.
+
+    .. note:: The raw attributes are not updated if the mapping is modified,
+              and the mapping is not updated if attributes are modified
+              after it is built.
+
+    :attr:`id` -- identifier given by the source (e.g. a Snowflake ID)
+
+    :attr:`longitude` -- longitude of the feature
+
+    :attr:`latitude` -- latitude of the feature
+
+    :attr:`time` -- POSIX timestamp in milliseconds
+
+    :attr:`source` -- name of the source the feature came from
+
+    :attr:`text` -- text of the feature (or None)
+
+    :attr:`image` -- base64 encoded image of the feature
+                     (or its URL or path, depending on `image_mode`, or None)
+    """
+
+    __slots__ = (
+        "id",
+        "longitude",
+        "latitude",
+        "time",
+        "source",
+        "text",
+        "image",
+        "_mapping",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        feature_id,
+        longitude,
+        latitude,
+        time,
+        source,
+        text=None,
+        image=None,
+    ):
+        """
+        Create a feature.
+
+        :type time: int
+        :param time: Specify a POSIX timestamp in milliseconds.
+        """
+        self.id = feature_id  # pylint: disable=invalid-name
+        self.longitude = longitude
+        self.latitude = latitude
+        self.time = time
+        self.source = source
+        self.text = text
+        self.image = image
+        self._mapping = None
+
+    def __repr__(self):
+        return (
+            "Feature("
+            + repr(self.id)
+            + ", "
+            + repr(self.longitude)
+            + ", "
+            + repr(self.latitude)
+            + ", "
+            + repr(self.time)
+            + ", "
+            + repr(self.source)
+            + ")"
+        )
+
+    def to_dict(self, keep=True):
+        """
+        Build the GeoJSON mapping (once).
+
+        :type keep: bool
+        :param keep: Specify whether to keep the mapping for later accesses
+                     (defaults to True).
+                     Otherwise, a new mapping is built
+                     (unless one was already kept).
+
+        :rtype: dict
+        :returns: GeoJSON Feature
+        """
+        if self._mapping is not None:
+            return self._mapping
+        properties = {
+            "source": self.source,
+            "time": utcms2iso(self.time),
+        }
+        if self.text is not None:
+            properties["text"] = self.text
+        if self.image is not None:
+            properties["image"] = self.image
+        mapping = {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [self.longitude, self.latitude],
+            },
+            "properties": properties,
+        }
+        if keep:
+            self._mapping = mapping
+        return mapping
+
+    @property
+    def __geo_interface__(self):
+        """Describe the feature as GeoJSON."""
+        return self.to_dict()
+
+    def __getitem__(self, key):
+        return self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(("type", "geometry", "properties"))
+
+    def __len__(self):
+        return 3
@@ -0,0 +1,357 @@
+"""
+OGRe Geometry
+
+:data:`EARTH_RADIUS` -- mean radius of the Earth in each supported unit
+
+:func:`distances` -- great-circle distances from a point
+
+:func:`within` -- whether points are within a radius of a point
+
+:func:`is_area` -- whether a location is an area (rather than a circle)
+
+:func:`contains` -- whether points are inside a polygon
+
+:func:`tiles` -- square cells that cover a polygon
+
+:func:`quarter` -- quadrants of a cell that meet a polygon
+
+:func:`circumscribe` -- geocode circle that covers a cell
+
+:func:`cover` -- geocode circles that cover a polygon
+"""
+
+import functools
+import math
+import numbers
+
+EARTH_RADIUS = {"km": 6371.0088, "mi": 3958.7613}
+
+KM_PER_DEGREE = EARTH_RADIUS["km"] * math.pi / 180  # (of latitude)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy (or return None if it is not installed)."""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+def distances(latitudes, longitudes, latitude, longitude, unit="km"):
+    """
+    Compute the haversine distance from a point to each of many points.
+
+    The whole sequence is computed in one vectorized pass with NumPy
+    (if it is installed) or in pure Python otherwise.
+
+    :type latitudes: sequence
+    :param latitudes: Specify the latitude of each point (in degrees).
+
+    :type longitudes: sequence
+    :param longitudes: Specify the longitude of each point (in degrees).
+
+    :type latitude: float
+    :param latitude: Specify the latitude of the center (in degrees).
+
+    :type longitude: float
+    :param longitude: Specify the longitude of the center (in degrees).
+
+    :type unit: str
+    :param unit: Specify a unit of distance ("km" or "mi").
+
+    :rtype: list (or numpy.ndarray)
+    :returns: the great-circle distance to each point
+    """
+    radius = EARTH_RADIUS[unit]
+    phi = math.radians(latitude)
+    numpy = _numpy()
+    if numpy is not None:
+        phis = numpy.radians(numpy.asarray(latitudes, dtype=numpy.float64))
+        lambdas = numpy.radians(numpy.asarray(longitudes, dtype=numpy.float64))
+        half = (
+            numpy.sin((phis - phi) / 2) ** 2
+            + numpy.cos(phis)
+            * math.cos(phi)
+            * numpy.sin((lambdas - math.radians(longitude)) / 2) ** 2
+        )
+        return 2 * radius * numpy.arcsin(numpy.sqrt(numpy.minimum(half, 1.0)))
+    results = []
+    for point_latitude, point_longitude in zip(latitudes, longitudes):
+        point_phi = math.radians(point_latitude)
+        half = (
+            math.sin((point_phi - phi) / 2) ** 2
+            + math.cos(point_phi)
+            * math.cos(phi)
+            * math.sin(math.radians(point_longitude - longitude) / 2) ** 2
+        )
+        results.append(2 * radius * math.asin(math.sqrt(min(half, 1.0))))
+    return results
+
+
+def within(latitudes, longitudes, location):
+    """
+    Determine which points are within a radius of a point.
+
+    :type location: tuple
+    :param location: Specify a sanitized location (latitude, longitude,
+                     radius, unit) as :func:`ogre.validation.sanitize`
+                     produces.
+
+    :rtype: list
+    :returns: whether each point is within the radius (inclusive)
+    """
+    latitude, longitude, radius, unit = location
+    found = distances(latitudes, longitudes, latitude, longitude, unit)
+    if isinstance(found, list):
+        return [distance <= radius for distance in found]
+    return (found <= radius).tolist()
+
+
+def is_area(location):
+    """
+    Determine whether a location is an area rather than a circle.
+
+    Areas are bounding boxes (of 4 numbers) and GeoJSON Polygons
+    (as dicts or objects with a ``__geo_interface__``),
+    and anything else is considered a (possibly malformed) circle,
+    i.e. a (latitude, longitude, radius, unit) tuple.
+
+    :rtype: bool
+    """
+    if location is None:
+        return False
+    if isinstance(location, dict) or hasattr(location, "__geo_interface__"):
+        return True
+    return len(location) == 4 and all(
+        isinstance(bound, numbers.Real) for bound in location
+    )
+
+
+def bounds(polygon):
+    """
+    Find the bounding box of a polygon.
+
+    :type polygon: tuple
+    :param polygon: Specify rings of (longitude, latitude) positions
+                    as :func:`ogre.validation.sanitize` produces.
+
+    :rtype: tuple
+    :returns: west, south, east, and north bounds
+    """
+    longitudes = [longitude for ring in polygon for longitude, _ in ring]
+    latitudes = [latitude for ring in polygon for _, latitude in ring]
+    return min(longitudes), min(latitudes), max(longitudes), max(latitudes)
+
+
+def contains(polygon, latitudes, longitudes):
+    """
+    Determine which points are inside a polygon (by ray casting).
+
+    Every ring is tested with the even-odd rule, so holes are excluded.
+    The points are tested against each edge in one vectorized pass
+    with NumPy (if it is installed) or in pure Python otherwise.
+
+    :type polygon: tuple
+    :param polygon: Specify rings of (longitude, latitude) positions
+                    as :func:`ogre.validation.sanitize` produces.
+
+    :rtype: list
+    :returns: whether each point is inside the polygon
+    """
+    edges = [
+        (ring[index - 1], ring[index]) for ring in polygon for index in range(len(ring))
+    ]
+    numpy = _numpy()
+    if numpy is not None:
+        ys = numpy.asarray(latitudes, dtype=numpy.float64)
+        xs = numpy.asarray(longitudes, dtype=numpy.float64)
+        inside = numpy.zeros(len(ys), dtype=bool)
+        for (x1, y1), (x2, y2) in edges:
+            if y1 == y2:
+                continue  # Horizontal edges never cross a horizontal ray.
+            crosses = (y1 > ys) != (y2 > ys)
+            inside ^= crosses & (xs < (x2 - x1) * (ys - y1) / (y2 - y1) + x1)
+        return inside.tolist()
+    results = []
+    for y, x in zip(latitudes, longitudes):
+        inside = False
+        for (x1, y1), (x2, y2) in edges:
+            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                inside = not inside
+        results.append(inside)
+    return results
+
+
+def _crosses(first, second):
+    """Determine whether two line segments intersect."""
+
+    def turn(a, b, c):
+        cross = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+        return (cross > 0) - (cross < 0)
+
+    (a, b), (c, d) = first, second
+    return (
+        turn(a, b, c) != turn(a, b, d)
+        and turn(c, d, a) != turn(c, d, b)
+        or not turn(a, b, c)
+        and min(a[0], b[0]) <= c[0] <= max(a[0], b[0])
+        and min(a[1], b[1]) <= c[1] <= max(a[1], b[1])
+    )
+
+
+def _overlaps(cell, polygon):
+    """Determine whether a (west, south, east, north) cell meets a polygon."""
+    west, south, east, north = cell
+    if contains(polygon, [(south + north) / 2], [(west + east) / 2])[0]:
+        return True  # The polygon covers the middle of the cell.
+    for ring in polygon:
+        for longitude, latitude in ring:
+            if west <= longitude <= east and south <= latitude <= north:
+                return True  # The cell covers a corner of the polygon.
+    corners = [(west, south), (east, south), (east, north), (west, north)]
+    sides = list(zip(corners, corners[1:] + corners[:1]))
+    return any(
+        _crosses(side, (ring[index - 1], ring[index]))
+        for ring in polygon
+        for index in range(len(ring))
+        for side in sides
+    )
+
+
+def _grid(polygon, side):
+    """Lay square cells (of a side in km) over a polygon."""
+    west, south, east, north = bounds(polygon)
+    step = side / KM_PER_DEGREE
+    cells = []
+    for row in range(max(1, math.ceil((north - south) / step))):
+        bottom = south + row * step
+        top = min(bottom + step, 90.0)
+        # Cells are narrowest (in km) at the latitude nearest the equator.
+        nearest = 0.0 if bottom <= 0 <= top else min(abs(bottom), abs(top))
+        width = min(360.0, step / math.cos(math.radians(min(nearest, 89.0))))
+        for column in range(max(1, math.ceil((east - west) / width))):
+            left = west + column * width
+            cell = (left, bottom, min(left + width, 180.0), top)
+            if _overlaps(cell, polygon):
+                cells.append(cell)
+    return cells
+
+
+def tiles(polygon, radius=None, max_tiles=16):
+    """
+    Find square cells that cover a polygon.
+
+    The polygon's bounding box is divided into a grid of square cells,
+    and cells that do not meet the polygon are discarded.
+
+    :type polygon: tuple
+    :param polygon: Specify rings of (longitude, latitude) positions
+                    as :func:`ogre.validation.sanitize` produces.
+
+    :type radius: float
+    :param radius: Specify the radius (in km) of the circle around each cell
+                   (defaults to the smallest that needs at most `max_tiles`).
+
+    :type max_tiles: int
+    :param max_tiles: Specify the most cells to use
+                      (unless `radius` is specified).
+
+    :rtype: list
+    :returns: (west, south, east, north) cells
+    """
+    if radius is not None:
+        return _grid(polygon, radius * math.sqrt(2))
+    west, south, east, north = bounds(polygon)
+    width = (east - west) * math.cos(math.radians((south + north) / 2))
+    width *= KM_PER_DEGREE
+    height = (north - south) * KM_PER_DEGREE
+    # A row (or column) of cells must span the bounding box,
+    # even when it encloses (almost) no area.
+    side = max(
+        math.sqrt(width * height / max(1, max_tiles)),
+        max(width, height) / max(1, max_tiles),
+        0.001,
+    )
+    cells = _grid(polygon, side)
+    while len(cells) > max(1, max_tiles):
+        side *= 1.25
+        cells = _grid(polygon, side)
+    return cells
+
+
+def quarter(cell, polygon):
+    """
+    Split a cell into quadrants (and discard those that miss a polygon).
+
+    :type cell: tuple
+    :param cell: Specify a (west, south, east, north) cell.
+
+    :type polygon: tuple
+    :param polygon: Specify rings of (longitude, latitude) positions
+                    as :func:`ogre.validation.sanitize` produces.
+
+    :rtype: list
+    :returns: (west, south, east, north) cells
+    """
+    west, south, east, north = cell
+    longitude = (west + east) / 2
+    latitude = (south + north) / 2
+    quadrants = [
+        (west, south, longitude, latitude),
+        (longitude, south, east, latitude),
+        (west, latitude, longitude, north),
+        (longitude, latitude, east, north),
+    ]
+    return [quadrant for quadrant in quadrants if _overlaps(quadrant, polygon)]
+
+
+def circumscribe(cell):
+    """
+    Find the geocode circle around a cell.
+
+    :type cell: tuple
+    :param cell: Specify a (west, south, east, north) cell.
+
+    :rtype: tuple
+    :returns: a (latitude, longitude, radius, unit) circle
+    """
+    west, south, east, north = cell
+    latitude = (south + north) / 2
+    longitude = (west + east) / 2
+    reach = max(
+        distances(
+            [south, south, north, north],
+            [west, east, east, west],
+            latitude,
+            longitude,
+        )
+    )
+    # A margin covers the curvature of the cell's sides.
+    return latitude, longitude, math.ceil(reach * 1010) / 1000, "km"
+
+
+def cover(polygon, radius=None, max_tiles=16):
+    """
+    Find geocode circles that cover a polygon.
+
+    Each of the polygon's :func:`tiles` is covered by its circumscribed
+    circle.
+
+    :type polygon: tuple
+    :param polygon: Specify rings of (longitude, latitude) positions
+                    as :func:`ogre.validation.sanitize` produces.
+
+    :type radius: float
+    :param radius: Specify the radius of each circle (in km)
+                   (defaults to the smallest that needs at most `max_tiles`).
+
+    :type max_tiles: int
+    :param max_tiles: Specify the most circles to use
+                      (unless `radius` is specified).
+
+    :rtype: list
+    :returns: (latitude, longitude, radius, unit) circles
+    """
+    return [circumscribe(cell) for cell in tiles(polygon, radius, max_tiles)]
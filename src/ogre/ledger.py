@@ -0,0 +1,90 @@
+"""
+OGRe Rate Limit Ledger
+
+:class:`RateLimitLedger` -- locally tracked rate limit window
+"""
+
+import threading
+import time
+
+
+class RateLimitLedger:
+
+    """
+    Track a rate limit window locally so it need not be requested every time.
+
+    A ledger is synchronized with the limit reported by a source,
+    and then every query is reserved against it until the window resets.
+    Reservations are atomic, so callers that share a ledger
+    (e.g. concurrent fetches by one :class:`ogre.api.OGRe`)
+    cannot overspend the window together.
+
+    :attr:`remaining` -- number of queries left in the window (or None)
+
+    :attr:`reset` -- POSIX timestamp of the end of the window (or None)
+    """
+
+    def __init__(self, clock=time.time):
+        """
+        Create an unsynchronized ledger.
+
+        :type clock: callable
+        :param clock: Specify a source of POSIX timestamps
+                      (for dependency injection).
+        """
+        self.clock = clock
+        self.remaining = None
+        self.reset = None
+        self._lock = threading.Lock()
+
+    def stale(self):
+        """Determine whether the ledger must be synchronized with the source."""
+        with self._lock:
+            return (
+                self.remaining is None
+                or self.reset is None
+                or self.clock() >= self.reset
+            )
+
+    def sync(self, remaining, reset):
+        """Record the limit reported by the source."""
+        with self._lock:
+            self.remaining = int(remaining)
+            self.reset = int(reset)
+
+    def correct(self, remaining, reset):
+        """
+        Reconcile the ledger with a limit observed in a response.
+
+        A new window replaces the ledger,
+        but within a window the count is only ever lowered
+        (since reservations made by other callers may still be in flight).
+        """
+        with self._lock:
+            if self.remaining is None or self.reset != int(reset):
+                self.remaining = int(remaining)
+                self.reset = int(reset)
+            else:
+                self.remaining = min(self.remaining, int(remaining))
+
+    def invalidate(self):
+        """Require the next caller to synchronize with the source."""
+        with self._lock:
+            self.remaining = None
+
+    def reserve(self):
+        """
+        Reserve a query.
+
+        :rtype: bool
+        :returns: whether a query may be made
+        """
+        with self._lock:
+            if self.reset is not None and self.clock() >= self.reset:
+                self.remaining = None  # The window has reset.
+            if self.remaining is None:
+                return True  # An unsynchronized ledger does not constrain.
+            if self.remaining < 1:
+                return False
+            self.remaining -= 1
+            return True
@@ -0,0 +1,288 @@
+"""
+OGRe Metrics
+
+:class:`FetchMetrics` -- measurements of a single fetch
+
+:class:`Registry` -- process-wide counters and histograms
+
+:data:`REGISTRY` -- registry every fetch reports to by default
+"""
+
+import contextlib
+import math
+import threading
+import time
+
+PHASES = ("rate_limit", "search", "transform", "media")
+
+
+class FetchMetrics:
+
+    """
+    Measure where a fetch spends its time and quota.
+
+    Pass an instance as the `metrics` modifier
+    (e.g. ``twitter(..., metrics=FetchMetrics())``) to inspect it afterwards.
+    A single instance may be shared by several fetches (or sources),
+    in which case their measurements are summed.
+
+    :attr:`searches` -- number of search requests made
+
+    :attr:`tweets` -- number of results scanned
+
+    :attr:`geotagged` -- number of results that were geotagged
+
+    :attr:`duplicates` -- number of geotagged results skipped as duplicates
+
+    :attr:`features` -- number of features kept
+
+    :attr:`media_requests` -- number of images downloaded
+
+    :attr:`media_bytes` -- number of (undecoded) image bytes downloaded
+
+    :attr:`remaining` -- queries left in the rate limit window (if known)
+
+    :attr:`seconds` -- time spent in each phase
+                       ("rate_limit", "search", "transform", and "media")
+                       which may exceed the wall time when work is concurrent
+
+    :attr:`wall` -- time from the start to the end of the fetch
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        Create empty measurements.
+
+        :type clock: callable
+        :param clock: Specify a source of monotonic time
+                      (for dependency injection).
+        """
+        self.clock = clock
+        self.searches = 0
+        self.tweets = 0
+        self.geotagged = 0
+        self.duplicates = 0
+        self.features = 0
+        self.media_requests = 0
+        self.media_bytes = 0
+        self.remaining = None
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.wall = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name, amount=1):
+        """Increase a count."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    @contextlib.contextmanager
+    def time(self, phase):
+        """Measure the time spent in a phase."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self._lock:
+                self.seconds[phase] += elapsed
+
+    def merge(self, metrics):
+        """Add the measurements of another fetch to these."""
+        summary = metrics.as_dict()
+        with self._lock:
+            for name in (
+                "searches",
+                "tweets",
+                "geotagged",
+                "duplicates",
+                "features",
+                "media_requests",
+                "media_bytes",
+                "wall",
+            ):
+                setattr(self, name, getattr(self, name) + summary[name])
+            for phase, seconds in summary["seconds"].items():
+                self.seconds[phase] += seconds
+            if summary["remaining"] is not None:
+                self.remaining = summary["remaining"]
+
+    def as_dict(self):
+        """
+        Summarize the measurements.
+
+        :rtype: dict
+        :returns: every measurement by name
+        """
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "tweets": self.tweets,
+                "geotagged": self.geotagged,
+                "duplicates": self.duplicates,
+                "features": self.features,
+                "media_requests": self.media_requests,
+                "media_bytes": self.media_bytes,
+                "remaining": self.remaining,
+                "seconds": dict(self.seconds),
+                "wall": self.wall,
+            }
+
+
+def _labels(labels, extra=None):
+    """Format Prometheus labels."""
+    pairs = sorted(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(
+            name
+            + '="'
+            + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            + '"'
+            for name, value in pairs
+        )
+        + "}"
+    )
+
+
+def _number(value):
+    """Format a Prometheus sample value."""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Registry:
+
+    """
+    Accumulate counters, gauges, and histograms across fetches.
+
+    Every fetch reports its :class:`FetchMetrics` to :data:`REGISTRY`
+    unless another registry is passed as the `registry` modifier.
+    :meth:`render` exports everything in the Prometheus text format
+    (e.g. to serve from a ``/metrics`` endpoint).
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    FAMILIES = {
+        "ogre_fetches_total": ("counter", "Fetches completed."),
+        "ogre_searches_total": ("counter", "Search requests made."),
+        "ogre_tweets_scanned_total": ("counter", "Results scanned."),
+        "ogre_geotagged_total": ("counter", "Geotagged results scanned."),
+        "ogre_duplicates_total": ("counter", "Duplicate results skipped."),
+        "ogre_features_total": ("counter", "Features kept."),
+        "ogre_media_requests_total": ("counter", "Images downloaded."),
+        "ogre_media_bytes_total": ("counter", "Image bytes downloaded."),
+        "ogre_quota_remaining": ("gauge", "Queries left in the rate limit window."),
+        "ogre_phase_seconds": ("histogram", "Time spent in each phase of a fetch."),
+        "ogre_fetch_seconds": ("histogram", "Wall time of each fetch."),
+    }
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        """Increase a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Set a gauge."""
+        with self._lock:
+            self._samples[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        """Record an observation in a histogram."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._samples.get(key)
+            if histogram is None:
+                histogram = self._samples[key] = [[0] * len(self.BUCKETS), 0.0, 0]
+            for index, bound in enumerate(self.BUCKETS):
+                if value <= bound:
+                    histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def get(self, name, **labels):
+        """
+        Read a counter or gauge.
+
+        :returns: the current value (or None)
+        """
+        with self._lock:
+            return self._samples.get((name, tuple(sorted(labels.items()))))
+
+    def record(self, metrics, source):
+        """Report the measurements of a fetch."""
+        self.inc("ogre_fetches_total", source=source)
+        self.inc("ogre_searches_total", metrics.searches, source=source)
+        self.inc("ogre_tweets_scanned_total", metrics.tweets, source=source)
+        self.inc("ogre_geotagged_total", metrics.geotagged, source=source)
+        self.inc("ogre_duplicates_total", metrics.duplicates, source=source)
+        self.inc("ogre_features_total", metrics.features, source=source)
+        self.inc("ogre_media_requests_total", metrics.media_requests, source=source)
+        self.inc("ogre_media_bytes_total", metrics.media_bytes, source=source)
+        if metrics.remaining is not None:
+            self.set("ogre_quota_remaining", metrics.remaining, source=source)
+        for phase, seconds in metrics.seconds.items():
+            self.observe("ogre_phase_seconds", seconds, phase=phase, source=source)
+        self.observe("ogre_fetch_seconds", metrics.wall, source=source)
+
+    def clear(self):
+        """Forget every sample."""
+        with self._lock:
+            self._samples.clear()
+
+    def render(self):
+        """
+        Export every sample.
+
+        :rtype: str
+        :returns: Prometheus text exposition (version 0.0.4)
+        """
+        with self._lock:
+            samples = [
+                (
+                    key,
+                    [list(value[0])] + value[1:] if isinstance(value, list) else value,
+                )
+                for key, value in sorted(self._samples.items())
+            ]
+        lines = []
+        for name, (kind, description) in sorted(self.FAMILIES.items()):
+            family = [
+                (labels, value) for (key, labels), value in samples if key == name
+            ]
+            if not family:
+                continue
+            lines.append("# HELP " + name + " " + description)
+            lines.append("# TYPE " + name + " " + kind)
+            for labels, value in family:
+                if kind != "histogram":
+                    lines.append(name + _labels(labels) + " " + _number(value))
+                    continue
+                counts, total, count = value
+                for bound, cumulative in zip(
+                    self.BUCKETS + (math.inf,), counts + [count]
+                ):
+                    lines.append(
+                        name
+                        + "_bucket"
+                        + _labels(labels, ("le", _number(bound)))
+                        + " "
+                        + str(cumulative),
+                    )
+                lines.append(name + "_sum" + _labels(labels) + " " + _number(total))
+                lines.append(name + "_count" + _labels(labels) + " " + str(count))
+        return "".join(line + "\n" for line in lines)
+
+
+REGISTRY = Registry()
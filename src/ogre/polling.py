@@ -0,0 +1,123 @@
+"""
+OGRe Incremental Polling
+
+:class:`HighWaterMark` -- newest result of a standing query
+"""
+
+import json
+import threading
+
+from ogre.cache import atomic_write
+
+
+class HighWaterMark:
+
+    """
+    Remember the newest Tweet a standing query has seen.
+
+    Passing a mark as the `high_water_mark` modifier makes each call
+    fetch only Tweets newer than the mark (via `since_id`),
+    so polling a query usually costs a single search.
+    The mark is raised once a call has caught up with everything newer
+    than the previous mark, so results are never skipped.
+    When a call stops short of the mark (e.g. more than `quantity` Tweets
+    arrived since the last poll), a resume cursor is kept instead,
+    and later calls page back from it until the gap is closed.
+
+    :attr:`since_id` -- newest Snowflake ID seen (or None)
+
+    :attr:`max_id` -- oldest Snowflake ID left to search in a gap
+                      above the mark (or None if there is no gap)
+
+    :attr:`pending` -- newest Snowflake ID seen above the gap
+                       (i.e. the mark once the gap is closed, or None)
+    """
+
+    def __init__(self, path=None, since_id=None):
+        """
+        Create a mark (loading it from `path` if it was saved before).
+
+        :type path: str
+        :param path: Specify a file to persist the mark in
+                     (defaults to keeping it in memory only).
+
+        :type since_id: int
+        :param since_id: Specify an initial mark.
+        """
+        self.path = path
+        self.since_id = since_id
+        self.max_id = None
+        self.pending = None
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path, encoding="utf-8") as stream:
+                    saved = json.load(stream)
+            except FileNotFoundError:
+                return
+            self.since_id = saved["since_id"]
+            self.max_id = saved.get("max_id")
+            self.pending = saved.get("pending")
+
+    def _save(self):
+        """Persist the mark (while the lock is held)."""
+        if self.path is not None:
+            atomic_write(
+                self.path,
+                json.dumps(
+                    {
+                        "since_id": self.since_id,
+                        "max_id": self.max_id,
+                        "pending": self.pending,
+                    },
+                ).encode("utf-8"),
+            )
+
+    def advance(self, since_id):
+        """
+        Raise the mark after a call caught up (and persist it if it changed).
+
+        Any gap is closed, so the mark rises to the newest ID seen above it.
+
+        :rtype: bool
+        :returns: whether the mark changed
+        """
+        with self._lock:
+            newest = max(
+                (found for found in (since_id, self.pending) if found is not None),
+                default=None,
+            )
+            gap = self.max_id is not None
+            self.max_id = None
+            self.pending = None
+            if newest is None or (
+                self.since_id is not None and newest <= self.since_id
+            ):
+                if gap:
+                    self._save()
+                return gap
+            self.since_id = newest
+            self._save()
+            return True
+
+    def resume(self, newest, max_id):
+        """
+        Remember where a call stopped short of the mark (and persist it).
+
+        :type newest: int
+        :param newest: Specify the newest Snowflake ID the call saw.
+
+        :type max_id: int
+        :param max_id: Specify where the next call should resume paging.
+
+        :rtype: bool
+        :returns: whether the mark changed
+        """
+        with self._lock:
+            if max_id is None:
+                return False
+            self.max_id = max_id
+            if newest is not None and (self.pending is None or newest > self.pending):
+                self.pending = newest
+            self._save()
+            return True
@@ -0,0 +1,104 @@
+"""
+OGRe Client Pool
+
+:class:`ClientPool` -- thread-safe pool of reusable API clients
+"""
+
+import contextlib
+import threading
+
+
+def _close(client):
+    """Release the connections held by a client."""
+    close = getattr(client, "close", None)
+    if callable(close):
+        close()
+        return
+    session = getattr(client, "client", None)  # Twython keeps a Session here.
+    close = getattr(session, "close", None)
+    if callable(close):
+        close()
+
+
+class ClientPool:
+
+    """
+    Reuse authenticated API clients across requests.
+
+    Constructing a client (e.g. Twython) opens a new HTTP session,
+    so reusing clients lets keep-alive connections (and TLS sessions)
+    survive from one request to the next.
+    Clients are lent to one borrower at a time,
+    so a pool may be shared by many threads.
+
+    :meth:`client` -- borrow a client
+
+    :meth:`close` -- close every idle client and stop pooling
+    """
+
+    def __init__(self, max_idle=8):
+        """
+        Create an empty pool.
+
+        :type max_idle: int
+        :param max_idle: Specify how many idle clients to keep per key set.
+        """
+        self.max_idle = max_idle
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        """Count idle clients."""
+        with self._lock:
+            return sum(len(clients) for clients in self._idle.values())
+
+    @contextlib.contextmanager
+    def client(self, factory, *args, **kwargs):
+        """
+        Borrow a client.
+
+        :type factory: callable
+        :param factory: Specify how to construct a client (e.g. Twython).
+
+        Additional arguments (e.g. API keys) are passed to `factory`
+        and identify which clients are interchangeable.
+
+        :raises: RuntimeError
+
+        :rtype: context manager
+        :returns: a client that is returned to the pool on exit
+        """
+        key = (factory, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("The client pool is closed.")
+            idle = self._idle.get(key)
+            client = idle.pop() if idle else None
+        if client is None:
+            client = factory(*args, **kwargs)
+        try:
+            yield client
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                keep = not self.closed and len(idle) < self.max_idle
+                if keep:
+                    idle.append(client)
+            if not keep:
+                _close(client)
+
+    def close(self):
+        """Close every idle client and stop pooling."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, {}
+        for clients in idle.values():
+            for client in clients:
+                _close(client)
@@ -0,0 +1,198 @@
+"""
+OGRe Adaptive Harvesting
+
+:func:`harvest` -- fetch Tweets from an area, searching finely where they are
+
+:func:`iter_harvest` -- generator form of :func:`harvest`
+"""
+
+import contextlib
+
+from ogre import geo
+from ogre.concurrency import fan_out
+from ogre.dedupe import IDSet
+from ogre.metrics import FetchMetrics
+from ogre.Twitter import iter_twitter
+from ogre.validation import sanitize
+
+
+def harvest(
+    keys,
+    media=("image", "text"),
+    keyword="",
+    quantity=15,
+    location=None,
+    interval=None,
+    **kwargs,
+):
+    """
+    Fetch Tweets from an area, searching finely where they are dense.
+
+    .. seealso:: :meth:`iter_harvest` describes each parameter.
+                 This function simply collects the results it yields.
+
+    :raises: OGReError, OGReLimitError, TwythonError, ValueError
+
+    :rtype: list
+    :returns: GeoJSON Feature(s)
+    """
+    return list(
+        iter_harvest(
+            keys=keys,
+            media=media,
+            keyword=keyword,
+            quantity=quantity,
+            location=location,
+            interval=interval,
+            **kwargs,
+        ),
+    )
+
+
+def _saturated(metrics, tile_quantity, tile_queries):
+    """Determine whether the search of a tile left results behind."""
+    if metrics.features >= tile_quantity:
+        return True  # The tile filled its result cap.
+    return (
+        metrics.searches >= tile_queries
+        and metrics.tweets >= metrics.searches * min(tile_quantity, 100)
+    )  # Every page the tile was allowed came back full.
+
+
+def iter_harvest(
+    keys,
+    media=("image", "text"),
+    keyword="",
+    quantity=15,
+    location=None,
+    interval=None,
+    **kwargs,
+):
+    """
+    Yield Tweets from an area, searching finely where they are dense.
+
+    The area starts as a coarse tile (or `root_tiles` of them),
+    and each tile is searched once
+    (through :meth:`ogre.Twitter.iter_twitter`, with the geocode of the
+    circle around it) for up to `tile_quantity` results
+    spending up to `tile_queries` queries.
+    A tile that saturates (i.e. fills its result cap or comes back with
+    a full page for every query it was allowed) is split into quadrants,
+    and each quadrant that meets the area is searched in turn,
+    while a sparse tile is retired after its one search.
+    So queries are spent where the Tweets are,
+    rather than spread evenly over empty tiles
+    or stopped short by a single dense geocode.
+
+    Tiles are searched a level at a time (concurrently),
+    results outside of the area are dropped,
+    and results found by more than one tile are returned once.
+
+    .. seealso:: :meth:`ogre.Twitter.iter_twitter` describes the remaining
+                 parameters and modifiers (which are relayed to every tile).
+
+    :type quantity: int
+    :param quantity: Specify a quota of results to fetch (from every tile).
+
+    :type location: tuple
+    :param location: Specify an area to search, either as a bounding box
+                     (west, south, east, north) or as a GeoJSON Polygon.
+
+    :type root_tiles: int
+    :param root_tiles: Specify the most tiles to start from (defaults to 1).
+
+    :type tile_quantity: int
+    :param tile_quantity: Specify the result cap of each tile
+                          (defaults to 100, i.e. a full page).
+
+    :type tile_queries: int
+    :param tile_queries: Specify how many queries each tile may spend
+                         (defaults to 1).
+
+    :type max_depth: int
+    :param max_depth: Specify how many times a root tile may be split
+                      (defaults to 4).
+
+    :type tile_workers: int
+    :param tile_workers: Specify a number of threads to search the tiles of
+                         a level with (defaults to 4).
+
+    :type query_limit: int
+    :param query_limit: Specify how many queries to spend in all
+                        (defaults to 450).
+                        Tiles that cannot be afforded are not searched.
+
+    :type metrics: ogre.metrics.FetchMetrics
+    :param metrics: Specify where to add the measurements of every tile.
+
+    :raises: OGReError, OGReLimitError, TwythonError, ValueError
+
+    :rtype: generator
+    :returns: GeoJSON Feature(s)
+    """
+
+    if location is None or not geo.is_area(location):
+        raise ValueError("Specify an area (a bounding box or a Polygon).")
+    _, _, quantity, polygon, _ = sanitize(
+        media=media,
+        keyword=keyword,
+        quantity=quantity,
+        location=location,
+        interval=interval,
+    )
+    modifiers = dict(kwargs)
+    root_tiles = modifiers.pop("root_tiles", None) or 1
+    tile_quantity = modifiers.pop("tile_quantity", None) or 100
+    tile_queries = modifiers.pop("tile_queries", None) or 1
+    max_depth = modifiers.pop("max_depth", None)
+    max_depth = 4 if max_depth is None else max_depth
+    workers = modifiers.pop("tile_workers", None) or 4
+    budget = modifiers.pop("query_limit", None)
+    budget = 450 if budget is None else budget
+    metrics = modifiers.pop("metrics", None)
+    modifiers["area"] = polygon
+    if modifiers.get("dedupe") is None or isinstance(modifiers["dedupe"], bool):
+        modifiers["dedupe"] = IDSet()  # Tiles overlap, so they share an ID set.
+
+    level = [(cell, 0) for cell in geo.tiles(polygon, max_tiles=root_tiles)]
+    collected = 0
+    while level and collected < quantity and budget > 0:
+        allotted = min(tile_queries, budget)
+        level = level[: budget // allotted]  # Only affordable tiles are searched.
+        measured = [FetchMetrics() for _ in level]
+        tasks = [
+            (
+                "Twitter",
+                lambda cell=cell, measure=measure: iter_twitter(
+                    keys=keys,
+                    media=media,
+                    keyword=keyword,
+                    quantity=tile_quantity,
+                    location=geo.circumscribe(cell),
+                    interval=interval,
+                    query_limit=allotted,
+                    metrics=measure,
+                    **modifiers,
+                ),
+            )
+            for (cell, _), measure in zip(level, measured)
+        ]
+        try:
+            with contextlib.closing(fan_out(tasks, workers)) as features:
+                for feature in features:
+                    yield feature
+                    collected += 1
+                    if collected >= quantity:
+                        return
+        finally:
+            if metrics is not None:
+                for measure in measured:
+                    metrics.merge(measure)
+        children = []
+        for (cell, depth), measure in zip(level, measured):
+            budget -= measure.searches
+            if depth < max_depth and _saturated(measure, tile_quantity, allotted):
+                children.extend(
+                    (child, depth + 1) for child in geo.quarter(cell, polygon)
+                )
+        level = children
@@ -0,0 +1,169 @@
+"""
+OGRe Spill Buffers
+
+:class:`SpillBuffer` -- sequence of features that overflows to disk
+"""
+
+import os
+import pickle  # nosec B403 (only records written by this process are read)
+import tempfile
+import weakref
+
+from ogre.cache import _sizeof
+from ogre.feature import Feature
+
+
+def _release(stream, path):
+    """Close and remove an append log."""
+    stream.close()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SpillBuffer:
+
+    """
+    Collect features in memory until a threshold and on disk thereafter.
+
+    Once `max_features` features (or `max_bytes` of them) are held in memory,
+    every later feature is appended to a temporary log on disk instead,
+    so memory stays bounded however many results are collected.
+    Iterating over a buffer yields the features in the order they were
+    appended (from memory and then lazily from disk),
+    and it may be repeated.
+
+    The log is removed when :meth:`close` is called
+    (or the buffer is used as a context manager),
+    or failing that when the buffer is garbage collected::
+
+     with retriever.fetch(..., spill_features=10000)["features"] as features:
+         for feature in features:
+             ...
+
+    :attr:`memory_bytes` -- estimated size of the features held in memory
+
+    :attr:`spilled` -- number of features on disk
+
+    :attr:`path` -- location of the log (or None if nothing has spilled)
+    """
+
+    def __init__(self, max_features=None, max_bytes=None, directory=None):
+        """
+        Create an empty buffer.
+
+        :type max_features: int
+        :param max_features: Specify how many features to hold in memory
+                             (defaults to no limit).
+
+        :type max_bytes: int
+        :param max_bytes: Specify how many bytes of features to hold in memory
+                          (defaults to no limit).
+
+        :type directory: str
+        :param directory: Specify where to create the log
+                          (defaults to the temporary directory).
+        """
+        self.max_features = max_features
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.memory = []
+        self.memory_bytes = 0
+        self.spilled = 0
+        self.path = None
+        self.closed = False
+        self._log = None
+        self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        return len(self.memory) + self.spilled
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __repr__(self):
+        return (
+            "SpillBuffer(memory="
+            + str(len(self.memory))
+            + ", spilled="
+            + str(self.spilled)
+            + ")"
+        )
+
+    def _full(self, size):
+        """Decide whether another feature would exceed a threshold."""
+        if self.max_features is not None and len(self.memory) >= self.max_features:
+            return True
+        return self.max_bytes is not None and self.memory_bytes + size > self.max_bytes
+
+    def append(self, feature):
+        """
+        Add a feature (in memory or on disk).
+
+        :type feature: ogre.feature.Feature
+        :param feature: Specify a feature to add.
+
+        :raises: ValueError
+        """
+        if self.closed:
+            raise ValueError("The buffer is closed.")
+        size = _sizeof(feature) if self.max_bytes is not None else 0
+        if not self.spilled and not self._full(size):
+            self.memory.append(feature)
+            self.memory_bytes += size
+            return
+        if self._log is None:
+            descriptor, self.path = tempfile.mkstemp(
+                dir=self.directory,
+                prefix="ogre-spill-",
+                suffix=".log",
+            )
+            self._log = os.fdopen(descriptor, "wb")
+            self._finalizer = weakref.finalize(self, _release, self._log, self.path)
+        pickle.dump(
+            (
+                feature.id,
+                feature.longitude,
+                feature.latitude,
+                feature.time,
+                feature.source,
+                feature.text,
+                feature.image,
+            ),
+            self._log,
+            pickle.HIGHEST_PROTOCOL,
+        )
+        self.spilled += 1
+
+    def extend(self, features):
+        """Add every feature from an iterable."""
+        for feature in features:
+            self.append(feature)
+
+    def __iter__(self):
+        if self.closed:
+            raise ValueError("The buffer is closed.")
+        yield from self.memory
+        if not self.spilled:
+            return
+        count = self.spilled  # Features appended during iteration are skipped.
+        self._log.flush()
+        with open(self.path, "rb") as stream:
+            for _ in range(count):
+                yield Feature(*pickle.load(stream))  # nosec B301
+
+    def close(self):
+        """Remove the log and forget every feature."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self.memory = []
+        self.memory_bytes = 0
+        self.spilled = 0
+        self.closed = True
@@ -0,0 +1,273 @@
+"""
+OGRe Synthetic Data
+
+:func:`statuses` -- generate Tweets resembling Twitter search results
+
+:class:`SyntheticAPI` -- fake Twitter API that pages through synthetic Tweets
+
+:class:`SyntheticNetwork` -- fake network access point that serves images
+"""
+
+import bisect
+import io
+import random
+import threading
+import time
+
+from snowflake2time import utcms2snowflake
+
+from ogre.geo import within
+
+# Synthetic Tweets are posted before this moment (2014-03-17T23:05:26Z).
+NEWEST = 1395097526000
+
+
+def statuses(
+    quantity,
+    geotagged=0.9,
+    photos=0.3,
+    location=(36.99568187, -122.05851752),
+    seed=0,
+):
+    """
+    Generate Tweets resembling those in Twitter search results.
+
+    The same arguments always produce the same Tweets.
+    Each Tweet has the fields OGRe reads (and a user, like real Tweets),
+    and they are ordered newest first.
+
+    :type quantity: int
+    :param quantity: Specify how many Tweets to generate.
+
+    :type geotagged: float
+    :param geotagged: Specify the fraction of Tweets that have coordinates.
+
+    :type photos: float
+    :param photos: Specify the fraction of Tweets that refer to a photo.
+
+    :type location: tuple
+    :param location: Specify a place (latitude, longitude) to scatter
+                     coordinates around.
+
+    :type seed: int
+    :param seed: Specify a seed for the random number generator.
+
+    :rtype: list
+    :returns: Tweets
+    """
+    generator = random.Random(seed)  # nosec B311 (reproducible, not secret)
+    posted = NEWEST
+    tweets = []
+    for index in range(quantity):
+        posted -= generator.randint(1, 2000)
+        tweet_id = utcms2snowflake(posted) + generator.randint(0, (1 << 22) - 1)
+        tweet = {
+            "id": tweet_id,
+            "id_str": str(tweet_id),
+            "text": "Synthetic Tweet #" + str(index) + " http://t.co/" + str(index),
+            "coordinates": None,
+            "geo": None,
+            "entities": {
+                "hashtags": [],
+                "symbols": [],
+                "urls": [],
+                "user_mentions": [],
+            },
+            "lang": "en",
+            "retweet_count": 0,
+            "favorite_count": generator.randint(0, 10),
+            "user": {
+                "id": generator.randint(1, 1 << 31),
+                "screen_name": "user" + str(index),
+                "followers_count": generator.randint(0, 1000),
+                "geo_enabled": True,
+            },
+        }
+        if generator.random() < geotagged:
+            latitude = location[0] + generator.uniform(-0.01, 0.01)
+            longitude = location[1] + generator.uniform(-0.01, 0.01)
+            tweet["coordinates"] = {
+                "type": "Point",
+                "coordinates": [longitude, latitude],
+            }
+            tweet["geo"] = {"type": "Point", "coordinates": [latitude, longitude]}
+        if generator.random() < photos:
+            path = "pbs.twimg.com/media/" + str(tweet_id) + ".jpg"
+            tweet["entities"]["media"] = [
+                {
+                    "id": tweet_id,
+                    "type": "photo",
+                    "media_url": "http://" + path,
+                    "media_url_https": "https://" + path,
+                },
+            ]
+        tweets.append(tweet)
+    return tweets
+
+
+class SyntheticAPI:
+
+    """
+    Serve synthetic Tweets through the subset of Twython that OGRe uses.
+
+    An instance stands in for the Twython class in the `api` modifier
+    (i.e. calling it produces a client, and the client is itself),
+    so it may be passed to :meth:`ogre.Twitter.twitter` or
+    :meth:`ogre.api.OGRe.fetch`.
+    Search results honor `count`, `since_id`, and `max_id`
+    (and `geocode`, if the instance is `geocoded`)
+    and link to the next page (through ``search_metadata``) like Twitter does.
+
+    :attr:`calls` -- time (from :func:`time.perf_counter`) of each search
+    """
+
+    def __init__(
+        self,
+        tweets,
+        page_size=100,
+        remaining=450,
+        reset=None,
+        geocoded=False,
+    ):
+        """
+        Prepare to serve Tweets.
+
+        :type tweets: list
+        :param tweets: Specify Tweets to serve (e.g. from :func:`statuses`).
+
+        :type page_size: int
+        :param page_size: Specify the most Tweets to return per page.
+
+        :type remaining: int
+        :param remaining: Specify how many queries the rate limit allows.
+
+        :type reset: int
+        :param reset: Specify when the rate limit resets
+                      (defaults to 15 minutes from now).
+
+        :type geocoded: bool
+        :param geocoded: Specify whether to serve only the geotagged Tweets
+                         within the `geocode` of each search
+                         (defaults to ignoring it, as fuzzy matching may).
+        """
+        self.tweets = sorted(tweets, key=lambda tweet: tweet["id"], reverse=True)
+        self._keys = [-tweet["id"] for tweet in self.tweets]  # (ascending)
+        self.page_size = page_size
+        self.remaining = remaining
+        self.reset = int(time.time()) + 900 if reset is None else reset
+        self.geocoded = geocoded
+        self.calls = []
+
+    def __call__(self, *_, **__):
+        return self
+
+    def get_application_rate_limit_status(self, **_):
+        """Report the configured rate limit."""
+        return {
+            "resources": {
+                "search": {
+                    "/search/tweets": {
+                        "remaining": self.remaining,
+                        "reset": self.reset,
+                    },
+                },
+            },
+        }
+
+    def get_lastfunction_header(self, header, default_return_value=None):
+        """Report the configured rate limit (as response headers would)."""
+        return {
+            "x-rate-limit-remaining": str(self.remaining),
+            "x-rate-limit-reset": str(self.reset),
+        }.get(header, default_return_value)
+
+    def _near(self, geocode):
+        """Find the Tweets within a geocode ("latitude,longitude,radius")."""
+        latitude, longitude, radius = geocode.split(",")
+        tweets = [tweet for tweet in self.tweets if tweet.get("coordinates")]
+        coordinates = [tweet["coordinates"]["coordinates"] for tweet in tweets]
+        return [
+            tweet
+            for tweet, inside in zip(
+                tweets,
+                within(
+                    [point_latitude for _, point_latitude in coordinates],
+                    [point_longitude for point_longitude, _ in coordinates],
+                    (
+                        float(latitude),
+                        float(longitude),
+                        float(radius[:-2]),
+                        radius[-2:],
+                    ),
+                ),
+            )
+            if inside
+        ]
+
+    def search(
+        self,
+        q=None,
+        count=15,
+        since_id=None,
+        max_id=None,
+        geocode=None,
+        **_,
+    ):
+        """
+        Page through the Tweets newer than `since_id` and up to `max_id`.
+
+        :rtype: dict
+        :returns: Twitter search results
+        """
+        del q
+        self.calls.append(time.perf_counter())
+        tweets, keys = self.tweets, self._keys
+        if self.geocoded and geocode is not None:
+            tweets = self._near(geocode)
+            keys = [-tweet["id"] for tweet in tweets]
+        size = min(int(count), self.page_size)
+        start = 0 if max_id is None else bisect.bisect_left(keys, -max_id)
+        page = []
+        for tweet in tweets[start : start + size]:
+            if since_id is not None and tweet["id"] <= since_id:
+                break
+            page.append(tweet)
+        results = {
+            "statuses": page,
+            "search_metadata": {"count": size},
+        }
+        if len(page) == size and start + size < len(tweets):
+            if since_id is None or tweets[start + size]["id"] > since_id:
+                results["search_metadata"]["next_results"] = (
+                    "?max_id=" + str(page[-1]["id"] - 1) + "&count=" + str(size)
+                )
+        return results
+
+
+class SyntheticNetwork:
+
+    """
+    Serve synthetic images through the `network` modifier.
+
+    Every URL produces the same deterministic bytes.
+
+    :attr:`requests` -- number of images served
+    """
+
+    def __init__(self, size=4096):
+        """
+        Prepare to serve images.
+
+        :type size: int
+        :param size: Specify the size of each image (in bytes).
+        """
+        self.image = bytes(index % 256 for index in range(size))
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, **_):
+        """Serve an image (ignoring any `timeout`)."""
+        del url
+        with self._lock:
+            self.requests += 1
+        return io.BytesIO(self.image)
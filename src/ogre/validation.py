@@ -6,6 +6,23 @@ OGRe Parameter Validator
 :func:`sanitize` -- validate and cleanse OGRe parameters
 """
 
+from ogre.geo import is_area
+
+
+def _rings(location):
+    """Find the rings of a bounding box or GeoJSON Polygon (unvalidated)."""
+    location = getattr(location, "__geo_interface__", location)
+    if isinstance(location, dict):
+        if location.get("type") == "Feature":
+            location = location.get("geometry") or {}
+        if location.get("type") != "Polygon":
+            raise ValueError("Areas must be bounding boxes or GeoJSON Polygons.")
+        return location.get("coordinates") or []
+    west, south, east, north = (float(bound) for bound in location)
+    if west >= east or south >= north:
+        raise ValueError("Bounding boxes must be (west, south, east, north).")
+    return [[(west, south), (east, south), (east, north), (west, north)]]
+
 
 def validate(
     media=("image", "sound", "text", "video"),
@@ -30,6 +47,9 @@ def validate(
     :param location: Specify a location (latitude, longitude, radius, unit)
                      composed of 3 numbers and a string, respectively.
                      "km" and "mi" are supported units.
+                     An area may be specified instead as a bounding box
+                     (west, south, east, north) of 4 numbers
+                     or a GeoJSON Polygon (or a Feature with one).
 
     :type interval: tuple
     :param interval: Specify a period of time (earliest, latest)
@@ -54,7 +74,25 @@ def validate(
     if int(quantity) < 0:
         raise ValueError("Quantity must be positive.")
 
-    if location is not None:
+    if is_area(location):
+        rings = _rings(location)
+        if not rings:
+            raise ValueError("Polygons must have an exterior ring.")
+        for ring in rings:
+            positions = [(float(x), float(y)) for x, y in ring]
+            if len(set(positions)) < 3:
+                raise ValueError("Rings must have at least 3 distinct positions.")
+            if not sum(
+                x1 * y2 - x2 * y1
+                for (x1, y1), (x2, y2) in zip(positions, positions[1:] + positions[:1])
+            ):
+                raise ValueError("Rings must enclose an area.")
+            for longitude, latitude in ring:
+                if float(latitude) < -90 or float(latitude) > 90:
+                    raise ValueError("Latitude must be -90 to 90.")
+                if float(longitude) < -180 or float(longitude) > 180:
+                    raise ValueError("Longitude must be -180 to 180.")
+    elif location is not None:
         if len(location) != 4:
             raise ValueError("usage: where=(latitude, longitude, radius, unit)")
         latitude = float(location[0])
@@ -104,7 +142,9 @@ def sanitize(
 
     :type location: tuple
     :param location: Specify a location to make numeric
-                     (latitude, longitude, radius) and lowercase (unit).
+                     (latitude, longitude, radius) and lowercase (unit)
+                     or an area to convert to a polygon
+                     (rings of closed (longitude, latitude) tuples).
 
     :type interval: tuple
     :param interval: Specify earliest and latest moments to make numeric and
@@ -136,7 +176,15 @@ def sanitize(
     clean_quantity = int(quantity)
 
     clean_location = None
-    if location is not None:
+    if is_area(location):
+        clean_location = []
+        for ring in _rings(location):
+            ring = [(float(x), float(y)) for x, y in ring]
+            if ring[0] != ring[-1]:
+                ring.append(ring[0])
+            clean_location.append(tuple(ring))
+        clean_location = tuple(clean_location)
+    elif location is not None:
         latitude = float(location[0])
         longitude = float(location[1])
         radius = float(location[2])
@@ -12,6 +12,15 @@ import calendar
 import datetime
 import time
 
+# Twitter's epoch (in milliseconds) is the origin of every snowflake timestamp.
+TWEPOCH = 1288834974657
+UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _is_array(values):
+    # NumPy arrays (and anything like them) are converted without a loop.
+    return hasattr(values, "dtype")
+
 
 def str2utc(s):
     # parse twitter time string into UTC seconds, unix-style
@@ -20,11 +29,25 @@ def str2utc(s):
 
 
 def utc2snowflake(stamp):
-    return (int(round(stamp * 1000)) - 1288834974657) << 22
+    return (int(round(stamp * 1000)) - TWEPOCH) << 22
+
+
+def utc2snowflakes(stamps):
+    # batch form of utc2snowflake (e.g. for many interval bounds)
+    if _is_array(stamps):
+        import numpy
+
+        return (numpy.round(stamps * 1000).astype(numpy.int64) - TWEPOCH) << 22
+    return [utc2snowflake(stamp) for stamp in stamps]
+
+
+def utcms2snowflake(ms):
+    # integer-only inverse of snowflake2utcms (no float rounding)
+    return (ms - TWEPOCH) << 22
 
 
 def snowflake2utc(sf):
-    return ((sf >> 22) + 1288834974657) / 1000.0
+    return ((sf >> 22) + TWEPOCH) / 1000.0
 
 
 def str2utcms(s):
@@ -32,7 +55,43 @@ def str2utcms(s):
 
 
 def snowflake2utcms(sf):
-    return (sf >> 22) + 1288834974657
+    return (sf >> 22) + TWEPOCH
+
+
+def snowflakes2utcms(sfs):
+    # batch form of snowflake2utcms
+    #   NumPy int64 arrays produce int64 arrays, anything else produces a list
+    if _is_array(sfs):
+        return (sfs >> 22) + TWEPOCH
+    return [(sf >> 22) + TWEPOCH for sf in sfs]
+
+
+def utcms2iso(ms):
+    # ISO-8601 in UTC without float rounding, e.g. 2012-05-21T22:16:35.436000Z
+    #   (formatted like datetime.isoformat, so whole seconds have no fraction)
+    return (UNIX_EPOCH + datetime.timedelta(milliseconds=ms)).isoformat() + "Z"
+
+
+def utcms2isos(values):
+    # batch form of utcms2iso (which also accepts NumPy int64 arrays)
+    if _is_array(values):
+        import numpy
+
+        stamps = numpy.asarray(values, dtype=numpy.int64).astype("datetime64[ms]")
+        return numpy.char.add(
+            numpy.where(
+                values % 1000 == 0,
+                numpy.datetime_as_string(stamps, unit="s"),
+                numpy.datetime_as_string(stamps, unit="us"),
+            ),
+            "Z",
+        ).tolist()
+    return [utcms2iso(ms) for ms in values]
+
+
+def snowflakes2isos(sfs):
+    # convert snowflakes to ISO-8601 strings at once
+    return utcms2isos(snowflakes2utcms(sfs))
 
 
 # really is the best way to get utc timestamp?
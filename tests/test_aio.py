@@ -0,0 +1,244 @@
+"""Tests for ogre.aio"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ogre.aio import AsyncTwython, _read_response, request, urlopen
+from ogre.cache import ResultCache
+from ogre.exceptions import OGReError, OGReLimitError
+from ogre.ledger import RateLimitLedger
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import atwitter
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+with open("tests/data/Twitter-response-example.json") as tweets:
+    TWEETS = json.load(tweets)
+LIMITS = {
+    "resources": {
+        "search": {"/search/tweets": {"remaining": 2, "reset": 1234567890}},
+    },
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    """Answer requests with canned responses."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        """Keep test output quiet."""
+
+    def send(self, status, body, headers=()):
+        """Send a response with a Content-Length."""
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Route a request."""
+        path = self.path.split("?")[0]
+        if path == "/1.1/search/tweets.json":
+            assert self.headers["Authorization"] == "Bearer token"
+            self.send(200, json.dumps(TWEETS).encode("utf-8"))
+        elif path == "/1.1/application/rate_limit_status.json":
+            self.send(200, json.dumps(LIMITS).encode("utf-8"))
+        elif path == "/limited/search/tweets.json":
+            self.send(429, b"", [("x-rate-limit-reset", "1234567890")])
+        elif path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"test_", b"image"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif path == "/eof":
+            self.send_response(200)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(b"test_image")
+            self.close_connection = True
+        elif path.startswith("/media/"):
+            self.send(200, b"test_image")
+        else:
+            self.send(404, b"")
+
+
+@pytest.fixture(name="server")
+def fixture_server():
+    """Serve canned responses on the loopback interface."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=httpd.serve_forever,
+        kwargs={"poll_interval": 0.05},
+        daemon=True,
+    )
+    thread.start()
+    yield "http://127.0.0.1:" + str(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_request(server):
+    """Bodies are read by length, by chunk, and until EOF."""
+    for path in ("/media/0.jpg", "/chunked", "/eof"):
+        response = asyncio.run(request(server + path))
+        assert response.status == 200
+        assert response.read() == b"test_image"
+
+
+def test_request_scheme():
+    """Only HTTP(S) URLs are supported."""
+    with pytest.raises(ValueError):
+        asyncio.run(request("ftp://127.0.0.1/"))
+
+
+def test_urlopen(server):
+    """Error statuses raise exceptions."""
+    assert asyncio.run(urlopen(server + "/media/0.jpg")).read() == b"test_image"
+    with pytest.raises(OGReError):
+        asyncio.run(urlopen(server + "/missing"))
+
+
+def test_async_twython(server):
+    """Twitter endpoints are queried with a bearer token."""
+    api = AsyncTwython("key", access_token="token", api_url=server + "/1.1/")
+    assert asyncio.run(api.get_application_rate_limit_status()) == LIMITS
+    assert asyncio.run(api.search(q="test", geocode=None)) == TWEETS
+    with pytest.raises(OGReLimitError) as excinfo:
+        asyncio.run(
+            AsyncTwython(
+                "key", access_token="token", api_url=server + "/limited"
+            ).search(q="test"),
+        )
+    assert excinfo.value.reset == 1234567890
+
+
+def test_atwitter(server):
+    """Asynchronous retrieval over HTTP matches synchronous retrieval."""
+    keys = {"consumer_key": "key", "access_token": "token"}
+    features = asyncio.run(
+        atwitter(
+            keys=keys,
+            keyword="test",
+            quantity=2,
+            api=lambda key, access_token: AsyncTwython(
+                key,
+                access_token=access_token,
+                api_url=server + "/1.1",
+            ),
+            network=lambda url: urlopen(server + "/media/0.jpg"),
+        ),
+    )
+    assert len(features) == 2
+    assert "image" in features[0]["properties"]
+
+
+def test_read_response():
+    """Malformed responses are refused, and chunk trailers are discarded."""
+
+    async def read(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await _read_response(reader)
+
+    with pytest.raises(OGReError):
+        asyncio.run(read(b"garbage\r\n\r\n"))
+    response = asyncio.run(
+        read(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"5\r\nimage\r\n0\r\nX-Trailer: test\r\n\r\n",
+        ),
+    )
+    assert response.read() == b"image"
+
+
+def test_request_close(monkeypatch):
+    """Errors while closing a finished connection are ignored."""
+
+    class Writer:
+        """Accept a request and fail to close."""
+
+        def write(self, data):
+            """Discard the request."""
+
+        async def drain(self):
+            """Flush nothing."""
+
+        def close(self):
+            """Close nothing."""
+
+        async def wait_closed(self):
+            """Fail like a connection reset by the peer."""
+            raise OSError("reset")
+
+    async def open_connection(*_, **__):
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nimage")
+        reader.feed_eof()
+        return reader, Writer()
+
+    monkeypatch.setattr(asyncio, "open_connection", open_connection)
+    assert asyncio.run(request("http://127.0.0.1/")).read() == b"image"
+
+
+def test_async_twython_error(server):
+    """Error statuses other than rate limits raise OGReErrors."""
+    api = AsyncTwython("key", access_token="token", api_url=server + "/missing")
+    with pytest.raises(OGReError):
+        asyncio.run(api.search(q="test"))
+
+
+def test_atwitter_paths():
+    """Empty, cached, failed, too complex, and limited searches are handled."""
+    tweets = statuses(200, geotagged=1, photos=0)
+    assert not asyncio.run(
+        atwitter(keys=KEYS, keyword="test", quantity=0, api=SyntheticAPI([])),
+    )
+
+    cache = ResultCache()
+    api = SyntheticAPI(tweets)
+    for _ in range(2):
+        features = asyncio.run(
+            atwitter(keys=KEYS, keyword="test", quantity=10, api=api, cache=cache),
+        )
+        assert len(features) == 10
+    assert len(api.calls) == 1
+    assert cache.hits == 1
+
+    def fail(**_):
+        raise OGReError(source="Twitter", message="failure")
+
+    failing = SyntheticAPI(tweets)
+    failing.search = fail
+    with pytest.raises(OGReError):
+        asyncio.run(atwitter(keys=KEYS, keyword="test", api=failing))
+
+    complex_api = SyntheticAPI(tweets)
+    complex_api.search = lambda **_: {}
+    assert not asyncio.run(atwitter(keys=KEYS, keyword="test", api=complex_api))
+
+    # The first response reports that the rest of the window was spent.
+    limited = SyntheticAPI(tweets, remaining=0)
+    ledger = RateLimitLedger()
+    ledger.sync(2, limited.reset)
+    features = asyncio.run(
+        atwitter(
+            keys=KEYS,
+            keyword="test",
+            quantity=200,
+            api=limited,
+            ledger=ledger,
+        ),
+    )
+    assert len(features) == 100
+    assert len(limited.calls) == 1
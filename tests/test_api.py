@@ -10,8 +10,21 @@ OGRe Query Handler Tests
 :meth:`OGReTest.setUp` -- query handler test preparation
 
 :meth:`OGReTest.test_fetch` -- query handler tests
+
+:meth:`OGReTest.test_iter_fetch` -- streaming query handler tests
+
+:meth:`OGReTest.test_fan_out` -- concurrent query handler tests
+
+:meth:`OGReTest.test_afetch` -- asynchronous query handler tests
+
+:meth:`OGReTest.test_client_reuse` -- API client pooling tests
+
+:meth:`OGReTest.test_cache` -- result caching tests
+
+:meth:`OGReTest.test_columnar` -- columnar result tests
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -19,6 +32,8 @@ import unittest
 from io import StringIO
 from mock import MagicMock
 from ogre import OGRe
+from ogre.batch import FeatureBatch
+from ogre.cache import ResultCache
 from ogre.Twitter import twitter
 
 
@@ -86,6 +101,18 @@ class OGReTest(unittest.TestCase):
     :meth:`setUp` -- query handler test preparation (always runs first)
 
     :meth:`test_fetch` -- query handling and packaging tests
+
+    :meth:`test_iter_fetch` -- query streaming tests
+
+    :meth:`test_fan_out` -- concurrent query tests
+
+    :meth:`test_afetch` -- asynchronous query tests
+
+    :meth:`test_client_reuse` -- API client pooling tests
+
+    :meth:`test_cache` -- result caching tests
+
+    :meth:`test_columnar` -- columnar result tests
     """
 
     def setUp(self):
@@ -198,3 +225,238 @@ class OGReTest(unittest.TestCase):
                 network=self.network,
             ),
         )
+
+        self.api.reset_mock()
+        collection = self.retriever.fetch(
+            sources=("Twitter",),
+            media=("text",),
+            keyword="test",
+            quantity=2,
+            api=self.api,
+            network=self.network,
+        )
+        self.assertEqual(2, len(collection["features"]))
+        self.assertEqual(collection, json.loads(json.dumps(collection)))
+
+    def test_iter_fetch(self):
+        """
+        Test the streaming entry point to OGRe.
+
+        These tests should ensure that no source is queried until results
+        are requested and that the stream matches the packaged results.
+        """
+
+        self.log.debug("Testing the streaming entry point to OGRe...")
+
+        stream = self.retriever.iter_fetch(
+            sources=("Twitter",),
+            media=("image", "text"),
+            keyword="test",
+            quantity=2,
+            location=(0, 1, 2, "km"),
+            interval=(3, 4),
+            api=self.api,
+            network=self.network,
+        )
+        self.assertEqual(0, self.api.call_count)
+        first = next(stream)
+        self.assertEqual(1, self.api.call_count)
+        self.assertEqual("Feature", first["type"])
+        rest = list(stream)
+        self.api.reset_mock()
+        self.network.reset_mock()
+        self.assertEqual(
+            [first] + rest,
+            self.retriever.fetch(
+                sources=("Twitter",),
+                media=("image", "text"),
+                keyword="test",
+                quantity=2,
+                location=(0, 1, 2, "km"),
+                interval=(3, 4),
+                api=self.api,
+                network=self.network,
+            )["features"],
+        )
+        with self.assertRaises(ValueError):
+            list(self.retriever.iter_fetch(sources=("invalid",)))
+
+    def test_fan_out(self):
+        """
+        Test concurrent queries of multiple sources.
+
+        These tests should ensure that every source's results are merged
+        into the FeatureCollection regardless of the order they finish in.
+        """
+
+        self.log.debug("Testing concurrent queries...")
+
+        sequential = self.retriever.fetch(
+            sources=("Twitter", "Twitter", "Twitter"),
+            media=("image", "text"),
+            keyword="test",
+            quantity=2,
+            api=self.api,
+            network=self.network,
+        )
+        concurrent = self.retriever.fetch(
+            sources=("Twitter", "Twitter", "Twitter"),
+            media=("image", "text"),
+            keyword="test",
+            quantity=2,
+            api=self.api,
+            network=self.network,
+            fan_out=3,
+            fan_out_per_source=2,
+        )
+        self.assertEqual(6, len(concurrent["features"]))
+        self.assertEqual(
+            sorted(json.dumps(f, default=str) for f in sequential["features"]),
+            sorted(json.dumps(f, default=str) for f in concurrent["features"]),
+        )
+        with self.assertRaises(ValueError):
+            self.retriever.fetch(sources=("Twitter", "invalid"), fan_out=2)
+
+    def test_afetch(self):
+        """
+        Test the asynchronous entry point to OGRe.
+
+        These tests should ensure that asynchronous results are packaged
+        in the same way as synchronous results.
+        """
+
+        self.log.debug("Testing the asynchronous entry point to OGRe...")
+
+        self.assertEqual(
+            asyncio.run(self.retriever.afetch(sources=("Twitter",), quantity=0)),
+            {"type": "FeatureCollection", "features": []},
+        )
+        with self.assertRaises(ValueError):
+            asyncio.run(self.retriever.afetch(sources=("Twitter", "invalid")))
+        self.assertEqual(
+            asyncio.run(
+                self.retriever.afetch(
+                    sources=("Twitter", "Twitter"),
+                    media=("image", "text"),
+                    keyword="test",
+                    quantity=2,
+                    api=self.api,
+                    network=self.network,
+                ),
+            ),
+            self.retriever.fetch(
+                sources=("Twitter", "Twitter"),
+                media=("image", "text"),
+                keyword="test",
+                quantity=2,
+                api=self.api,
+                network=self.network,
+            ),
+        )
+
+    def test_client_reuse(self):
+        """
+        Test API client pooling.
+
+        These tests should ensure that API clients are constructed once
+        per retriever rather than once per fetch.
+        """
+
+        self.log.debug("Testing API client pooling...")
+
+        self.retriever.ledgers["twitter"].clock = lambda: 0
+        with self.retriever as retriever:
+            for _ in range(3):
+                retriever.fetch(
+                    sources=("Twitter",),
+                    keyword="test",
+                    quantity=2,
+                    api=self.api,
+                    network=self.network,
+                )
+            self.assertEqual(1, self.api.call_count)
+            self.assertEqual(1, len(retriever.clients))
+            self.assertEqual(
+                1,
+                self.api().get_application_rate_limit_status.call_count,
+            )
+        self.assertEqual(0, len(self.retriever.clients))
+        with self.assertRaises(RuntimeError):
+            self.retriever.fetch(
+                sources=("Twitter",),
+                keyword="test",
+                api=self.api,
+                network=self.network,
+            )
+
+    def test_cache(self):
+        """
+        Test result caching.
+
+        These tests should ensure that identical queries are answered
+        from the cache and that differing queries are not.
+        """
+
+        self.log.debug("Testing result caching...")
+
+        retriever = OGRe(keys=self.retriever.keychain, cache=ResultCache())
+        parameters = {
+            "sources": ("Twitter",),
+            "keyword": "test",
+            "quantity": 2,
+            "api": self.api,
+            "network": self.network,
+        }
+        first = retriever.fetch(**parameters)
+        self.assertEqual(first, retriever.fetch(**parameters))
+        self.assertEqual(first, retriever.fetch(media=("IMAGE", "text"), **parameters))
+        self.assertEqual(1, self.api().search.call_count)
+        self.assertEqual(1, self.network.call_count)
+        retriever.fetch(strict_media=True, **parameters)
+        self.assertEqual(2, self.api().search.call_count)
+        self.assertEqual((2, 2), (retriever.cache.hits, retriever.cache.misses))
+
+    def test_columnar(self):
+        """
+        Test columnar results.
+
+        These tests should ensure that a FeatureBatch holds the same
+        features a FeatureCollection would.
+        """
+
+        self.log.debug("Testing columnar results...")
+
+        parameters = {
+            "sources": ("Twitter",),
+            "keyword": "test",
+            "quantity": 2,
+            "api": self.api,
+            "network": self.network,
+        }
+        batch = self.retriever.fetch(columnar=True, **parameters)
+        self.assertIsInstance(batch, FeatureBatch)
+        self.assertEqual(
+            list(batch),
+            self.retriever.fetch(**parameters)["features"],
+        )
+        self.assertEqual(2, len(batch))
+        self.assertEqual(
+            0,
+            len(
+                self.retriever.fetch(
+                    ("Twitter",),
+                    quantity=0,
+                    columnar=True,
+                    api=self.api,
+                ),
+            ),
+        )
+
+        retriever = OGRe(keys=self.retriever.keychain, cache=ResultCache())
+        self.assertEqual(
+            list(retriever.fetch(columnar=True, fan_out=2, **parameters)),
+            list(retriever.fetch(columnar=True, **parameters)),
+        )
+        self.assertEqual((1, 1), (retriever.cache.hits, retriever.cache.misses))
+        retriever.fetch(**parameters)
+        self.assertEqual(2, retriever.cache.misses)
@@ -0,0 +1,173 @@
+"""Tests for ogre.batch"""
+
+import pytest
+from twython import TwythonError
+
+from ogre.batch import FeatureBatch
+from ogre.cache import ResultCache
+from ogre.ledger import RateLimitLedger
+from ogre.synthetic import NEWEST, SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import twitter, twitter_batch
+
+KEYS = {"consumer_key": "key", "access_token": "token"}
+
+
+def batch():
+    """Create a batch of two features."""
+    features = FeatureBatch()
+    features.append(2, -122.0, 37.0, 1000, "Twitter", text="two")
+    features.append(1, 1.5, -2.5, 0, "Twitter", image=b"aW1hZ2U=")
+    return features
+
+
+def test_geojson():
+    """Iterating over a batch yields GeoJSON."""
+    features = batch()
+    assert len(features) == 2
+    assert list(features) == [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [-122.0, 37.0]},
+            "properties": {
+                "source": "Twitter",
+                "time": "1970-01-01T00:00:01Z",
+                "text": "two",
+            },
+        },
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [1.5, -2.5]},
+            "properties": {
+                "source": "Twitter",
+                "time": "1970-01-01T00:00:00Z",
+                "image": b"aW1hZ2U=",
+            },
+        },
+    ]
+    assert features.__geo_interface__ == {
+        "type": "FeatureCollection",
+        "features": list(features),
+    }
+
+
+def test_extend():
+    """Batches may be combined."""
+    features = FeatureBatch()
+    features.extend(batch())
+    features.extend(batch())
+    assert list(features.ids) == [2, 1, 2, 1]
+    assert features.texts == ["two", None, "two", None]
+
+
+def test_numpy():
+    """Numeric columns are exported to NumPy without copying."""
+    numpy = pytest.importorskip("numpy")
+    features = batch()
+    columns = features.to_numpy()
+    assert columns["id"].dtype == numpy.int64
+    assert columns["longitude"].tolist() == [-122.0, 1.5]
+    assert columns["latitude"].tolist() == [37.0, -2.5]
+    assert columns["time"][0] == numpy.datetime64(1000, "ms")
+    assert columns["text"].tolist() == ["two", None]
+    features.latitudes[0] = 38.0
+    assert columns["latitude"][0] == 38.0
+    with pytest.raises(BufferError):
+        features.append(0, 0.0, 0.0, 0, "Twitter")
+
+
+def test_arrow():
+    """Columns are exported to an Arrow record batch."""
+    pyarrow = pytest.importorskip("pyarrow")
+    record = batch().to_arrow()
+    assert record.schema.names == list(FeatureBatch.columns)
+    assert record.column("id").to_pylist() == [2, 1]
+    assert record.column("longitude").to_pylist() == [-122.0, 1.5]
+    assert record.column("time").type == pyarrow.timestamp("ms", tz="UTC")
+    assert record.column("image").to_pylist() == [None, b"aW1hZ2U="]
+
+
+def test_pandas():
+    """Columns are exported to a DataFrame."""
+    pytest.importorskip("pandas")
+    frame = batch().to_pandas()
+    assert list(frame.columns) == list(FeatureBatch.columns)
+    assert frame["latitude"].tolist() == [37.0, -2.5]
+    assert frame["text"].isna().tolist() == [False, True]
+
+
+def test_twitter_batch():
+    """Tweets are fetched into the same features as lists hold."""
+    tweets = statuses(200, geotagged=1, photos=0.5)
+    parameters = {
+        "keys": KEYS,
+        "keyword": "test",
+        "quantity": 150,
+        "network": SyntheticNetwork(size=16),
+    }
+    expected = twitter(api=SyntheticAPI(tweets), **parameters)
+    assert list(twitter_batch(api=SyntheticAPI(tweets), **parameters)) == expected
+    features = twitter_batch(api=SyntheticAPI(tweets), media_workers=2, **parameters)
+    assert list(features) == expected
+    assert (
+        len(
+            twitter_batch(
+                api=SyntheticAPI(tweets), keys=KEYS, keyword="test", quantity=0
+            )
+        )
+        == 0
+    )
+
+    # Photos are required, so Tweets without them are skipped.
+    features = twitter_batch(
+        api=SyntheticAPI(statuses(10, geotagged=1, photos=0)),
+        keys=KEYS,
+        media=("image",),
+        keyword="test",
+        strict_media=True,
+    )
+    assert len(features) == 0
+
+    cache = ResultCache()
+    api = SyntheticAPI(tweets)
+    features = twitter_batch(api=api, cache=cache, **parameters)
+    assert list(twitter_batch(api=api, cache=cache, **parameters)) == list(features)
+    assert len(api.calls) == 2
+
+
+def test_twitter_batch_shards():
+    """Sharded batches find the same results as sequential batches."""
+    tweets = statuses(200, geotagged=1, photos=0)
+    parameters = {
+        "keys": KEYS,
+        "media": ("text",),
+        "keyword": "test",
+        "quantity": 150,
+        "interval": (NEWEST // 1000 - 1000, NEWEST // 1000),
+    }
+    sequential = twitter_batch(api=SyntheticAPI(tweets), **parameters)
+    sharded = twitter_batch(api=SyntheticAPI(tweets), shards=4, **parameters)
+    assert len(sharded) == 150
+    assert list(sharded) == list(sequential)
+
+
+def test_twitter_batch_limits():
+    """Batches stop at the rate limit and relay failures."""
+    tweets = statuses(200, geotagged=1, photos=0)
+    parameters = {"keys": KEYS, "media": ("text",), "keyword": "test"}
+    api = SyntheticAPI(tweets, remaining=0)
+    ledger = RateLimitLedger()
+    ledger.sync(2, api.reset)
+    features = twitter_batch(api=api, ledger=ledger, quantity=200, **parameters)
+    assert len(features) == 100
+    assert len(api.calls) == 1
+
+    api = SyntheticAPI(tweets)
+    api.search = lambda **_: {}  # The query is too complex.
+    assert len(twitter_batch(api=api, **parameters)) == 0
+
+    def fail(**_):
+        raise TwythonError("Twitter is unavailable.")
+
+    api.search = fail
+    with pytest.raises(TwythonError):
+        twitter_batch(api=api, **parameters)
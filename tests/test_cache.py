@@ -0,0 +1,257 @@
+"""Tests for ogre.cache"""
+
+import base64
+import json
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from mock import MagicMock
+
+from ogre.batch import FeatureBatch
+from ogre.cache import MediaCache, ResultCache, atomic_write, spool
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import twitter
+
+
+def network():
+    """Create a fake network that echoes the requested URL."""
+    fake = MagicMock()
+    fake.side_effect = lambda url, **_: StringIO("image:" + url)
+    return fake
+
+
+def test_hit(tmp_path):
+    """Repeated URLs are served from disk."""
+    fake = network()
+    cache = MediaCache(tmp_path, network=fake)
+    assert cache("a").read() == b"image:a"
+    assert cache("a").read() == b"image:a"
+    assert fake.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_shared(tmp_path):
+    """Separate instances (e.g. processes) share a directory."""
+    MediaCache(tmp_path, network=network())("a")
+    fake = network()
+    assert MediaCache(tmp_path, network=fake)("a").read() == b"image:a"
+    assert fake.call_count == 0
+
+
+def test_content_addressing(tmp_path):
+    """Identical content from different URLs is stored once."""
+    fake = MagicMock()
+    fake.side_effect = lambda url, **_: StringIO("same")
+    cache = MediaCache(tmp_path, network=fake)
+    cache("a")
+    cache("b")
+    assert len(os.listdir(tmp_path / "objects")) == 1
+    assert len(os.listdir(tmp_path / "urls")) == 2
+
+
+def test_corruption(tmp_path):
+    """Corrupt objects are treated as misses."""
+    fake = network()
+    cache = MediaCache(tmp_path, network=fake)
+    cache("a")
+    for name in os.listdir(tmp_path / "objects"):
+        (tmp_path / "objects" / name).write_bytes(b"corrupt")
+    assert cache("a").read() == b"image:a"
+    assert fake.call_count == 2
+
+
+def test_eviction(tmp_path):
+    """The least recently used objects are evicted first."""
+    cache = MediaCache(tmp_path, max_bytes=10, network=network())
+    cache("a")
+    for name in os.listdir(tmp_path / "objects"):
+        os.utime(tmp_path / "objects" / name, (0, 0))
+    cache("b")
+    assert cache.get("a") is None
+    assert cache.get("b") == b"image:b"
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_reference_eviction(tmp_path):
+    """References to evicted objects are removed with them."""
+    cache = MediaCache(tmp_path, max_bytes=1000, network=network())
+    for index in range(500):
+        cache("url" + str(index))
+    objects = os.listdir(tmp_path / "objects")
+    assert 0 < len(objects) < 500
+    assert len(os.listdir(tmp_path / "urls")) == len(objects)
+    assert cache.get("url499") == b"image:url499"
+    assert cache.get("url0") is None
+
+
+def test_races(tmp_path, monkeypatch):
+    """Files removed by other processes (or never written) are tolerated."""
+    cache = MediaCache(tmp_path, max_bytes=10, network=network())
+    cache("a")
+    (tmp_path / "objects" / ".tmp-partial").write_bytes(b"partial")
+    (tmp_path / "urls" / ".tmp-partial").write_bytes(b"partial")
+    os.symlink(tmp_path / "missing", tmp_path / "objects" / "dangling")
+    assert MediaCache(tmp_path, network=network()).get("a") == b"image:a"
+
+    def evicted(*_, **__):
+        raise FileNotFoundError("evicted")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(os, "utime", evicted)
+        assert cache.get("a") == b"image:a"
+    with monkeypatch.context() as patched:
+        patched.setattr(os, "remove", evicted)
+        cache("b")  # The object for "a" disappears before it is evicted.
+        cache.clear()
+    assert len(os.listdir(tmp_path / "objects")) == 4  # Nothing was removed.
+
+
+def test_failed_writes(tmp_path, monkeypatch):
+    """Temporary files are removed when a write fails."""
+
+    def replace(source, _):
+        os.remove(source)
+        raise OSError("failure")
+
+    monkeypatch.setattr(os, "replace", replace)
+    with pytest.raises(OSError):
+        atomic_write(str(tmp_path / "a"), b"a")
+    with pytest.raises(OSError):
+        spool(BytesIO(b"a"), tmp_path)
+    assert not os.listdir(tmp_path)
+
+
+def test_relay(tmp_path):
+    """Keyword arguments are relayed to the network on a miss."""
+    fake = network()
+    MediaCache(tmp_path, network=fake)("a", timeout=5)
+    fake.assert_called_once_with("a", timeout=5)
+
+
+def test_twitter(tmp_path):
+    """The cache stands in for the network modifier."""
+    api = MagicMock()
+    api().get_application_rate_limit_status.return_value = {
+        "resources": {
+            "search": {"/search/tweets": {"remaining": 2, "reset": 1234567890}},
+        },
+    }
+    with open("tests/data/Twitter-response-example.json") as tweets:
+        api().search.return_value = json.load(tweets)
+    fake = network()
+    cache = MediaCache(tmp_path, network=fake)
+    for _ in range(2):
+        features = twitter(
+            keys={"consumer_key": "key", "access_token": "token"},
+            keyword="test",
+            quantity=2,
+            api=api,
+            network=cache,
+        )
+    assert fake.call_count == 1
+    assert features[0]["properties"]["image"] == base64.b64encode(
+        ("image:" + fake.call_args[0][0]).encode("utf-8"),
+    )
+
+
+class Clock:  # pylint: disable=too-few-public-methods
+
+    """Provide a controllable monotonic time."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_result_incomplete():
+    """Searches cut short are not cached."""
+    cache = ResultCache()
+    api = SyntheticAPI(statuses(300, geotagged=1, photos=0), remaining=1)
+    parameters = {
+        "keys": {"consumer_key": "key", "access_token": "token"},
+        "media": ("text",),
+        "keyword": "test",
+        "quantity": 300,
+        "api": api,
+        "cache": cache,
+    }
+    assert len(twitter(**parameters)) == 100
+    full = SyntheticAPI(statuses(300, geotagged=1, photos=0))
+    assert len(twitter(query_limit=2, **dict(parameters, api=full))) == 200
+    complex_api = SyntheticAPI([])
+    complex_api.search = lambda **_: {}
+    assert not twitter(**dict(parameters, api=complex_api))
+    assert not cache
+    api.remaining = 450
+    assert len(twitter(**parameters)) == 300
+    assert len(twitter(**parameters)) == 300
+    assert len(twitter(**dict(parameters, quantity=1000))) == 300
+    assert len(twitter(**dict(parameters, quantity=1000))) == 300
+    assert cache.hits == 2
+    assert len(cache) == 2
+
+
+def test_result_ttl():
+    """Results expire after their time to live."""
+    clock = Clock()
+    cache = ResultCache(ttl=10, clock=clock)
+    assert cache.get("key") is None
+    cache.put("key", [{"type": "Feature"}])
+    assert cache.get("key") == [{"type": "Feature"}]
+    clock.now = 10
+    assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert not cache
+
+
+def test_result_copies():
+    """Cached results are isolated from callers."""
+    cache = ResultCache()
+    results = [{"properties": {}}]
+    cache.put("key", results)
+    results[0]["properties"]["text"] = "changed"
+    cache.get("key")[0]["properties"]["text"] = "changed"
+    assert cache.get("key") == [{"properties": {}}]
+
+
+def test_result_lru():
+    """The least recently used entries are evicted first."""
+    cache = ResultCache(max_entries=2)
+    cache.put("a", [])
+    cache.put("b", [])
+    cache.put("a", [])  # Replacing an entry refreshes it.
+    cache.get("a")
+    cache.put("c", [])
+    assert cache.get("b") is None
+    assert cache.get("a") == []
+    assert len(cache) == 2
+
+
+def test_result_bytes():
+    """Entries are evicted to respect the memory limit."""
+    cache = ResultCache(max_bytes=1000)
+    cache.put("huge", ["x" * 1000])
+    assert cache.get("huge") is None
+    cache.put("a", ["x" * 400])
+    cache.put("b", ["x" * 400])
+    assert cache.get("a") is None
+    assert cache.size <= 1000
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_result_batches():
+    """Columnar results are measured by their columns."""
+    features = FeatureBatch()
+    for feature_id in range(10000):
+        features.append(feature_id, 0.0, 0.0, 0, "Twitter", text="x" * 10)
+    cache = ResultCache(max_bytes=100000)
+    cache.put("batch", features)
+    assert cache.get("batch") is None
+    cache = ResultCache()
+    cache.put("batch", features)
+    assert cache.size > 10000 * (4 * 8 + 10)
@@ -1,5 +1,6 @@
 """Tests for ogre.cli"""
 
+import json
 import random
 
 import pytest
@@ -67,3 +68,63 @@ def test_invalid_log(source):
     with pytest.raises(AttributeError) as excinfo:
         ogre.cli.main(["-s", source, "--log", "invalid"])
     assert excinfo.value != 0
+
+
+@pytest.fixture(name="features")
+def fixture_features(monkeypatch):
+    """Replace retrieval with a stream of canned features."""
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [0.0, float(index)]},
+            "properties": {"source": "Twitter", "image": b"dGVzdA=="},
+        }
+        for index in range(3)
+    ]
+
+    def iter_fetch(self, **_):
+        del self
+        yield from features
+
+    monkeypatch.setattr(ogre.OGRe, "iter_fetch", iter_fetch)
+    return features
+
+
+def expected(feature):
+    """Serialize a canned feature as it should be written."""
+    return json.dumps(
+        dict(feature, properties={"source": "Twitter", "image": "dGVzdA=="}),
+        separators=(",", ":"),
+    )
+
+
+def test_json(source, features, capsys):
+    """A FeatureCollection is written by default."""
+    ogre.cli.main(["-s", source, "--keys", '{"Twitter": {}}'])
+    collection = json.loads(capsys.readouterr().out)
+    assert collection["type"] == "FeatureCollection"
+    assert len(collection["features"]) == len(features)
+
+
+def test_ndjson(source, features, capsys):
+    """A Feature is written per line."""
+    ogre.cli.main(["-s", source, "--keys", '{"Twitter": {}}', "-f", "ndjson"])
+    assert capsys.readouterr().out.splitlines() == [
+        expected(feature) for feature in features
+    ]
+
+
+def test_geojsonseq(source, features, capsys):
+    """Each Feature is preceded by a record separator."""
+    ogre.cli.main(["-s", source, "--keys", '{"Twitter": {}}', "-f", "geojsonseq"])
+    assert capsys.readouterr().out == "".join(
+        "\x1e" + expected(feature) + "\n" for feature in features
+    )
+
+
+def test_serialize():
+    """Image bytes are written as strings, and other objects are refused."""
+    # pylint: disable=protected-access
+    assert ogre.cli._serialize(b"aW1hZ2U=") == "aW1hZ2U="
+    with pytest.raises(TypeError):
+        ogre.cli._serialize(object())
@@ -0,0 +1,81 @@
+"""Tests for ogre.concurrency"""
+
+import threading
+import time
+
+import pytest
+
+from ogre.concurrency import fan_out
+
+
+def test_empty():
+    """No producers yield nothing."""
+    assert not list(fan_out([], workers=4))
+
+
+def test_merge():
+    """Every item from every producer is yielded once."""
+    tasks = [(name, lambda n=name: range(n * 10, n * 10 + 5)) for name in range(4)]
+    assert sorted(fan_out(tasks, workers=4)) == sorted(
+        item for name in range(4) for item in range(name * 10, name * 10 + 5)
+    )
+
+
+def test_concurrency():
+    """Producers run at the same time when enough workers are allowed."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def producer():
+        barrier.wait()
+        yield threading.get_ident()
+
+    assert len(set(fan_out([(i, producer) for i in range(3)], workers=3))) == 3
+
+
+def test_limits():
+    """Producers sharing a name respect their concurrency cap."""
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def producer():
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        yield None
+        with lock:
+            running[0] -= 1
+
+    tasks = [("twitter", producer) for _ in range(8)]
+    assert len(list(fan_out(tasks, workers=8, limits={"twitter": 1}))) == 8
+    assert running[1] == 1
+
+
+def test_error():
+    """Exceptions raised by a producer are relayed to the consumer."""
+
+    def producer():
+        raise KeyError("failure")
+        yield  # pylint: disable=unreachable
+
+    with pytest.raises(KeyError):
+        list(fan_out([("a", producer), ("b", lambda: range(3))], workers=2))
+
+
+def test_backpressure():
+    """Producers wait for a slow consumer (and stop when it does)."""
+    produced = [0]
+
+    def producer():
+        while True:
+            produced[0] += 1
+            yield produced[0]
+
+    features = fan_out([("a", producer)], workers=1)
+    assert next(features) == 1
+    deadline = time.monotonic() + 5
+    while produced[0] < 101 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert produced[0] <= 102  # One item is consumed and 100 are waiting.
+    features.close()
+    assert produced[0] <= 102
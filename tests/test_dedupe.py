@@ -0,0 +1,210 @@
+"""Tests for ogre.dedupe"""
+
+import asyncio
+import random
+import threading
+
+import pytest
+
+from ogre import OGRe
+from ogre.cache import ResultCache
+from ogre.dedupe import IDSet, ScalableBloomFilter
+from ogre.metrics import FetchMetrics, Registry
+from ogre.synthetic import NEWEST, SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import twitter, twitter_batch
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def test_id_set():
+    """IDs are remembered exactly across merges."""
+    ids = random.Random(0).sample(range(2**62), 1000)
+    seen = IDSet(ids[:500], buffer_size=64)
+    assert len(seen) == 500
+    assert all(tweet_id in seen for tweet_id in ids[:500])
+    assert not any(tweet_id in seen for tweet_id in ids[500:])
+    added = [seen.add(tweet_id) for tweet_id in ids[495:505]]
+    assert added == [False] * 5 + [True] * 5
+    assert list(seen) == sorted(ids[:505])
+    assert seen.nbytes < 64 * 505
+
+
+def test_id_set_threads():
+    """IDs may be added by many threads."""
+    seen = IDSet(buffer_size=16)
+    added = []
+
+    def add():
+        added.append(sum(seen.add(tweet_id) for tweet_id in range(1000)))
+
+    threads = [threading.Thread(target=add) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(added) == len(seen) == 1000
+
+
+def test_bloom_filter():
+    """IDs are never forgotten, and few are mistaken for others."""
+    ids = random.Random(0).sample(range(2**62), 20000)
+    seen = ScalableBloomFilter(capacity=1000, error_rate=0.01)
+    for tweet_id in ids[:10000]:
+        seen.add(tweet_id)
+    assert len(seen) <= 10000
+    assert all(tweet_id in seen for tweet_id in ids[:10000])
+    mistakes = sum(tweet_id in seen for tweet_id in ids[10000:])
+    assert mistakes < 0.01 * 10000
+    assert not seen.add(ids[0])
+
+
+def test_bloom_filter_rotation():
+    """Memory stays flat when old filters are discarded."""
+    seen = ScalableBloomFilter(capacity=100, error_rate=0.01, max_filters=2)
+    for tweet_id in range(1000):
+        seen.add(tweet_id)
+    flat = seen.nbytes
+    for tweet_id in range(1000, 10000):
+        seen.add(tweet_id)
+    assert seen.nbytes == flat
+    assert 9999 in seen
+    assert sum(tweet_id in seen for tweet_id in range(1000)) < 100
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"capacity": 0},
+        {"error_rate": 1},
+        {"tightening": 0},
+        {"max_filters": 0},
+    ],
+)
+def test_bloom_filter_invalid(arguments):
+    """Nonsensical filters are refused."""
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(**arguments)
+
+
+def test_twitter():
+    """Seen Tweets are skipped before their images are downloaded."""
+    tweets = statuses(50, geotagged=1, photos=1)
+    network = SyntheticNetwork(size=10)
+    metrics = FetchMetrics()
+    seen = IDSet(tweet["id"] for tweet in tweets[:20])
+    features = twitter(
+        keys=KEYS,
+        keyword="test",
+        quantity=50,
+        api=SyntheticAPI(tweets + tweets[25:30]),
+        network=network,
+        dedupe=seen,
+        metrics=metrics,
+        registry=Registry(),
+        compact=True,
+    )
+    assert sorted(feature.id for feature in features) == sorted(
+        tweet["id"] for tweet in tweets[20:]
+    )
+    assert network.requests == 30
+    assert metrics.duplicates == 25
+    assert len(seen) == 50
+
+
+def test_kept():
+    """Only the IDs of kept results are remembered."""
+    tweets = statuses(200, geotagged=1, photos=0)
+    parameters = {
+        "keys": KEYS,
+        "media": ("text",),
+        "keyword": "test",
+        "quantity": 20,
+        "interval": (NEWEST // 1000 - 1000, NEWEST // 1000),
+        "shards": 4,
+        "registry": Registry(),
+        "compact": True,
+    }
+    seen = IDSet()
+    found = []
+    for _ in range(2):
+        features = twitter(api=SyntheticAPI(tweets), dedupe=seen, **parameters)
+        assert len(features) == 20
+        found.extend(feature.id for feature in features)
+    # Results beyond the quantity of a sharded search were not remembered.
+    assert sorted(found, reverse=True) == [tweet["id"] for tweet in tweets[:40]]
+    assert sorted(seen) == sorted(found)
+
+    seen = IDSet()
+    features = twitter(
+        keys=KEYS,
+        media=("image",),
+        keyword="test",
+        api=SyntheticAPI(tweets),
+        strict_media=True,
+        dedupe=seen,
+        registry=Registry(),
+    )
+    assert not features
+    assert not seen  # Results without content were not remembered.
+    features = twitter(
+        keys=KEYS,
+        keyword="test",
+        quantity=50,
+        api=SyntheticAPI(tweets[:25] + tweets[:25]),
+        dedupe=True,
+        registry=Registry(),
+    )
+    assert len(features) == 25
+
+
+class Racing(IDSet):
+
+    """Remember each ID as soon as it is looked up (as a concurrent search may)."""
+
+    def __contains__(self, tweet_id):
+        found = super().__contains__(tweet_id)
+        self.add(tweet_id)
+        return found
+
+
+@pytest.mark.parametrize("fetch", [twitter, twitter_batch])
+def test_race(fetch):
+    """Results kept by a concurrent search first are skipped."""
+    metrics = FetchMetrics()
+    features = fetch(
+        keys=KEYS,
+        keyword="test",
+        api=SyntheticAPI(statuses(10, geotagged=1, photos=0)),
+        dedupe=Racing(),
+        metrics=metrics,
+        registry=Registry(),
+    )
+    assert len(features) == 0
+    assert metrics.duplicates == 10
+
+
+def test_fetch():
+    """Sources listed more than once produce each Tweet once."""
+    tweets = statuses(30, geotagged=1, photos=0)
+    cache = ResultCache()
+    with OGRe({"Twitter": KEYS}, cache=cache) as retriever:
+        for dedupe, expected in ((None, 60), (False, 60), (True, 30)):
+            collection = retriever.fetch(
+                ("Twitter", "Twitter"),
+                keyword="test",
+                quantity=30,
+                api=SyntheticAPI(tweets),
+                dedupe=dedupe,
+            )
+            assert len(collection["features"]) == expected
+        collection = asyncio.run(
+            retriever.afetch(
+                ("Twitter", "Twitter"),
+                keyword="test",
+                quantity=30,
+                api=SyntheticAPI(tweets),
+                dedupe=True,
+            ),
+        )
+        assert len(collection["features"]) == 30
+    assert cache.hits == 3  # De-duplicated fetches bypass the cache.
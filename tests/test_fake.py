@@ -0,0 +1,113 @@
+"""Tests for ogre.fake"""
+
+import asyncio
+import json
+import runpy
+import socketserver
+import sys
+import time
+import warnings
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from twython import TwythonError, TwythonRateLimitError  # type: ignore
+
+from ogre import OGRe
+from ogre.fake import FakeTwitter, main
+from ogre.synthetic import statuses
+from ogre.Twitter import atwitter, twitter
+
+KEYS = {"consumer_key": "fake", "access_token": "fake"}
+
+
+def test_paging():
+    """Results are paged through over HTTP (images included)."""
+    with FakeTwitter(tweets=statuses(150, photos=0.5), page_size=40) as server:
+        features = twitter(keys=KEYS, keyword="test", quantity=1000, api=server.api)
+        assert len(features) == len(
+            [tweet for tweet in server.archive.tweets if tweet["coordinates"]],
+        )
+        assert server.counts["search"] == 4
+        assert server.counts["rate_limit_status"] == 1
+        assert server.counts["media"] == sum(
+            "image" in feature["properties"] for feature in features
+        )
+
+
+def test_async():
+    """Asynchronous clients query the server too."""
+    with FakeTwitter(tweets=statuses(50, geotagged=1, photos=0)) as server:
+        features = asyncio.run(
+            atwitter(keys=KEYS, keyword="test", quantity=20, api=server.async_api),
+        )
+        assert len(features) == 20
+        assert server.counts["search"] == 1
+
+
+def test_pooling():
+    """Pooled clients keep their connection alive across fetches."""
+    with FakeTwitter(tweets=statuses(50, geotagged=1, photos=0)) as server:
+        with OGRe({"Twitter": KEYS}) as retriever:
+            for _ in range(3):
+                retriever.fetch(
+                    ("Twitter",),
+                    keyword="test",
+                    quantity=10,
+                    api=server.api,
+                )
+        assert server.counts["search"] == 3
+        assert server.counts["connections"] == 1
+
+
+def test_rate_limit():
+    """Searches beyond the window's limit are refused until it resets."""
+    clock = [0]
+    with FakeTwitter(limit=1, window=60, clock=lambda: clock[0]) as server:
+        client = server.api("fake", access_token="fake")
+        client.search(q="test")
+        with pytest.raises(TwythonRateLimitError):
+            client.search(q="test")
+        assert client.get_application_rate_limit_status()["resources"]["search"][
+            "/search/tweets"
+        ] == {"limit": 1, "remaining": 0, "reset": 60}
+        clock[0] = 60
+        client.search(q="test")
+        assert client.get_lastfunction_header("x-rate-limit-reset") == "120"
+        assert server.counts["limited"] == 1
+
+
+def test_errors():
+    """Errors are injected at the configured rate."""
+    with FakeTwitter(error_rate=1) as server:
+        with pytest.raises(TwythonError):
+            twitter(keys=KEYS, keyword="test", api=server.api)
+        assert server.counts["errors"] == 1
+        with pytest.raises(HTTPError):
+            urlopen(server.url + "/1.1/missing.json")  # nosec B310
+
+
+def test_latency():
+    """Requests take as long as the configured latency."""
+    with FakeTwitter(statuses(10), latency=0.05) as server:
+        started = time.perf_counter()
+        assert len(twitter(keys=KEYS, keyword="test", api=server.api)) > 0
+        assert time.perf_counter() - started >= 0.05
+
+
+def test_main(monkeypatch, capsys):
+    """The server runs from the command line until interrupted."""
+
+    def interrupt(*_, **__):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(socketserver.BaseServer, "serve_forever", interrupt)
+    main(["--port", "0", "--tweets", "10"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("Serving Twitter at http://127.0.0.1:")
+    assert json.loads(lines[1])["search"] == 0
+    monkeypatch.setattr(sys, "argv", ["ogre.fake", "--port", "0", "--tweets", "1"])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # ogre.fake is imported.
+        runpy.run_module("ogre.fake", run_name="__main__")
+    assert capsys.readouterr().out.startswith("Serving Twitter at")
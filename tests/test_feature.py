@@ -0,0 +1,93 @@
+"""Tests for ogre.feature"""
+
+import copy
+import json
+import pickle
+import tracemalloc
+
+from ogre.feature import Feature
+
+GEOJSON = {
+    "type": "Feature",
+    "geometry": {"type": "Point", "coordinates": [-122.0, 37.0]},
+    "properties": {
+        "source": "Twitter",
+        "time": "1970-01-01T00:00:01.500000Z",
+        "text": "text",
+    },
+}
+
+
+def feature():
+    """Create a feature with text."""
+    return Feature(1, -122.0, 37.0, 1500, "Twitter", text="text")
+
+
+def test_mapping():
+    """Features are indexed like the dicts they represent."""
+    compact = feature()
+    assert compact == GEOJSON
+    assert GEOJSON == compact
+    assert compact != dict(GEOJSON, type="Other")
+    assert compact["properties"]["text"] == "text"
+    assert dict(compact) == GEOJSON
+    assert compact.__geo_interface__ == GEOJSON
+    assert len(compact) == 3
+    assert json.loads(json.dumps(compact, default=Feature.to_dict)) == GEOJSON
+
+
+def test_laziness():
+    """The mapping is built on first access and then kept."""
+    compact = feature()
+    compact.image = b"aW1hZ2U="
+    assert compact._mapping is None  # pylint: disable=protected-access
+    compact["properties"]["text"] = "changed"
+    assert compact.to_dict()["properties"] == {
+        "source": "Twitter",
+        "time": "1970-01-01T00:00:01.500000Z",
+        "text": "changed",
+        "image": b"aW1hZ2U=",
+    }
+    compact = feature()
+    assert compact.to_dict(keep=False) == GEOJSON
+    assert compact._mapping is None  # pylint: disable=protected-access
+
+
+def test_copies():
+    """Features survive copying and pickling."""
+    compact = feature()
+    assert copy.deepcopy(compact) == compact
+    assert pickle.loads(pickle.dumps(compact)) == compact
+    assert repr(compact) == "Feature(1, -122.0, 37.0, 1500, 'Twitter')"
+
+
+def measure(factory, count=1000):
+    """Measure the memory retained by many objects."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory(index) for index in range(count)]
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def test_memory():
+    """Features are smaller than the equivalent dicts."""
+    compact = measure(
+        lambda index: Feature(index, -122.0, 37.0, index, "Twitter", "text"),
+    )
+    nested = measure(
+        lambda index: {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [-122.0, 37.0]},
+            "properties": {
+                "source": "Twitter",
+                "time": "1970-01-01T00:00:01.500000Z",
+                "text": "text",
+            },
+        },
+    )
+    assert compact < nested / 2
@@ -0,0 +1,122 @@
+"""Tests for OGRe.fetch_many and OGRe.iter_fetch_many"""
+
+import pytest
+from mock import patch
+
+from ogre import OGRe
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import twitter_quota
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def queries(*priorities):
+    """Create a query for 200 results (i.e. 2 searches) per priority."""
+    return [
+        {
+            "sources": ("Twitter",),
+            "keyword": "query" + str(index),
+            "quantity": 200,
+            "priority": priority,
+        }
+        for index, priority in enumerate(priorities)
+    ]
+
+
+def test_priority():
+    """High-priority queries are planned first when quota runs short."""
+    api = SyntheticAPI(statuses(500, geotagged=1, photos=0), remaining=6)
+    with patch.object(
+        api,
+        "get_application_rate_limit_status",
+        wraps=api.get_application_rate_limit_status,
+    ) as limits, OGRe({"Twitter": KEYS}) as retriever:
+        results = retriever.fetch_many(queries(0, 5, 1, 5, 0), api=api, workers=2)
+        assert limits.call_count == 1
+    assert results[0] is None
+    assert results[4] is None
+    for index in (1, 2, 3):
+        assert results[index]["type"] == "FeatureCollection"
+        assert len(results[index]["features"]) == 200
+    assert len(api.calls) == 6
+    assert retriever.ledgers["twitter"].remaining == 0
+
+
+def test_partial():
+    """The query that exhausts the quota is allotted what remains."""
+    api = SyntheticAPI(statuses(500, geotagged=1, photos=0), remaining=3)
+    with OGRe({"Twitter": KEYS}) as retriever:
+        results = list(
+            retriever.iter_fetch_many(
+                queries(0, 0, 0),
+                priority=lambda query: query["keyword"],
+                api=api,
+            ),
+        )
+    assert results[0] == (0, None)  # Deferred queries are reported first.
+    assert sorted(
+        (index, len(collection["features"])) for index, collection in results[1:]
+    ) == [(1, 100), (2, 200)]
+
+
+def test_leftover():
+    """Quota left after planning lets queries page past dropped results."""
+    tweets = statuses(1000, geotagged=0.2, photos=0)
+    query = {"sources": ("Twitter",), "keyword": "a", "quantity": 100}
+    with OGRe({"Twitter": KEYS}) as retriever:
+        expected = retriever.fetch(api=SyntheticAPI(tweets), **query)
+    with OGRe({"Twitter": KEYS}) as retriever:
+        assert retriever.fetch_many([query], api=SyntheticAPI(tweets)) == [expected]
+    assert len(expected["features"]) == 100
+
+    # The leftover goes to the queries of the highest priority first.
+    api = SyntheticAPI(tweets, remaining=4)
+    with OGRe({"Twitter": KEYS}) as retriever:
+        low, high = retriever.fetch_many(
+            [dict(query, priority=0), dict(query, priority=1)],
+            api=api,
+            workers=1,
+        )
+    assert len(api.calls) == 4
+    assert len(high["features"]) > len(low["features"]) > 0
+
+
+def test_unknown_quota():
+    """Queries are not deferred when the quota cannot be checked."""
+    api = SyntheticAPI(statuses(100, geotagged=1, photos=0))
+    with patch.object(
+        api,
+        "get_application_rate_limit_status",
+        side_effect=[{}, api.get_application_rate_limit_status()],
+    ), OGRe({"Twitter": KEYS}) as retriever:
+        results = retriever.fetch_many(
+            queries(0, 0) + [{"sources": ("Twitter",), "keyword": "a", "quantity": 0}],
+            api=api,
+            dedupe=True,
+            workers=1,
+        )
+    assert [len(result["features"]) for result in results] == [100, 0, 0]
+    with patch.object(api, "get_application_rate_limit_status", return_value={}):
+        with pytest.raises(KeyError):
+            twitter_quota(KEYS, api=api, fail_hard=True)
+
+
+def test_invalid():
+    """Invalid sources are refused."""
+    with OGRe({"Twitter": KEYS}) as retriever:
+        with pytest.raises(ValueError):
+            retriever.fetch_many(
+                [{"sources": ("Twitter",), "keyword": "a"}, {"sources": ("Nope",)}],
+                api=SyntheticAPI([]),
+            )
+
+
+def test_twitter_quota():
+    """A current ledger is trusted, and a stale one is synchronized."""
+    api = SyntheticAPI([], remaining=7)
+    with OGRe({"Twitter": KEYS}) as retriever:
+        ledger = retriever.ledgers["twitter"]
+        assert twitter_quota(KEYS, api=api, ledger=ledger) == 7
+        api.remaining = 3
+        assert twitter_quota(KEYS, api=api, ledger=ledger) == 7
+        assert twitter_quota(KEYS, api=api) == 3
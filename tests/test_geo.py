@@ -0,0 +1,274 @@
+"""Tests for ogre.geo"""
+
+import asyncio
+import random
+import sys
+
+import pytest
+
+from ogre import geo
+from ogre.metrics import Registry
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import atwitter, twitter, twitter_batch
+from ogre.validation import sanitize
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+# London, Paris, and the antipode of London.
+LATITUDES = [51.5074, 48.8566, -51.5074]
+LONGITUDES = [-0.1278, 2.3522, 179.8722]
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def vectorized(request, monkeypatch):
+    """Compute distances with and without NumPy."""
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(geo, "_numpy", lambda: None)
+    return request.param
+
+
+def test_distances(vectorized):
+    """Distances are great-circle distances."""
+    del vectorized
+    kilometers = list(geo.distances(LATITUDES, LONGITUDES, 51.5074, -0.1278))
+    assert kilometers[0] == pytest.approx(0)
+    assert kilometers[1] == pytest.approx(343.6, abs=0.5)
+    assert kilometers[2] == pytest.approx(3.141592653589793 * 6371.0088)
+    miles = list(geo.distances(LATITUDES, LONGITUDES, 51.5074, -0.1278, "mi"))
+    assert miles[1] == pytest.approx(213.5, abs=0.5)
+
+
+def test_within(vectorized):
+    """The radius is inclusive."""
+    del vectorized
+    assert geo.within(LATITUDES, LONGITUDES, (51.5074, -0.1278, 400.0, "km")) == [
+        True,
+        True,
+        False,
+    ]
+    assert geo.within(LATITUDES, LONGITUDES, (51.5074, -0.1278, 0.0, "km")) == [
+        True,
+        False,
+        False,
+    ]
+    assert geo.within([], [], (0.0, 0.0, 1.0, "mi")) == []
+
+
+def test_numpy(monkeypatch):
+    """NumPy is optional (and detected once)."""
+    # pylint: disable=protected-access
+    assert geo._numpy() is geo._numpy()
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    assert geo._numpy.__wrapped__() is None
+
+
+def tweets():
+    """Create Tweets near the center and (every third one) 50 km away."""
+    created = statuses(60, geotagged=1, photos=1, location=(45.0, -90.0))
+    for tweet in created[::3]:
+        tweet["coordinates"]["coordinates"][1] += 0.45
+    return created
+
+
+@pytest.mark.parametrize("fetch", [twitter, twitter_batch])
+def test_twitter(vectorized, fetch):
+    """Tweets outside of the radius are dropped before images are downloaded."""
+    del vectorized
+    network = SyntheticNetwork(size=10)
+    results = fetch(
+        keys=KEYS,
+        media=("image",),
+        location=(45.0, -90.0, 10, "km"),
+        quantity=60,
+        api=SyntheticAPI(tweets()),
+        network=network,
+        strict_location=True,
+        registry=Registry(),
+    )
+    assert len(results) == network.requests == 40
+    loose = twitter(
+        keys=KEYS,
+        media=("image",),
+        location=(45.0, -90.0, 10, "km"),
+        quantity=60,
+        api=SyntheticAPI(tweets()),
+        network=network,
+        registry=Registry(),
+    )
+    assert len(loose) == 60
+
+
+def test_twitter_without_location():
+    """Searches without a location are not filtered."""
+    results = twitter(
+        keys=KEYS,
+        keyword="test",
+        quantity=60,
+        api=SyntheticAPI(tweets()),
+        network=SyntheticNetwork(size=10),
+        strict_location=True,
+        registry=Registry(),
+    )
+    assert len(results) == 60
+
+
+# A 2 by 2 degree square with a 1 by 1 degree hole in its middle.
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [
+        [[-91, 44], [-89, 44], [-89, 46], [-91, 46], [-91, 44]],
+        [[-90.5, 44.5], [-89.5, 44.5], [-89.5, 45.5], [-90.5, 45.5], [-90.5, 44.5]],
+    ],
+}
+
+
+def test_is_area():
+    """Circles are not areas, but bounding boxes and Polygons are."""
+    assert not geo.is_area(None)
+    assert not geo.is_area((45.0, -90.0, 10, "km"))
+    assert not geo.is_area((45.0, -90.0, 10))
+    assert not geo.is_area(("45", "-90", "10", "km"))
+    assert geo.is_area((-91, 44, -89, 46))
+    assert geo.is_area(SQUARE)
+
+
+def test_contains(vectorized):
+    """Points in holes are outside of a polygon."""
+    del vectorized
+    polygon = sanitize(location=SQUARE)[3]
+    assert geo.contains(
+        polygon, [45.0, 44.25, 45.0, 47.0], [-90.0, -90.0, -92, -90]
+    ) == [
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert geo.contains(polygon, [], []) == []
+
+
+@pytest.mark.parametrize(
+    "location",
+    [
+        SQUARE,
+        (-91, 44, -89, 46),
+        (10, -1, 10.01, 1),  # This is a sliver across the equator.
+        {
+            "type": "Polygon",
+            "coordinates": [[[0, 60], [30, 60], [0, 80], [0, 60]]],  # Triangle
+        },
+        {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [2, 0], [1, 1e-9], [0, 0]]],  # Needle
+        },
+    ],
+)
+def test_cover(location):
+    """Every point in an area is within one of few circles."""
+    polygon = sanitize(location=location)[3]
+    west, south, east, north = geo.bounds(polygon)
+    generator = random.Random(0)
+    latitudes = [generator.uniform(south, north) for _ in range(500)]
+    longitudes = [generator.uniform(west, east) for _ in range(500)]
+    for max_tiles in (1, 4, 16):
+        circles = geo.cover(polygon, max_tiles=max_tiles)
+        assert 1 <= len(circles) <= max_tiles
+        covered = [False] * len(latitudes)
+        for circle in circles:
+            covered = [
+                done or inside
+                for done, inside in zip(
+                    covered,
+                    geo.within(latitudes, longitudes, circle),
+                )
+            ]
+        for inside, done in zip(
+            geo.contains(polygon, latitudes, longitudes),
+            covered,
+        ):
+            assert done or not inside
+    circles = geo.cover(sanitize(location=SQUARE)[3], radius=20)
+    assert len(circles) > 16
+    assert all(circle[2] == pytest.approx(20, rel=0.05) for circle in circles)
+
+
+def scattered():
+    """Create Tweets scattered over (and around) the square."""
+    created = statuses(100, geotagged=1, photos=0)
+    generator = random.Random(1)
+    for tweet in created:
+        tweet["coordinates"]["coordinates"] = [
+            generator.uniform(-91.5, -88.5),
+            generator.uniform(43.5, 46.5),
+        ]
+    coordinates = [tweet["coordinates"]["coordinates"] for tweet in created]
+    inside = geo.contains(
+        sanitize(location=SQUARE)[3],
+        [latitude for _, latitude in coordinates],
+        [longitude for longitude, _ in coordinates],
+    )
+    return created, {tweet["id"] for tweet, found in zip(created, inside) if found}
+
+
+@pytest.mark.parametrize("fetch", [twitter, twitter_batch])
+def test_twitter_area(fetch):
+    """Each Tweet inside of an area is returned once (however many tiles)."""
+    tweets, expected = scattered()
+    api = SyntheticAPI(tweets)
+    results = fetch(
+        keys=KEYS,
+        media=("text",),
+        location=SQUARE,
+        quantity=100,
+        api=api,
+        max_tiles=4,
+        registry=Registry(),
+        compact=True,
+    )
+    assert sorted(feature.id for feature in results) == sorted(expected)
+    assert len(api.calls) == 4  # The synthetic API ignores geocodes.
+    limited = fetch(
+        keys=KEYS,
+        media=("text",),
+        location=(-91, 44, -89, 46),
+        quantity=5,
+        api=SyntheticAPI(tweets),
+        tile_radius=100,
+        tile_workers=1,
+        dedupe=True,
+        registry=Registry(),
+    )
+    assert len(limited) == 5
+    assert not twitter(
+        keys=KEYS,
+        location=SQUARE,
+        quantity=0,
+        api=SyntheticAPI(tweets),
+        registry=Registry(),
+    )
+
+
+def test_atwitter_area():
+    """Areas are searched without blocking the event loop too."""
+    tweets, expected = scattered()
+    results = asyncio.run(
+        atwitter(
+            keys=KEYS,
+            media=("text",),
+            location=SQUARE,
+            quantity=100,
+            api=SyntheticAPI(tweets),
+            max_tiles=4,
+            registry=Registry(),
+            compact=True,
+        ),
+    )
+    assert sorted(feature.id for feature in results) == sorted(expected)
+
+
+def test_invalid_area():
+    """Areas are validated before anything is searched."""
+    with pytest.raises(ValueError):
+        twitter(keys=KEYS, location=(-89, 44, -91, 46), api=SyntheticAPI([]))
@@ -0,0 +1,174 @@
+"""Tests for the image_mode modifier of ogre.Twitter"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import os
+import stat
+
+import pytest
+
+from ogre.cache import spool
+from ogre.metrics import FetchMetrics, Registry
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import atwitter, twitter, twitter_batch
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def search(fetch=twitter, **modifiers):
+    """Fetch 20 geotagged photos."""
+    return fetch(
+        keys=KEYS,
+        media=("image",),
+        keyword="test",
+        quantity=20,
+        api=SyntheticAPI(statuses(20, geotagged=1, photos=1)),
+        registry=Registry(),
+        **modifiers,
+    )
+
+
+def image(feature):
+    """Find the image of a feature."""
+    return feature["properties"]["image"]
+
+
+def test_inline():
+    """Images are downloaded and encoded by default."""
+    network = SyntheticNetwork(size=10)
+    features = search(network=network)
+    assert network.requests == len(features) == 20
+    assert {base64.b64decode(image(feature)) for feature in features} == {
+        network.image,
+    }
+
+
+def test_url():
+    """Images are not downloaded in "url" mode."""
+    network = SyntheticNetwork(size=10)
+    metrics = FetchMetrics()
+    features = search(
+        network=network,
+        image_mode="url",
+        metrics=metrics,
+        compact=True,
+    )
+    assert network.requests == metrics.media_requests == 0
+    assert len(features) == 20
+    for feature in features:
+        assert feature.image == (
+            "https://pbs.twimg.com/media/" + str(feature.id) + ".jpg"
+        )
+    assert image(search(image_mode="url", secure=False)[0]).startswith("http:")
+
+
+@pytest.mark.parametrize("media_workers", [None, 4])
+def test_file(tmp_path, media_workers):
+    """Images are spooled to content-named files in "file" mode."""
+    network = SyntheticNetwork(size=10)
+    metrics = FetchMetrics()
+    features = search(
+        network=network,
+        image_mode="file",
+        spool=str(tmp_path),
+        media_workers=media_workers,
+        metrics=metrics,
+    )
+    path = os.path.join(
+        str(tmp_path),
+        hashlib.sha256(network.image).hexdigest() + ".jpg",
+    )
+    assert {image(feature) for feature in features} == {path}
+    assert os.listdir(str(tmp_path)) == [os.path.basename(path)]
+    with open(path, "rb") as stream:
+        assert stream.read() == network.image
+    assert metrics.media_requests == 20
+    assert metrics.media_bytes == 200
+
+
+def test_file_default(monkeypatch, tmp_path):
+    """Images are spooled in a private temporary directory by default."""
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    monkeypatch.setattr("ogre.Twitter._SPOOL", [])
+    features = search(network=SyntheticNetwork(size=10), image_mode="file")
+    directory = os.path.dirname(image(features[0]))
+    assert os.path.dirname(directory) == str(tmp_path)
+    assert os.path.basename(directory).startswith("ogre-")
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    features = search(network=SyntheticNetwork(size=10), image_mode="file")
+    assert os.path.dirname(image(features[0])) == directory  # (once per process)
+
+
+def test_batch(tmp_path):
+    """Batches support every mode."""
+    batch = search(
+        twitter_batch,
+        network=SyntheticNetwork(size=10),
+        image_mode="file",
+        spool=str(tmp_path),
+    )
+    assert len(set(batch.images)) == 1
+    assert os.path.isfile(batch.images[0])
+
+
+def test_async(tmp_path):
+    """Asynchronous fetches support every mode."""
+    network = SyntheticNetwork(size=10)
+    features = asyncio.run(
+        search(atwitter, network=network, image_mode="url"),
+    )
+    assert network.requests == 0
+    assert image(features[0]).startswith("https://")
+    features = asyncio.run(
+        search(atwitter, network=network, image_mode="file", spool=str(tmp_path)),
+    )
+    assert network.requests == 20
+    assert os.path.isfile(image(features[0]))
+    features = asyncio.run(
+        search(
+            atwitter,
+            network=lambda url, **_: io.StringIO("text"),
+            image_mode="file",
+            spool=str(tmp_path),
+        ),
+    )
+    with open(image(features[0]), "rb") as stream:
+        assert stream.read() == b"text"
+
+
+def test_invalid():
+    """Unknown modes are refused."""
+    with pytest.raises(ValueError):
+        search(image_mode="thumbnail")
+
+
+def test_spool(tmp_path):
+    """Content is streamed in chunks and stored once."""
+    directory = os.path.join(str(tmp_path), "spool")
+    path, size = spool(io.BytesIO(b"0123456789"), directory, chunk_size=3)
+    assert size == 10
+    assert path == os.path.join(directory, hashlib.sha256(b"0123456789").hexdigest())
+    assert spool(io.StringIO("0123456789"), directory)[0] == path
+    assert os.listdir(directory) == [os.path.basename(path)]
+
+
+def test_spool_failure(tmp_path):
+    """Partial content is removed."""
+
+    class Broken:  # pylint: disable=too-few-public-methods
+        """Fail partway through a stream."""
+
+        def __init__(self):
+            self.chunks = [b"partial"]
+
+        def read(self, _):
+            """Produce a chunk and then fail."""
+            if self.chunks:
+                return self.chunks.pop()
+            raise OSError("The connection was reset.")
+
+    with pytest.raises(OSError):
+        spool(Broken(), str(tmp_path))
+    assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,57 @@
+"""Tests for ogre.ledger"""
+
+from ogre.ledger import RateLimitLedger
+
+
+class Clock:  # pylint: disable=too-few-public-methods
+
+    """Provide a controllable POSIX timestamp."""
+
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_unsynchronized():
+    """An unsynchronized ledger is stale and does not constrain."""
+    ledger = RateLimitLedger()
+    assert ledger.stale()
+    assert ledger.reserve()
+
+
+def test_reserve():
+    """Queries are reserved until the window is exhausted."""
+    ledger = RateLimitLedger(clock=Clock())
+    ledger.sync(2, 900)
+    assert not ledger.stale()
+    assert ledger.reserve()
+    assert ledger.reserve()
+    assert not ledger.reserve()
+    assert ledger.remaining == 0
+
+
+def test_reset():
+    """A ledger goes stale and stops constraining when its window resets."""
+    clock = Clock()
+    ledger = RateLimitLedger(clock=clock)
+    ledger.sync(0, 900)
+    assert not ledger.reserve()
+    clock.now = 900
+    assert ledger.stale()
+    assert ledger.reserve()
+
+
+def test_correct():
+    """Observed limits only lower the count within a window."""
+    ledger = RateLimitLedger(clock=Clock())
+    ledger.sync(10, 900)
+    ledger.correct(20, 900)
+    assert ledger.remaining == 10
+    ledger.correct(5, "900")
+    assert ledger.remaining == 5
+    ledger.correct(450, 1800)
+    assert (ledger.remaining, ledger.reset) == (450, 1800)
+    ledger.invalidate()
+    assert ledger.stale()
@@ -0,0 +1,76 @@
+"""Tests for the structured log events of ogre.Twitter"""
+
+import logging
+
+import pytest
+
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import twitter
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def search(**modifiers):
+    """Page through 250 geotagged Tweets (in 3 queries)."""
+    return twitter(
+        keys=KEYS,
+        keyword="test",
+        quantity=1000,
+        api=SyntheticAPI(statuses(250, geotagged=1, photos=0)),
+        **modifiers,
+    )
+
+
+def test_events(caplog):
+    """Events carry stable names and fields."""
+    with caplog.at_level(logging.DEBUG, logger="ogre.Twitter"):
+        features = search()
+    records = [record for record in caplog.records if hasattr(record, "event")]
+    events = [record.event for record in records]
+    assert events[:2] == ["request", "request"]
+    assert events.count("page") == 3
+    assert events[-1] == "success"
+    assert len({record.qid for record in records}) == 1
+    assert {record.source for record in records} == {"Twitter"}
+    assert records[1].keyword == "test"
+    assert records[-1].queries == 3
+    assert records[-1].results == len(features) == 250
+    assert records[-1].reason == "No retrievable results remain."
+    assert records[-1].getMessage() == (
+        records[-1].qid
+        + " Success: 3 queries produced 250 results."
+        + " No retrievable results remain."
+    )
+    assert [record.results for record in records if record.event == "page"] == [
+        100,
+        100,
+        50,
+    ]
+
+
+def test_sampling(caplog):
+    """Page events may be sampled."""
+    with caplog.at_level(logging.DEBUG, logger="ogre.Twitter"):
+        search(log_sample=2)
+    pages = [
+        record.page
+        for record in caplog.records
+        if getattr(record, "event", None) == "page"
+    ]
+    assert pages == [2]
+    for sample in (0, -1, 1.5):
+        with pytest.raises(ValueError):
+            search(log_sample=sample)
+
+
+def test_disabled(caplog, monkeypatch):
+    """Disabled levels are never formatted."""
+
+    def unformattable(*_):
+        raise AssertionError("A disabled event was formatted.")
+
+    with caplog.at_level(logging.INFO, logger="ogre.Twitter"):
+        monkeypatch.setattr(logging.LogRecord, "getMessage", unformattable)
+        monkeypatch.setattr(logging.Logger, "_log", unformattable)
+        logging.getLogger("ogre.Twitter").setLevel(logging.CRITICAL)
+        assert len(search()) == 250
@@ -0,0 +1,102 @@
+"""Tests for ogre.metrics"""
+
+from ogre import OGRe
+from ogre.metrics import FetchMetrics, Registry
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import twitter, twitter_batch
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def test_fetch_metrics():
+    """A fetch counts its requests, results, and images."""
+    tweets = statuses(250, geotagged=0.8, photos=0.5)
+    network = SyntheticNetwork(size=10)
+    metrics = FetchMetrics()
+    registry = Registry()
+    features = twitter(
+        keys=KEYS,
+        keyword="test",
+        quantity=1000,
+        api=SyntheticAPI(tweets, remaining=100),
+        network=network,
+        metrics=metrics,
+        registry=registry,
+    )
+    summary = metrics.as_dict()
+    assert summary["searches"] == 3
+    assert summary["tweets"] == 250
+    assert summary["geotagged"] == sum(
+        tweet["coordinates"] is not None for tweet in tweets
+    )
+    assert summary["features"] == len(features)
+    assert summary["media_requests"] == network.requests
+    assert summary["media_bytes"] == 10 * network.requests
+    assert summary["remaining"] == 100
+    assert set(summary["seconds"]) == {"rate_limit", "search", "transform", "media"}
+    assert 0 < sum(summary["seconds"].values()) <= summary["wall"]
+    assert registry.get("ogre_searches_total", source="Twitter") == 3
+    assert registry.get("ogre_quota_remaining", source="Twitter") == 100
+
+
+def test_shared_metrics():
+    """Measurements of several fetches are summed."""
+    metrics = FetchMetrics()
+    registry = Registry()
+    with OGRe({"Twitter": KEYS}) as retriever:
+        for _ in range(2):
+            retriever.fetch(
+                ("Twitter",),
+                keyword="test",
+                quantity=10,
+                api=SyntheticAPI(statuses(10, geotagged=1, photos=0)),
+                metrics=metrics,
+                registry=registry,
+            )
+    twitter_batch(
+        keys=KEYS,
+        keyword="test",
+        quantity=10,
+        api=SyntheticAPI(statuses(10, geotagged=1, photos=0)),
+        metrics=metrics,
+        registry=registry,
+    )
+    assert (metrics.searches, metrics.features) == (3, 30)
+    assert registry.get("ogre_fetches_total", source="Twitter") == 3
+    assert registry.get("ogre_features_total", source="Twitter") == 30
+
+
+def test_render():
+    """Samples are exported in the Prometheus text format."""
+    registry = Registry()
+    metrics = FetchMetrics(clock=iter([0, 0.25, 1]).__next__)
+    with metrics.time("search"):
+        metrics.add("searches", 2)
+    metrics.wall = 1
+    registry.record(metrics, 'Twi"tter')
+    lines = registry.render().splitlines()
+    assert "# TYPE ogre_searches_total counter" in lines
+    assert 'ogre_searches_total{source="Twi\\"tter"} 2' in lines
+    assert "ogre_quota_remaining" not in "\n".join(lines)
+    assert (
+        'ogre_phase_seconds_bucket{phase="search",source="Twi\\"tter",le="0.1"} 0'
+        in lines
+    )
+    assert (
+        'ogre_phase_seconds_bucket{phase="search",source="Twi\\"tter",le="0.25"} 1'
+        in lines
+    )
+    assert (
+        'ogre_phase_seconds_bucket{phase="media",source="Twi\\"tter",le="+Inf"} 1'
+        in lines
+    )
+    assert 'ogre_phase_seconds_sum{phase="search",source="Twi\\"tter"} 0.25' in lines
+    assert 'ogre_fetch_seconds_count{source="Twi\\"tter"} 1' in lines
+    registry.clear()
+    assert registry.render() == ""
+    registry.inc("ogre_fetches_total")
+    registry.observe("ogre_fetch_seconds", 0.5)
+    lines = registry.render().splitlines()
+    assert "ogre_fetches_total 1" in lines
+    assert 'ogre_fetch_seconds_bucket{le="0.5"} 1' in lines
+    assert "ogre_fetch_seconds_sum 0.5" in lines
@@ -0,0 +1,118 @@
+"""Tests for ogre.polling"""
+
+import copy
+import json
+from io import StringIO
+
+from mock import MagicMock
+
+from ogre.polling import HighWaterMark
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import twitter
+
+with open("tests/data/Twitter-response-example.json") as tweets:
+    TWEETS = json.load(tweets)
+NEWEST = max(tweet["id"] for tweet in TWEETS["statuses"] if tweet.get("id"))
+
+
+def fake_api(page):
+    """Create a fake Twitter API that returns a page of results."""
+    api = MagicMock()
+    api().get_application_rate_limit_status.return_value = {
+        "resources": {
+            "search": {"/search/tweets": {"remaining": 5, "reset": 1234567890}},
+        },
+    }
+    api().search.return_value = page
+    api.reset_mock()
+    return api
+
+
+def poll(api, mark, quantity=15):
+    """Fetch Tweets incrementally."""
+    return twitter(
+        keys={"consumer_key": "key", "access_token": "token"},
+        keyword="test",
+        quantity=quantity,
+        high_water_mark=mark,
+        api=api,
+        network=lambda _: StringIO("test_image"),
+        compact=True,
+    )
+
+
+def test_persistence(tmp_path):
+    """Marks are only raised and survive restarts."""
+    path = str(tmp_path / "mark.json")
+    mark = HighWaterMark(path)
+    assert mark.since_id is None
+    assert mark.advance(10)
+    assert not mark.advance(5)
+    assert not mark.advance(None)
+    assert HighWaterMark(path).since_id == 10
+
+
+def test_since_id():
+    """The mark bounds the search and is raised once caught up."""
+    page = copy.deepcopy(TWEETS)
+    page["search_metadata"].pop("next_results")
+    api = fake_api(page)
+    mark = HighWaterMark(since_id=1)
+    assert len(poll(api, mark)) == 2
+    assert api().search.call_args[1]["since_id"] == 1
+    assert mark.since_id == NEWEST
+    poll(api, mark)
+    assert api().search.call_args[1]["since_id"] == NEWEST
+
+
+def test_known_territory():
+    """Pagination stops once results older than the mark are seen."""
+    api = fake_api(copy.deepcopy(TWEETS))
+    mark = HighWaterMark(since_id=NEWEST - 1)
+    poll(api, mark, quantity=100)
+    assert api().search.call_count == 1
+    assert mark.since_id == NEWEST
+
+
+def test_incomplete():
+    """The mark is not raised when newer results may remain."""
+    api = fake_api(copy.deepcopy(TWEETS))
+    mark = HighWaterMark(since_id=1)
+    assert len(poll(api, mark, quantity=2)) == 2
+    assert mark.since_id == 1
+
+
+def test_gap(tmp_path):
+    """Polls that stop short resume where they stopped until caught up."""
+    tweets = statuses(400, geotagged=1, photos=0)  # These are newest first.
+    path = str(tmp_path / "mark.json")
+    mark = HighWaterMark(path, since_id=tweets[300]["id"])
+    found = []
+    for _ in range(3):
+        api = SyntheticAPI(tweets)
+        found.extend(feature.id for feature in poll(api, mark, quantity=100))
+        assert len(api.calls) == 1
+        mark = HighWaterMark(path)  # The cursor survives restarts.
+    assert sorted(found, reverse=True) == [tweet["id"] for tweet in tweets[:300]]
+    assert (mark.since_id, mark.max_id, mark.pending) == (tweets[0]["id"], None, None)
+    assert not poll(SyntheticAPI(tweets), mark, quantity=100)
+
+    newer = statuses(50, geotagged=1, photos=0, seed=1)
+    for tweet in newer:
+        tweet["id"] += 1 << 40  # These were posted after the others.
+    assert len(poll(SyntheticAPI(newer + tweets), mark, quantity=100)) == 50
+    assert mark.since_id == max(tweet["id"] for tweet in newer)
+
+
+def test_resume():
+    """Cursors are only recorded where a call stopped."""
+    mark = HighWaterMark(since_id=1)
+    assert not mark.resume(10, None)
+    assert mark.resume(10, 5)
+    assert mark.resume(None, 4)
+    assert (mark.max_id, mark.pending) == (4, 10)
+    assert mark.advance(None)  # Closing the gap raises the mark to 10.
+    assert mark.since_id == 10
+    assert mark.resume(8, 6)
+    assert mark.advance(None)  # The gap is closed, but the mark stays.
+    assert (mark.since_id, mark.max_id) == (10, None)
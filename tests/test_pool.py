@@ -0,0 +1,59 @@
+"""Tests for ogre.pool"""
+
+import pytest
+from mock import MagicMock
+
+from ogre.pool import ClientPool
+
+
+def test_reuse():
+    """Clients are reused by later borrowers with the same keys."""
+    factory = MagicMock()
+    pool = ClientPool()
+    with pool.client(factory, "key", access_token="token") as first:
+        pass
+    with pool.client(factory, "key", access_token="token") as second:
+        assert second is first
+    factory.assert_called_once_with("key", access_token="token")
+    with pool.client(factory, "other", access_token="token"):
+        pass
+    assert factory.call_count == 2
+    assert len(pool) == 2
+
+
+def test_exclusive():
+    """A client is lent to one borrower at a time."""
+    pool = ClientPool()
+    with pool.client(object) as first:
+        with pool.client(object) as second:
+            assert first is not second
+
+
+def test_max_idle():
+    """Surplus clients are closed instead of pooled."""
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    pool = ClientPool(max_idle=1)
+    with pool.client(factory) as first:
+        with pool.client(factory) as second:
+            pass
+        second.close.assert_not_called()
+    first.close.assert_called_once_with()
+    assert len(pool) == 1
+
+
+def test_close():
+    """Closing releases idle sessions and rejects new borrowers."""
+    session = MagicMock()
+
+    class Client:  # pylint: disable=too-few-public-methods
+        """Imitate Twython, which keeps its Session in `client`."""
+
+        client = session
+
+    with ClientPool() as pool:
+        with pool.client(Client):
+            pass
+    session.close.assert_called_once_with()
+    with pytest.raises(RuntimeError):
+        with pool.client(Client):
+            pass
@@ -0,0 +1,118 @@
+"""Tests for ogre.quadtree"""
+
+import random
+
+import pytest
+
+from ogre.metrics import FetchMetrics, Registry
+from ogre.quadtree import harvest
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import twitter
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+AREA = (-91, 44, -89, 46)
+
+
+def tweets():
+    """Create a dense cluster of Tweets in a corner of a sparse area."""
+    created = statuses(400, geotagged=1, photos=0)
+    generator = random.Random(2)
+    for index, tweet in enumerate(created):
+        if index < 360:
+            longitude = generator.uniform(-90.9, -90.4)
+            latitude = generator.uniform(45.4, 45.9)
+        else:
+            longitude = generator.uniform(-91, -89)
+            latitude = generator.uniform(44, 46)
+        tweet["coordinates"]["coordinates"] = [longitude, latitude]
+    return created
+
+
+def test_harvest():
+    """Dense tiles are split, so more results are found per query."""
+    api = SyntheticAPI(tweets(), geocoded=True)
+    metrics = FetchMetrics()
+    results = harvest(
+        keys=KEYS,
+        media=("text",),
+        location=AREA,
+        quantity=1000,
+        api=api,
+        metrics=metrics,
+        registry=Registry(),
+        compact=True,
+    )
+    assert len({feature.id for feature in results}) == len(results) == 400
+    assert metrics.searches == len(api.calls) < 40
+    uniform = SyntheticAPI(tweets(), geocoded=True)
+    found = twitter(
+        keys=KEYS,
+        media=("text",),
+        location=AREA,
+        quantity=1000,
+        api=uniform,
+        max_tiles=64,
+        query_limit=1,
+        registry=Registry(),
+    )
+    assert len(found) < len(results)
+    assert len(uniform.calls) > len(api.calls)
+
+
+def test_sparse():
+    """Sparse tiles are retired after one query."""
+    api = SyntheticAPI(tweets()[360:], geocoded=True)
+    results = harvest(
+        keys=KEYS,
+        media=("text",),
+        location={
+            "type": "Polygon",
+            "coordinates": [[[-91, 44], [-89, 44], [-89, 46], [-91, 44]]],
+        },
+        quantity=1000,
+        api=api,
+        root_tiles=4,
+        registry=Registry(),
+    )
+    assert results
+    assert len(api.calls) <= 4
+
+
+def test_limits():
+    """Harvesting stops at the quantity, the query limit, or the depth."""
+    for modifiers, calls in (
+        ({"quantity": 10}, 1),
+        ({"quantity": 1000, "query_limit": 3}, 3),
+        ({"quantity": 1000, "max_depth": 0}, 1),
+        (
+            {
+                "quantity": 1000,
+                "tile_quantity": 300,
+                "tile_queries": 5,
+                "query_limit": 4,
+            },
+            4,
+        ),
+    ):
+        api = SyntheticAPI(tweets(), geocoded=True)
+        results = harvest(
+            keys=KEYS,
+            media=("text",),
+            location=AREA,
+            api=api,
+            tile_workers=1,
+            registry=Registry(),
+            **modifiers,
+        )
+        assert len(api.calls) == calls
+        assert len(results) <= modifiers["quantity"]
+    assert not harvest(keys=KEYS, location=AREA, quantity=0, api=SyntheticAPI([]))
+
+
+def test_invalid():
+    """Only areas are harvested."""
+    with pytest.raises(ValueError):
+        harvest(keys=KEYS, location=(45.0, -90.0, 10, "km"), api=SyntheticAPI([]))
+    with pytest.raises(ValueError):
+        harvest(keys=KEYS, api=SyntheticAPI([]))
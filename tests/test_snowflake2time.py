@@ -5,10 +5,16 @@
 # Public Domain -- no copyright -- but be kind and give credit
 #
 
+import datetime
 import unittest
 
 import snowflake2time as snowflake
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class SnowflakeTest(unittest.TestCase):
     def test_str2utc(self):
@@ -30,6 +36,58 @@ class SnowflakeTest(unittest.TestCase):
         )
         self.assertEqual(diff, 436)
 
+    def test_utcms2snowflake(self):
+        sf = snowflake.utcms2snowflake(1337638595436)
+        self.assertEqual(snowflake.snowflake2utcms(sf), 1337638595436)
+        self.assertEqual(sf, snowflake.utc2snowflake(1337638595.436))
+
+    def test_utcms2iso(self):
+        # matches the float path (datetime.utcfromtimestamp) exactly
+        for sf in (204697221847986177, snowflake.utcms2snowflake(1337638595000)):
+            self.assertEqual(
+                snowflake.utcms2iso(snowflake.snowflake2utcms(sf)),
+                datetime.datetime.utcfromtimestamp(
+                    snowflake.snowflake2utc(sf),
+                ).isoformat()
+                + "Z",
+            )
+        self.assertEqual(snowflake.utcms2iso(1337638595000), "2012-05-21T22:16:35Z")
+
+    def test_batches(self):
+        sfs = [204697221847986177, snowflake.utcms2snowflake(1337638595000)]
+        self.assertEqual(
+            snowflake.snowflakes2utcms(sfs),
+            [1337638595436, 1337638595000],
+        )
+        self.assertEqual(
+            snowflake.snowflakes2isos(sfs),
+            ["2012-05-21T22:16:35.436000Z", "2012-05-21T22:16:35Z"],
+        )
+        self.assertEqual(
+            snowflake.utc2snowflakes([1337638595.436, 1337638595]),
+            [snowflake.utc2snowflake(1337638595.436), sfs[1]],
+        )
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed.")
+    def test_arrays(self):
+        sfs = numpy.array(
+            [204697221847986177, snowflake.utcms2snowflake(1337638595000)],
+            dtype=numpy.int64,
+        )
+        utcms = snowflake.snowflakes2utcms(sfs)
+        self.assertEqual(utcms.dtype, numpy.int64)
+        self.assertEqual(utcms.tolist(), [1337638595436, 1337638595000])
+        self.assertEqual(
+            snowflake.snowflakes2isos(sfs),
+            ["2012-05-21T22:16:35.436000Z", "2012-05-21T22:16:35Z"],
+        )
+        self.assertEqual(
+            snowflake.utc2snowflakes(
+                numpy.array([1337638595.436, 1337638595])
+            ).tolist(),
+            [snowflake.utc2snowflake(1337638595.436), int(sfs[1])],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
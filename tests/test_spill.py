@@ -0,0 +1,135 @@
+"""Tests for ogre.spill"""
+
+import gc
+import os
+
+import pytest
+
+from ogre import OGRe
+from ogre.feature import Feature
+from ogre.spill import SpillBuffer
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def features(quantity):
+    """Create distinct features."""
+    return [
+        Feature(index, -90.0 + index, 45.0, 1000 * index, "Twitter", "text", b"jpeg")
+        for index in range(quantity)
+    ]
+
+
+def test_memory():
+    """Features below the threshold stay in memory."""
+    buffer = SpillBuffer(max_features=10)
+    buffer.extend(features(10))
+    assert len(buffer) == 10
+    assert buffer.spilled == 0
+    assert buffer.path is None
+    assert list(buffer) == features(10)
+    assert repr(buffer) == "SpillBuffer(memory=10, spilled=0)"
+
+
+def test_features(tmp_path):
+    """Features beyond the threshold spill to disk in order."""
+    with SpillBuffer(max_features=3, directory=str(tmp_path)) as buffer:
+        assert not buffer
+        buffer.extend(features(10))
+        assert buffer
+        assert (len(buffer.memory), buffer.spilled, len(buffer)) == (3, 7, 10)
+        assert os.path.dirname(buffer.path) == str(tmp_path)
+        assert list(buffer) == features(10)
+        assert list(buffer) == features(10)  # Iteration may be repeated.
+        iterator = iter(buffer)
+        assert [next(iterator) for _ in range(5)] == features(5)
+        buffer.append(features(11)[-1])
+        assert len(list(iterator)) == 5  # Later features are skipped.
+        assert list(buffer) == features(11)
+    assert os.listdir(str(tmp_path)) == []
+    assert len(buffer) == 0
+    with pytest.raises(ValueError):
+        buffer.append(features(1)[0])
+    with pytest.raises(ValueError):
+        list(buffer)
+    buffer.close()  # Closing is idempotent.
+
+
+def test_bytes(tmp_path):
+    """Features beyond a size spill to disk."""
+    buffer = SpillBuffer(max_bytes=1, directory=str(tmp_path))
+    buffer.extend(features(3))
+    assert buffer.memory == []
+    assert buffer.spilled == 3
+    buffer = SpillBuffer(max_bytes=10**6, directory=str(tmp_path))
+    buffer.extend(features(3))
+    assert 0 < buffer.memory_bytes <= 10**6
+    assert buffer.spilled == 0
+
+
+def test_collection(tmp_path):
+    """Unreferenced buffers remove their logs."""
+    buffer = SpillBuffer(max_features=0, directory=str(tmp_path))
+    buffer.extend(features(2))
+    assert len(os.listdir(str(tmp_path))) == 1
+    del buffer
+    gc.collect()
+    assert os.listdir(str(tmp_path)) == []
+    buffer = SpillBuffer(max_features=0, directory=str(tmp_path))
+    buffer.append(features(1)[0])
+    os.remove(buffer.path)  # e.g. by a cleaner of temporary files
+    buffer.close()
+
+
+def test_fetch(tmp_path):
+    """OGRe.fetch spills features when asked to."""
+    tweets = statuses(250, geotagged=1, photos=0.5)
+    with OGRe({"Twitter": KEYS}) as retriever:
+        expected = retriever.fetch(
+            ("Twitter",),
+            keyword="test",
+            quantity=250,
+            api=SyntheticAPI(tweets),
+            network=SyntheticNetwork(size=10),
+        )
+        collection = retriever.fetch(
+            ("Twitter",),
+            keyword="test",
+            quantity=250,
+            api=SyntheticAPI(tweets),
+            network=SyntheticNetwork(size=10),
+            spill_features=100,
+            spill_directory=str(tmp_path),
+        )
+    assert collection["type"] == "FeatureCollection"
+    with collection["features"] as buffer:
+        assert isinstance(buffer, SpillBuffer)
+        assert buffer.spilled == 150
+        assert len(buffer) == len(expected["features"]) == 250
+        assert list(buffer) == expected["features"]
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_fetch_failure(tmp_path):
+    """Spilled features are removed if a fetch fails."""
+    network = SyntheticNetwork(size=10)
+
+    def unreliable(url, **kwargs):
+        if network.requests >= 50:
+            raise OSError("The network is down.")
+        return network(url, **kwargs)
+
+    with OGRe({"Twitter": KEYS}) as retriever:
+        with pytest.raises(OSError):
+            retriever.fetch(
+                ("Twitter",),
+                media=("image",),
+                keyword="test",
+                quantity=250,
+                api=SyntheticAPI(statuses(250, geotagged=1, photos=1)),
+                network=unreliable,
+                spill_bytes=1,
+                spill_directory=str(tmp_path),
+            )
+    assert os.listdir(str(tmp_path)) == []
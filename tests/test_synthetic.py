@@ -0,0 +1,67 @@
+"""Tests for ogre.synthetic"""
+
+from ogre.synthetic import SyntheticAPI, SyntheticNetwork, statuses
+from ogre.Twitter import twitter
+
+KEYS = {"consumer_key": "synthetic", "access_token": "synthetic"}
+
+
+def test_statuses():
+    """Tweets are deterministic, newest first, and mixed as requested."""
+    tweets = statuses(200, geotagged=0.5, photos=0.25, seed=1)
+    assert tweets == statuses(200, geotagged=0.5, photos=0.25, seed=1)
+    assert tweets != statuses(200, geotagged=0.5, photos=0.25, seed=2)
+    ids = [tweet["id"] for tweet in tweets]
+    assert ids == sorted(ids, reverse=True)
+    geotagged = sum(tweet["coordinates"] is not None for tweet in tweets)
+    photos = sum("media" in tweet["entities"] for tweet in tweets)
+    assert 70 < geotagged < 130
+    assert 30 < photos < 70
+
+
+def test_paging():
+    """Every Tweet is reachable by following next_results."""
+    tweets = statuses(250, geotagged=1, photos=0)
+    api = SyntheticAPI(tweets, page_size=100)
+    features = twitter(keys=KEYS, keyword="test", quantity=1000, api=api)
+    assert len(features) == 250
+    assert len(api.calls) == 3
+    assert api.search(count=100, since_id=tweets[1]["id"])["statuses"] == [
+        tweets[0],
+    ]
+    assert (
+        "next_results"
+        not in api.search(count=1, since_id=tweets[1]["id"])["search_metadata"]
+    )
+    assert api.get_lastfunction_header("x-rate-limit-remaining") == "450"
+    assert api.get_lastfunction_header("missing") is None
+
+
+def test_geocoded():
+    """Geocoded instances serve only the geotagged Tweets within the geocode."""
+    tweets = statuses(250, geotagged=0.5, photos=0, location=(45.0, -90.0))
+    tweets[0]["coordinates"] = {"type": "Point", "coordinates": [-90.0, 45.0]}
+    tweets[1]["coordinates"] = {"type": "Point", "coordinates": [-90.0, 46.0]}
+    api = SyntheticAPI(tweets, page_size=1000, geocoded=True)
+    assert api.search(count=1, geocode="45.0,-90.0,1km")["statuses"] == [tweets[0]]
+    assert len(api.search(count=1000, geocode="45.0,-90.0,1000km")["statuses"]) == (
+        sum(tweet["coordinates"] is not None for tweet in tweets)
+    )
+    assert len(api.search(count=1000)["statuses"]) == 250
+    assert len(SyntheticAPI(tweets).search(count=1, geocode="0,0,1mi")["statuses"])
+
+
+def test_images():
+    """Photos are served by the synthetic network."""
+    network = SyntheticNetwork(size=10)
+    features = twitter(
+        keys=KEYS,
+        media=("image",),
+        keyword="test",
+        quantity=100,
+        api=SyntheticAPI(statuses(100, photos=1)),
+        network=network,
+        strict_media=True,
+    )
+    assert network.requests == len(features) > 0
+    assert network("url").read() == bytes(range(10))
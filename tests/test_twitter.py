@@ -8,8 +8,25 @@ OGRe Twitter Interface Tests
 :meth:`TwitterTest.test_sanitize_twitter` -- Twitter parameter preparation tests
 
 :meth:`TwitterTest.test_twitter` -- Twitter API query tests
+
+:meth:`TwitterTest.test_iter_twitter` -- Twitter API streaming tests
+
+:meth:`TwitterTest.test_atwitter` -- asynchronous Twitter API query tests
+
+:meth:`TwitterTest.test_media_workers` -- concurrent image download tests
+
+:meth:`TwitterTest.test_ledger` -- local rate limit tracking tests
+
+:meth:`TwitterTest.test_ledger_corrections` -- rate limit correction tests
+
+:meth:`TwitterTest.test_shards` -- concurrent interval search tests
+
+:meth:`TwitterTest.test_shard_failures` -- sharded search failure tests
+
+:meth:`TwitterTest.test_shard_priority` -- sharded search budget tests
 """
 
+import asyncio
 import base64
 import copy
 import json
@@ -24,10 +41,46 @@ from twython import TwythonError
 
 from ogre import OGRe
 from ogre.exceptions import OGReError, OGReLimitError
-from ogre.Twitter import twitter, sanitize_twitter
+from ogre.ledger import RateLimitLedger
+from ogre.synthetic import SyntheticAPI, statuses
+from ogre.Twitter import atwitter, iter_twitter, twitter, sanitize_twitter
+from ogre.Twitter import _split  # pylint: disable=protected-access
 import snowflake2time as snowflake
 
 
+def twitter_archive(ids):
+    """Create a fake Twitter API that pages through Tweets with the given IDs."""
+
+    def search(q, count, geocode, since_id, max_id):  # pylint: disable=invalid-name
+        del q, geocode
+        matches = sorted((i for i in ids if since_id < i <= max_id), reverse=True)
+        results = {
+            "statuses": [
+                {
+                    "id": i,
+                    "text": str(i),
+                    "coordinates": {"coordinates": [0.0, 0.0]},
+                }
+                for i in matches[:count]
+            ],
+            "search_metadata": {},
+        }
+        if len(matches) > count:
+            results["search_metadata"]["next_results"] = "?max_id=" + str(
+                matches[count - 1] - 1,
+            )
+        return results
+
+    api = MagicMock()
+    api().get_application_rate_limit_status.return_value = twitter_limits(
+        450,
+        1234567890,
+    )
+    api().search.side_effect = search
+    api.reset_mock()
+    return api
+
+
 def twitter_limits(remaining, reset):
     """Format a Twitter response to a limits request."""
     return {
@@ -810,3 +863,286 @@ class TwitterTest(unittest.TestCase):
                 },
             ],
         )
+
+    def test_iter_twitter(self):
+        """Results are yielded lazily and match the collected results."""
+        self.log.debug("Testing streaming...")
+        api = self.injectors["api"]["regular"]
+        network = self.injectors["network"]["regular"]
+        stream = iter_twitter(
+            keys=self.retriever.keychain[self.retriever.keyring["twitter"]],
+            media=("image", "text"),
+            keyword="test",
+            quantity=2,
+            location=(0, 1, 2, "km"),
+            interval=(3, 4),
+            api=api,
+            network=network,
+        )
+        self.assertEqual(0, api.call_count)
+        streamed = list(stream)
+        self.assertEqual(1, api.call_count)
+        self.assertEqual(1, api().search.call_count)
+        api.reset_mock()
+        network.reset_mock()
+        self.assertEqual(
+            streamed,
+            twitter(
+                keys=self.retriever.keychain[self.retriever.keyring["twitter"]],
+                media=("image", "text"),
+                keyword="test",
+                quantity=2,
+                location=(0, 1, 2, "km"),
+                interval=(3, 4),
+                api=api,
+                network=network,
+            ),
+        )
+
+    def test_atwitter(self):
+        """Asynchronous retrieval accepts the same fakes and matches."""
+        self.log.debug("Testing asynchronous retrieval...")
+        api = self.injectors["api"]["regular"]
+        network = self.injectors["network"]["regular"]
+        features = asyncio.run(
+            atwitter(
+                keys=self.retriever.keychain[self.retriever.keyring["twitter"]],
+                media=("image", "text"),
+                keyword="test",
+                quantity=2,
+                location=(0, 1, 2, "km"),
+                interval=(3, 4),
+                api=api,
+                network=network,
+            ),
+        )
+        self.assertEqual(1, api().get_application_rate_limit_status.call_count)
+        self.assertEqual(1, api().search.call_count)
+        self.assertEqual(1, network.call_count)
+        api.reset_mock()
+        network.reset_mock()
+        self.assertEqual(
+            features,
+            twitter(
+                keys=self.retriever.keychain[self.retriever.keyring["twitter"]],
+                media=("image", "text"),
+                keyword="test",
+                quantity=2,
+                location=(0, 1, 2, "km"),
+                interval=(3, 4),
+                api=api,
+                network=network,
+            ),
+        )
+
+    def test_media_workers(self):
+        """Images downloaded on a pool match images downloaded in turn."""
+        self.log.debug("Testing concurrent image downloads...")
+        api = self.injectors["api"]["regular"]
+        network = self.injectors["network"]["regular"]
+        parameters = {
+            "keys": self.retriever.keychain[self.retriever.keyring["twitter"]],
+            "media": ("image", "text"),
+            "keyword": "test",
+            "quantity": 2,
+            "api": api,
+            "network": network,
+        }
+        pooled = twitter(media_workers=4, **parameters)
+        self.assertEqual(1, network.call_count)
+        network.reset_mock()
+        self.assertEqual(pooled, twitter(**parameters))
+
+    def test_media_timeout(self):
+        """A timeout is relayed to the network for each image."""
+        self.log.debug("Testing image download timeouts...")
+        api = self.injectors["api"]["regular"]
+        network = MagicMock()
+        network.side_effect = lambda _, timeout: StringIO("test_image")
+        for workers in (None, 2):
+            network.reset_mock()
+            twitter(
+                keys=self.retriever.keychain[self.retriever.keyring["twitter"]],
+                keyword="test",
+                quantity=2,
+                media_workers=workers,
+                media_timeout=5,
+                api=api,
+                network=network,
+            )
+            network.assert_called_once_with(
+                self.tweets["statuses"][0]["entities"]["media"][0]["media_url_https"],
+                timeout=5,
+            )
+
+    def test_ledger(self):
+        """A current ledger replaces the rate limit request."""
+        self.log.debug("Testing local rate limit tracking...")
+        api = self.injectors["api"]["regular"]
+        network = self.injectors["network"]["regular"]
+        ledger = RateLimitLedger(clock=lambda: 0)
+        parameters = {
+            "keys": self.retriever.keychain[self.retriever.keyring["twitter"]],
+            "keyword": "test",
+            "quantity": 2,
+            "ledger": ledger,
+            "api": api,
+            "network": network,
+        }
+        self.assertEqual(2, len(twitter(**parameters)))
+        self.assertEqual(1, api().get_application_rate_limit_status.call_count)
+        self.assertEqual(1, ledger.remaining)
+        self.assertEqual(2, len(twitter(**parameters)))
+        self.assertEqual(1, api().get_application_rate_limit_status.call_count)
+        self.assertEqual(0, ledger.remaining)
+        self.assertEqual([], twitter(**parameters))
+        self.assertEqual(2, api().search.call_count)
+        with self.assertRaises(OGReLimitError) as context:
+            twitter(fail_hard=True, **parameters)
+        self.assertEqual(1234567890, context.exception.reset)
+
+    def test_ledger_corrections(self):
+        """Responses correct the ledger, and failures invalidate it."""
+        self.log.debug("Testing rate limit corrections...")
+        keys = self.retriever.keychain[self.retriever.keyring["twitter"]]
+        # The first response reports that the rest of the window was spent.
+        api = SyntheticAPI(statuses(200, geotagged=1, photos=0), remaining=0)
+        ledger = RateLimitLedger()
+        ledger.sync(2, api.reset)
+        features = twitter(
+            keys=keys,
+            media=("text",),
+            keyword="test",
+            quantity=200,
+            ledger=ledger,
+            api=api,
+        )
+        self.assertEqual(100, len(features))
+        self.assertEqual(1, len(api.calls))
+        self.assertEqual(0, ledger.remaining)
+
+        ledger.sync(2, api.reset)
+        with self.assertRaises(TwythonError):
+            twitter(
+                keys=keys,
+                keyword="test",
+                ledger=ledger,
+                api=self.injectors["api"]["imitate"],
+                network=self.injectors["network"]["imitate"],
+            )
+        self.assertTrue(ledger.stale())
+
+        # Clients may lack response headers (or raise without them).
+        regular = self.injectors["api"]["regular"]
+        headless = MagicMock(
+            spec=["get_application_rate_limit_status", "search"],
+        )
+        headless.get_application_rate_limit_status.return_value = (
+            regular().get_application_rate_limit_status.return_value
+        )
+        headless.search.return_value = copy.deepcopy(self.tweets)
+        regular().get_lastfunction_header.side_effect = TwythonError("No headers")
+        for api in (MagicMock(return_value=headless), regular):
+            ledger = RateLimitLedger(clock=lambda: 0)
+            features = twitter(
+                keys=keys,
+                keyword="test",
+                quantity=2,
+                ledger=ledger,
+                api=api,
+                network=self.injectors["network"]["regular"],
+            )
+            self.assertEqual(2, len(features))
+            self.assertEqual(1, ledger.remaining)
+
+    def test_shards(self):
+        """Sharded searches find the same results as sequential searches."""
+        self.log.debug("Testing sharded searches...")
+        since_id, max_id = snowflake.utc2snowflake(3), snowflake.utc2snowflake(4)
+        step = (max_id - since_id) // 1000
+        # Most Tweets are in the oldest quarter of the interval.
+        ids = [since_id + step * i for i in range(1, 250, 1)]
+        ids += [since_id + step * i for i in range(250, 1000, 25)]
+        parameters = {
+            "keys": self.retriever.keychain[self.retriever.keyring["twitter"]],
+            "media": ("text",),
+            "keyword": "test",
+            "interval": (3, 4),
+            "network": self.injectors["network"]["regular"],
+        }
+        for quantity in (20, 150, 1000):
+            api = twitter_archive(ids)
+            sequential = twitter(quantity=quantity, api=api, **parameters)
+            api = twitter_archive(ids)
+            sharded = twitter(
+                quantity=quantity,
+                shards=4,
+                shard_workers=2,
+                api=api,
+                **parameters,
+            )
+            self.assertEqual(sequential, sharded)
+            self.assertEqual(min(quantity, len(ids)), len(sharded))
+        self.assertGreater(api().search.call_count, 4)
+
+    def test_shard_failures(self):
+        """Sharded searches stop at the query limit and relay failures."""
+        self.log.debug("Testing sharded search failures...")
+        since_id, max_id = snowflake.utc2snowflake(3), snowflake.utc2snowflake(4)
+        step = (max_id - since_id) // 100
+        ids = [since_id + step * i for i in range(1, 100)]
+        parameters = {
+            "keys": self.retriever.keychain[self.retriever.keyring["twitter"]],
+            "media": ("text",),
+            "keyword": "test",
+            "quantity": 100,
+            "interval": (3, 4),
+            "shards": 4,
+            "network": self.injectors["network"]["regular"],
+        }
+        api = twitter_archive(ids)
+        features = twitter(query_limit=2, api=api, **parameters)
+        self.assertEqual(2, api().search.call_count)
+        # Only the newer half of the shards (i.e. 49 Tweets) was searched.
+        self.assertEqual(
+            sorted(ids, reverse=True)[:49],
+            [int(feature["properties"]["text"]) for feature in features],
+        )
+        for name in ("complex", "imitate"):
+            api = self.injectors["api"][name]
+            if name == "complex":
+                self.assertEqual([], twitter(api=api, **parameters))
+            else:
+                with self.assertRaises(TwythonError):
+                    twitter(api=api, **parameters)
+            self.assertEqual(2, api().search.call_count)  # The limit is 2.
+        self.assertEqual([(5, 6)], _split(5, 6, 2))
+
+    def test_shard_priority(self):
+        """Sharded searches spend a short query limit on the newest ranges."""
+        self.log.debug("Testing sharded search priorities...")
+        tweets = statuses(3000, geotagged=1, photos=0)
+        newest = snowflake.snowflake2utc(tweets[0]["id"])
+        oldest = snowflake.snowflake2utc(tweets[-1]["id"])
+        parameters = {
+            "keys": self.retriever.keychain[self.retriever.keyring["twitter"]],
+            "media": ("text",),
+            "keyword": "test",
+            "quantity": 100,
+            # The older half of the interval is empty.
+            "interval": (oldest - (newest - oldest) - 1, newest + 1),
+        }
+        for query_limit in (1, 2, 3, 5):
+            sequential = twitter(
+                api=SyntheticAPI(tweets),
+                query_limit=query_limit,
+                **parameters,
+            )
+            sharded = twitter(
+                api=SyntheticAPI(tweets),
+                query_limit=query_limit,
+                shards=4,
+                shard_workers=1,
+                **parameters,
+            )
+            self.assertEqual(sequential, sharded)
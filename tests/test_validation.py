@@ -6,6 +6,8 @@ OGRe Parameter Validator Tests
 :meth:`ValidationTest.test_validate` -- error detection tests
 
 :meth:`ValidationTest.test_sanitize` -- data cleansing verification tests
+
+:meth:`ValidationTest.test_areas` -- area validation and cleansing tests
 """
 
 import logging
@@ -21,6 +23,8 @@ class ValidationTest(unittest.TestCase):
     :meth:`test_validate` -- tests for detecting input errors
 
     :meth:`test_sanitize` -- tests of parameter format preparation
+
+    :meth:`test_areas` -- tests of bounding boxes and polygons
     """
 
     def setUp(self):
@@ -53,7 +57,7 @@ class ValidationTest(unittest.TestCase):
             validate(keyword=_StrTrap())
         with self.assertRaises(ValueError):
             validate(quantity=-1)
-        with self.assertRaises(ValueError):
+        with self.assertRaisesRegex(ValueError, "radius, unit"):
             validate(location=(1, 2, 3))
         with self.assertRaises(ValueError):
             validate(location=(1, 2, 3, 4, 5))
@@ -73,8 +77,8 @@ class ValidationTest(unittest.TestCase):
             validate(location=(0, 0, "malformed", "km"))
         with self.assertRaises(ValueError):
             validate(location=(0, 0, -1, "km"))
-        with self.assertRaises(AttributeError):
-            validate(location=(0, 0, 0, 0))
+        with self.assertRaises(ValueError):
+            validate(location=(0, 0, 0, 0))  # This is an empty bounding box.
         with self.assertRaises(ValueError):
             validate(location=(0, 0, 0, "invalid"))
         with self.assertRaises(ValueError):
@@ -124,3 +128,57 @@ class ValidationTest(unittest.TestCase):
             sanitize(interval=(1, 0)),
             (("image", "sound", "text", "video"), "", 15, None, (0, 1)),
         )
+
+    def test_areas(self):
+        """
+        Test bounding boxes and polygons.
+
+        These tests should make sure areas are validated and converted to
+        closed rings of (longitude, latitude) positions.
+        """
+
+        self.log.debug("Testing areas...")
+
+        square = [[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]]
+        for area in (
+            (1, 0, 0, 1),
+            (0, 1, 1, 0),
+            (-200, 0, 0, 1),
+            (0, 0, 1, 100),
+            {"type": "Point", "coordinates": [0, 0]},
+            {"type": "Polygon", "coordinates": []},
+            {"type": "Polygon", "coordinates": [[(0, 0), (1, 1), (0, 0)]]},
+            {"type": "Polygon", "coordinates": [[(0, 0), (1, 0), (2, 0)]]},
+            {"type": "Polygon", "coordinates": [[(0, 0), (1, 0), (1, 91)]]},
+            {"type": "Polygon", "coordinates": [[(0, 0), (1, 0), (181, 1)]]},
+            {"type": "Feature", "geometry": None, "properties": {}},
+        ):
+            with self.assertRaises(ValueError):
+                validate(location=area)
+
+        clean = (
+            ("image", "sound", "text", "video"),
+            "",
+            15,
+            tuple(tuple(ring) for ring in square),
+            None,
+        )
+        self.assertEqual(sanitize(location=(0, 0, 1, 1)), clean)
+        self.assertEqual(
+            sanitize(location={"type": "Polygon", "coordinates": square}),
+            clean,
+        )
+        self.assertEqual(
+            sanitize(
+                location={
+                    "type": "Feature",
+                    "geometry": {"type": "Polygon", "coordinates": [square[0][:-1]]},
+                },
+            ),
+            clean,
+        )
+
+        class _Shape:  # pylint: disable=too-few-public-methods
+            __geo_interface__ = {"type": "Polygon", "coordinates": square}
+
+        self.assertEqual(sanitize(location=_Shape()), clean)